@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
+from app.core.exceptions import ChatbotException
 from app.models.schemas import ChatRequest, ChatResponse
 from app.models.database import Conversation, Message
 from app.services.rag_service import rag_service
 from app.core.logger import get_logger
 from datetime import datetime
+import json
 import uuid
 
 logger = get_logger()
@@ -17,48 +20,14 @@ async def chat(request: ChatRequest, db: Session = Depends(get_db)):
     Main chat endpoint
     """
     try:
-        # Get or create conversation
-        if request.conversation_id:
-            conversation_id = uuid.UUID(request.conversation_id)
-            conversation = db.query(Conversation).filter(
-                Conversation.id == conversation_id
-            ).first()
-            if not conversation:
-                raise HTTPException(status_code=404, detail="Conversation not found")
-        else:
-            # Create new conversation
-            conversation = Conversation(
-                user_id=request.user_id,
-                title=request.message[:100]  # Use first part of message as title
-            )
-            db.add(conversation)
-            db.commit()
-            db.refresh(conversation)
-        
-        # Save user message
-        user_message = Message(
-            conversation_id=conversation.id,
-            role="user",
-            content=request.message
-        )
-        db.add(user_message)
-        
-        # Get conversation history
-        history = db.query(Message).filter(
-            Message.conversation_id == conversation.id
-        ).order_by(Message.created_at.asc()).all()
-        
-        conversation_history = []
-        for msg in history:
-            conversation_history.append({
-                "role": msg.role,
-                "content": msg.content
-            })
+        conversation, conversation_history = _load_conversation(request, db)
         
         # Query RAG system
         response_text, sources, tokens_used = rag_service.query(
             user_query=request.message,
-            conversation_history=conversation_history[:-1]  # Exclude current message
+            conversation_history=conversation_history[:-1],  # Exclude current message
+            profile=request.profile,
+            conversation_id=str(conversation.id)
         )
         
         # Save assistant message
@@ -86,11 +55,70 @@ async def chat(request: ChatRequest, db: Session = Depends(get_db)):
             tokens_used=tokens_used
         )
         
+    except ChatbotException:
+        # El handler global responde con su status (429 por límite de uso, 503, ...)
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         logger.error(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, db: Session = Depends(get_db)):
+    """
+    Streaming chat endpoint (Server-Sent Events)
+    
+    Events: sources, token (text deltas), metadata, then done once the
+    assistant message is saved, or error.
+    """
+    try:
+        conversation, conversation_history = _load_conversation(request, db)
+        db.commit()  # El mensaje del usuario se guarda antes de empezar el stream
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in chat stream endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    conversation_id = conversation.id
+    
+    def events():
+        parts = []
+        tokens_used = None
+        try:
+            for event, data in rag_service.query_stream(
+                user_query=request.message,
+                conversation_history=conversation_history[:-1],  # Exclude current message
+                profile=request.profile,
+                conversation_id=str(conversation_id)
+            ):
+                if event == 'token':
+                    parts.append(data['text'])
+                elif event == 'metadata':
+                    tokens_used = data.get('tokens_used')
+                    data = dict(data, conversation_id=str(conversation_id), model=rag_service.llm_service.model)
+                yield _sse(event, data)
+            
+            # La sesión del request ya se cerró: guardar con una propia al terminar el stream
+            message_id = _save_assistant_message(conversation_id, "".join(parts), tokens_used)
+            logger.info(f"Chat response streamed for conversation {conversation_id}")
+            yield _sse('done', {'conversation_id': str(conversation_id), 'message_id': str(message_id)})
+            
+        except ChatbotException as e:
+            yield _sse('error', {'message': e.message, 'status_code': e.status_code})
+        except Exception as e:
+            logger.error(f"Error in chat stream: {str(e)}")
+            yield _sse('error', {'message': "Ocurrió un error al procesar tu consulta", 'status_code': 500})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # Sin buffer en proxies
+    )
+
 @router.get("/conversations/{conversation_id}")
 async def get_conversation(conversation_id: str, db: Session = Depends(get_db)):
     """
@@ -170,3 +198,70 @@ async def list_conversations(
     except Exception as e:
         logger.error(f"Error listing conversations: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+def _load_conversation(request: ChatRequest, db: Session):
+    """Get or create the conversation, add the user message and return the history"""
+    # Get or create conversation
+    if request.conversation_id:
+        conversation_id = uuid.UUID(request.conversation_id)
+        conversation = db.query(Conversation).filter(
+            Conversation.id == conversation_id
+        ).first()
+        if not conversation:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+    else:
+        # Create new conversation
+        conversation = Conversation(
+            user_id=request.user_id,
+            title=request.message[:100]  # Use first part of message as title
+        )
+        db.add(conversation)
+        db.commit()
+        db.refresh(conversation)
+    
+    # Save user message
+    user_message = Message(
+        conversation_id=conversation.id,
+        role="user",
+        content=request.message
+    )
+    db.add(user_message)
+    
+    # Get conversation history
+    history = db.query(Message).filter(
+        Message.conversation_id == conversation.id
+    ).order_by(Message.created_at.asc()).all()
+    
+    conversation_history = []
+    for msg in history:
+        conversation_history.append({
+            "role": msg.role,
+            "content": msg.content
+        })
+    
+    return conversation, conversation_history
+
+def _save_assistant_message(conversation_id, content: str, tokens_used: int):
+    db = SessionLocal()
+    try:
+        message = Message(
+            conversation_id=conversation_id,
+            role="assistant",
+            content=content,
+            tokens_used=tokens_used,
+            model=rag_service.llm_service.model
+        )
+        db.add(message)
+        db.query(Conversation).filter(Conversation.id == conversation_id).update(
+            {Conversation.updated_at: datetime.utcnow()}
+        )
+        db.commit()
+        return message.id
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
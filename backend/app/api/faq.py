@@ -41,7 +41,7 @@ async def batch_process_faqs(
                 answer, sources, tokens_used = rag_service.query(
                     user_query=question,
                     conversation_history=None,
-                    top_k=5
+                    profile=faq_data.profile
                 )
                 
                 # Create FAQ record
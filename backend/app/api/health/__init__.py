@@ -4,7 +4,11 @@ from sqlalchemy import text
 from app.core.database import get_db
 from app.core.redis_client import get_redis
 from app.services.pinecone_service import pinecone_service
+from app.services.embedding_cache import cached_embedding_service
+from app.services.semantic_cache import semantic_cache
+from app.services.cache_namespace import cache_namespace
 from app.core.logger import get_logger
+from app.core.metrics import metrics
 from datetime import datetime
 from typing import Dict, Any
 import sys
@@ -218,6 +222,19 @@ async def readiness_check(db: Session = Depends(get_db)):
             }
         )
 
+@router.get("/health/metrics")
+async def metrics_check():
+    """
+    In-process metrics for this worker (counters and latencies)
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        **metrics.snapshot(),
+        "embedding_cache": cached_embedding_service.stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "cache_namespace": cache_namespace.prefix()
+    }
+
 @router.get("/health/live")
 async def liveness_check():
     """
@@ -0,0 +1,101 @@
+"""
+Binary codec for cached RAG payloads
+
+Entries are msgpack-encoded and zstd-compressed with a dictionary trained
+on our own answers (scripts/train_cache_dictionary.py), behind a one-byte
+format version. Legacy entries written as plain JSON are still decoded.
+When msgpack/zstandard are not installed the codec writes JSON.
+"""
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional
+import json
+
+logger = get_logger()
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+# Primer byte de cada entrada binaria
+VERSION_MSGPACK_ZSTD = 0x01
+# Las entradas JSON empiezan con '{' o '['
+JSON_PREFIXES = (ord('{'), ord('['))
+
+class CacheCodec:
+    """Encode/decode cache payloads; the format is chosen by settings.CACHE_CODEC"""
+
+    def __init__(self, name: str = "msgpack_zstd", level: int = 3, dict_path: Optional[str] = None):
+        self.name = name
+        self.level = level
+        self.dict_path = dict_path
+        self._lock = Lock()
+        self._ready = False
+        self._msgpack = None
+        self._compressor = None
+        self._decompressor = None
+
+    def _ensure_ready(self):
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            if self.name == "msgpack_zstd":
+                try:
+                    import msgpack
+                    import zstandard
+
+                    dictionary = None
+                    path = BACKEND_DIR / self.dict_path if self.dict_path else None
+                    if path and path.exists():
+                        dictionary = zstandard.ZstdCompressionDict(path.read_bytes())
+                        logger.info(f"Cache codec dictionary loaded from {path} (id {dictionary.dict_id()})")
+
+                    self._msgpack = msgpack
+                    self._compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+                    self._decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+                except Exception as e:
+                    logger.warning(f"Binary cache codec not available, using JSON: {str(e)}")
+            self._ready = True
+
+    @property
+    def binary(self) -> bool:
+        self._ensure_ready()
+        return self._compressor is not None
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a payload for Redis"""
+        if not self.binary:
+            return json.dumps(value).encode()
+        packed = self._msgpack.packb(value, use_bin_type=True)
+        return bytes([VERSION_MSGPACK_ZSTD]) + self._compressor.compress(packed)
+
+    def decode(self, raw: bytes) -> Any:
+        """
+        Deserialize a payload written by any codec version.
+
+        Raises ValueError for unknown or undecodable entries (e.g. compressed
+        with a dictionary that is no longer loaded).
+        """
+        if isinstance(raw, str):
+            raw = raw.encode()
+        if not raw:
+            raise ValueError("empty cache entry")
+
+        if raw[0] in JSON_PREFIXES:
+            return json.loads(raw)
+
+        if raw[0] == VERSION_MSGPACK_ZSTD:
+            self._ensure_ready()
+            if self._decompressor is None:
+                raise ValueError("msgpack/zstandard not installed")
+            try:
+                return self._msgpack.unpackb(self._decompressor.decompress(raw[1:]), raw=False)
+            except Exception as e:
+                raise ValueError(f"undecodable cache entry: {str(e)}")
+
+        raise ValueError(f"unknown cache entry version {raw[0]}")
+
+cache_codec = CacheCodec(settings.CACHE_CODEC, settings.CACHE_CODEC_LEVEL, settings.CACHE_CODEC_DICT_PATH)
@@ -32,6 +32,77 @@ class Settings(BaseSettings):
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
     TOP_K: int = 5
+    RAG_SEARCH_WORKERS: int = 16  # Hilos de búsqueda por worker, compartidos por todas las requests
+    RAG_SEARCH_TIMEOUT: float = 10.0  # Segundos para todas las búsquedas de Pinecone de una request
+    RAG_FILTERED_TOP_K: int = 20  # top_k máximo cuando hay filtro de metadata
+    RAG_FILTER_MIN_RESULTS: int = 5  # Menos chunks que esto -> búsqueda sin filtro
+    RAG_FUSION_STRATEGY: str = "rrf"  # rrf | first_seen
+    
+    # Profundidad adaptativa: query original con top_k chico, ampliar solo con scores débiles
+    RAG_ADAPTIVE_ENABLED: bool = True
+    RAG_ADAPTIVE_INITIAL_TOP_K: int = 8  # Chunks de la query original que se evalúan (y se usan si bastan)
+    RAG_ADAPTIVE_CONFIDENT_SCORE: float = 0.6  # Score coseno de un chunk "seguro"
+    RAG_ADAPTIVE_MIN_CONFIDENT: int = 3  # Chunks seguros para no esperar a las expansiones
+    RRF_K: int = 60
+    
+    # Selección MMR (diversidad bajo presupuesto de tokens)
+    MMR_ENABLED: bool = True
+    MMR_LAMBDA: float = 0.7  # 1.0 = solo relevancia, 0.0 = solo diversidad
+    MMR_TOKEN_BUDGET: int = 12000
+    
+    # Presupuesto de tokens del contexto para el LLM
+    CONTEXT_TOKEN_BUDGET: int = 10000
+    LLM_MAX_PROMPT_TOKENS: int = 100000  # Ventana de gpt-4o menos margen de respuesta
+    TOKENIZER_ENCODING: str = "o200k_base"  # Tokenizer de gpt-4o
+    
+    # Plantillas de respuesta fija por intención (JSON opcional que sobrescribe las de código)
+    RESPONSE_TEMPLATES_PATH: str = "data/response_templates.json"
+    
+    # Respuestas precalculadas (portales); se invalidan al cambiar el system prompt
+    PRECOMPUTED_ANSWERS_TTL: int = 2592000  # 30 días
+    
+    # Compresión extractiva del contexto (opcional)
+    CONTEXT_COMPRESSION_ENABLED: bool = False
+    COMPRESSION_MIN_SENTENCE_SCORE: float = 2.0  # Suma de IDF de términos en común
+    
+    # Caché de embeddings de queries (LRU en proceso + Redis)
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 1024  # ~12 KB por vector de 3072 dims (bytes float32): ~12 MB por worker
+    EMBEDDING_CACHE_TTL: int = 604800  # 7 días
+    
+    # Índice léxico BM25 (búsqueda híbrida con Pinecone)
+    LEXICAL_INDEX_ENABLED: bool = True
+    LEXICAL_INDEX_PATH: str = "data/lexical_index.json.gz"  # Relativo a backend/
+    EXPANSION_VECTORS_PATH: str = "data/expansion_vectors.npz"  # Relativo a backend/, ver scripts/build_expansion_vectors.py
+    LEXICAL_TOP_K: int = 20  # Hits BM25; el tope tras la fusión es hybrid_max_final_chunks del perfil
+    
+    # Caché semántico de respuestas (similitud coseno entre queries)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000
+    
+    # Coalescing de queries idénticas en vuelo
+    SINGLEFLIGHT_LOCK_TTL: float = 30.0  # Segundos
+    SINGLEFLIGHT_WAIT_TIMEOUT: float = 25.0  # Segundos
+    
+    # Caché de respuestas stale-while-revalidate
+    RESPONSE_CACHE_SOFT_TTL: int = 43200  # 12 horas: después se sirve y se refresca en segundo plano
+    RESPONSE_CACHE_HARD_TTL: int = 86400  # 24 horas: después Redis borra la entrada
+    RESPONSE_CACHE_REFRESH_LOCK_TTL: int = 120  # Segundos; también evita reintentos seguidos
+    RESPONSE_CACHE_MAX_REFRESHES: int = 2  # Refrescos en segundo plano simultáneos por worker
+    CACHE_NAMESPACE_REFRESH_INTERVAL: float = 60.0  # Segundos entre recálculos de la huella del índice
+    NEGATIVE_CACHE_TTL: int = 600  # 10 minutos para consultas sin chunks relevantes
+    CACHE_CODEC: str = "msgpack_zstd"  # msgpack_zstd | json
+    CACHE_CODEC_LEVEL: int = 3  # Nivel de compresión zstd
+    CACHE_CODEC_DICT_PATH: str = "data/cache_codec.dict"  # scripts/train_cache_dictionary.py
+    
+    # Precalentamiento del caché (scripts/warm_cache.py)
+    CACHE_WARM_TOP_N: int = 200  # Mensajes de usuario más frecuentes
+    CACHE_WARM_CONCURRENCY: int = 2
+    CACHE_WARM_REQUESTS_PER_MINUTE: int = 30
+    
+    # Parámetros de búsqueda en caliente y experimentos A/B (scripts/set_retrieval_config.py)
+    RETRIEVAL_CONFIG_REFRESH_INTERVAL: float = 30.0  # Segundos entre lecturas de la config en Redis
+    EXPERIMENT_LATENCY_SAMPLES: int = 1000  # Latencias guardadas por variante para p50/p95
     
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000"
@@ -0,0 +1,54 @@
+"""
+In-process metrics registry
+
+Lightweight counters and timings for the RAG pipeline. Values are per
+worker process and are exposed through /health/metrics.
+"""
+
+from collections import defaultdict
+from threading import Lock
+from typing import Dict
+
+
+class Metrics:
+    """Thread-safe counters and latency summaries"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters = defaultdict(int)
+        self._timings = {}
+
+    def incr(self, name: str, amount: int = 1):
+        """Increment a counter"""
+        with self._lock:
+            self._counters[name] += amount
+
+    def observe(self, name: str, value_ms: float):
+        """Record a latency sample in milliseconds"""
+        with self._lock:
+            timing = self._timings.setdefault(name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            timing['count'] += 1
+            timing['total_ms'] += value_ms
+            timing['max_ms'] = max(timing['max_ms'], value_ms)
+
+    def get(self, name: str) -> int:
+        """Current value of a counter"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict:
+        """Copy of all counters and timings"""
+        with self._lock:
+            timings = {
+                name: {
+                    'count': t['count'],
+                    'avg_ms': round(t['total_ms'] / t['count'], 1) if t['count'] else 0.0,
+                    'max_ms': round(t['max_ms'], 1)
+                }
+                for name, t in self._timings.items()
+            }
+            return {'counters': dict(self._counters), 'timings': timings}
+
+
+# Global instance
+metrics = Metrics()
@@ -2,6 +2,11 @@ import redis
 from app.core.config import settings
 
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Cliente para valores binarios (embeddings, payloads comprimidos)
+redis_binary_client = redis.from_url(settings.REDIS_URL, decode_responses=False)
 
 def get_redis():
     return redis_client
+
+def get_redis_binary():
+    return redis_binary_client
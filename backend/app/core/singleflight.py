@@ -0,0 +1,134 @@
+"""
+Request coalescing (singleflight)
+
+Concurrent calls for the same key share a single execution. Inside a
+worker, followers wait on the leader's in-memory result. Across workers,
+the leader holds a short Redis lock and followers poll for the result the
+leader leaves behind (e.g. in the response cache).
+"""
+
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from threading import Event, Lock
+from typing import Any, Callable, Optional
+import time
+import uuid
+
+logger = get_logger()
+
+# Libera el lock solo si sigue siendo nuestro
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    def __init__(self):
+        self.event = Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce identical in-flight calls, in-process and across workers"""
+
+    def __init__(
+        self,
+        redis_client,
+        lock_ttl: float = 30.0,
+        wait_timeout: float = 25.0,
+        poll_interval: float = 0.2,
+        prefix: str = "singleflight"
+    ):
+        self.redis = redis_client
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._lock = Lock()
+        self._calls = {}
+
+    def do(self, key: str, fn: Callable[[], Any], fetch_result: Callable[[], Any]) -> Any:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Args:
+            key: Identity of the call (e.g. the response cache key)
+            fn: Computes the result; only the leader runs it
+            fetch_result: Returns the leader's published result or None;
+                used by followers in other workers
+
+        Followers that time out waiting compute the result themselves.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            metrics.incr("singleflight.local_followers")
+            if call.event.wait(timeout=self.wait_timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            logger.warning(f"Singleflight wait timed out for {key}, computing directly")
+            return fn()
+
+        try:
+            call.result = self._do_distributed(key, fn, fetch_result)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.event.set()
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def _do_distributed(self, key: str, fn: Callable[[], Any], fetch_result: Callable[[], Any]) -> Any:
+        lock_key = f"{self.prefix}:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = self.redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            # Si Redis falla, no bloquear la petición
+            logger.warning(f"Singleflight lock error: {str(e)}")
+            return fn()
+
+        if acquired:
+            metrics.incr("singleflight.leaders")
+            try:
+                return fn()
+            finally:
+                try:
+                    self.redis.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.warning(f"Singleflight unlock error: {str(e)}")
+
+        # Otro worker ya está calculando: esperar su resultado
+        metrics.incr("singleflight.remote_followers")
+        deadline = time.time() + self.wait_timeout
+        try:
+            while time.time() < deadline:
+                time.sleep(self.poll_interval)
+                result = fetch_result()
+                if result is not None:
+                    metrics.incr("singleflight.remote_hits")
+                    return result
+                if not self.redis.exists(lock_key):
+                    # El líder terminó sin publicar resultado (error o no cacheable)
+                    result = fetch_result()
+                    if result is not None:
+                        metrics.incr("singleflight.remote_hits")
+                        return result
+                    break
+        except Exception as e:
+            logger.warning(f"Singleflight wait error: {str(e)}")
+
+        return fn()
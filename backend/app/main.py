@@ -7,6 +7,8 @@ from app.core.database import engine, Base
 from app.core.logger import get_logger
 from app.core.rate_limiter import rate_limiter
 from app.core.env_validator import validate_environment
+from app.services.lexical_index import lexical_index
+from app.services.context_builder import load_tokenizer
 from app.core.exceptions import (
     ChatbotException,
     chatbot_exception_handler,
@@ -55,7 +57,7 @@ async def rate_limit_middleware(request: Request, call_next):
     Apply rate limiting to all requests except health checks and docs
     """
     # Skip rate limiting for health checks and docs
-    if request.url.path in ["/health", "/health/detailed", "/health/ready", "/health/live", 
+    if request.url.path in ["/health", "/health/detailed", "/health/ready", "/health/live", "/health/metrics", 
                             "/", "/docs", "/openapi.json", "/redoc"]:
         response = await call_next(request)
         return response
@@ -89,6 +91,16 @@ async def startup_event():
     logger.info("🚀 Chatbot GNP API starting up...")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"CORS Origins: {settings.cors_origins}")
+    
+    # Cargar (o construir) el índice léxico antes de recibir tráfico
+    if settings.LEXICAL_INDEX_ENABLED:
+        try:
+            lexical_index.ensure_loaded()
+        except Exception as e:
+            logger.warning(f"Lexical index not available: {str(e)}")
+    
+    # Tokenizer del LLM (presupuesto de contexto) antes de la primera request
+    load_tokenizer()
     logger.info("✅ Application started successfully")
 
 @app.on_event("shutdown")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 from uuid import UUID
 
@@ -7,6 +7,8 @@ class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=5000)
     conversation_id: Optional[str] = None
     user_id: Optional[str] = None
+    # Perfil de búsqueda; sin valor se elige según la intención de la pregunta
+    profile: Optional[Literal["fast", "balanced", "thorough"]] = None
 
 class ChatResponse(BaseModel):
     conversation_id: str
@@ -52,6 +54,9 @@ class DocumentSchema(BaseModel):
 class FAQCreate(BaseModel):
     questions: List[str] = Field(..., description="List of FAQ questions to process")
     category: Optional[str] = Field("GMM", description="Category for these FAQs")
+    profile: Optional[Literal["fast", "balanced", "thorough"]] = Field(
+        "thorough", description="Retrieval profile used to answer the questions"
+    )
 
 class FAQResponse(BaseModel):
     id: UUID
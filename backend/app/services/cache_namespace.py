@@ -0,0 +1,123 @@
+from app.services.pinecone_service import pinecone_service
+from app.services.llm_service import llm_service
+from app.services.retrieval_config import retrieval_config
+from app.core.redis_client import get_redis
+from app.core.config import settings
+from app.core.logger import get_logger
+from threading import Lock, Thread
+from typing import Callable, Optional
+import hashlib
+import time
+
+logger = get_logger()
+
+INDEX_VERSION_KEY = "rag:index_version"
+
+class CacheNamespace:
+    """
+    Response-cache namespace derived from the state of the knowledge base.
+
+    The fingerprint combines a manual index version kept in Redis (bumped by
+    ingestion scripts and scripts/clear_redis_cache.py --bump), the Pinecone
+    vector counts, and the hashes of the system prompt and the retrieval
+    config. Any change switches every worker to a fresh namespace within
+    refresh_interval seconds; entries of the old namespace are never read
+    again and expire with their TTL. Recomputing calls Pinecone, so it runs
+    in a background thread while requests keep the last fingerprint.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        stats_provider: Callable[[], str],
+        prompt_provider: Callable[[], str],
+        refresh_interval: float = 60.0
+    ):
+        self.redis = redis_client
+        self.stats_provider = stats_provider
+        self.prompt_provider = prompt_provider
+        self.refresh_interval = refresh_interval
+        self._lock = Lock()
+        self._fingerprint: Optional[str] = None
+        self._stats: Optional[str] = None
+        self._computed_at = 0.0
+        self._refreshing = False
+        self._generation = 0  # Cambia con bump(): descarta cálculos empezados antes
+
+    def _compute(self) -> str:
+        try:
+            version = self.redis.get(INDEX_VERSION_KEY) or "0"
+        except Exception as e:
+            logger.warning(f"Index version read error: {str(e)}")
+            version = "0"
+
+        try:
+            self._stats = self.stats_provider()
+        except Exception as e:
+            # Conservar el último valor conocido para no cambiar de namespace por un error transitorio
+            logger.warning(f"Index stats error, keeping last known: {str(e)}")
+        stats = self._stats or "unknown"
+
+        raw = f"{version}|{stats}|{self.prompt_provider()}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+    def _refresh(self, generation: int):
+        try:
+            fingerprint = self._compute()
+        except Exception as e:
+            logger.warning(f"Cache namespace refresh error, keeping last: {str(e)}")
+            fingerprint = None
+        with self._lock:
+            self._refreshing = False
+            if fingerprint is None or generation != self._generation:
+                return
+            if self._fingerprint and fingerprint != self._fingerprint:
+                logger.info(f"Cache namespace changed: {self._fingerprint} -> {fingerprint}")
+            self._fingerprint = fingerprint
+            self._computed_at = time.time()
+
+    def fingerprint(self) -> str:
+        """Current knowledge-base fingerprint (recomputed every refresh_interval)"""
+        with self._lock:
+            if self._fingerprint is not None:
+                if not self._refreshing and time.time() - self._computed_at > self.refresh_interval:
+                    # Sin bloquear la request: se sirve el último valor mientras se recalcula
+                    self._refreshing = True
+                    Thread(target=self._refresh, args=(self._generation,), daemon=True).start()
+                return self._fingerprint
+            generation = self._generation
+
+        # Primer uso (o tras bump): no hay valor que servir, se calcula en línea y fuera del lock
+        fingerprint = self._compute()
+        with self._lock:
+            if self._fingerprint is None or generation == self._generation:
+                self._fingerprint = fingerprint
+                self._computed_at = time.time()
+            return self._fingerprint
+
+    def prefix(self) -> str:
+        return f"rag:{self.fingerprint()}:"
+
+    def key(self, suffix: str) -> str:
+        return self.prefix() + suffix
+
+    def bump(self) -> int:
+        """Increment the index version; every worker moves to a new namespace"""
+        version = self.redis.incr(INDEX_VERSION_KEY)
+        with self._lock:
+            self._fingerprint = None
+            self._generation += 1
+        return version
+
+def _index_stats() -> str:
+    stats = pinecone_service.get_stats()
+    namespaces = getattr(stats, 'namespaces', None) or {}
+    counts = ",".join(f"{name}={ns.vector_count}" for name, ns in sorted(namespaces.items()))
+    return f"{stats.total_vector_count}:{counts}"
+
+cache_namespace = CacheNamespace(
+    get_redis(),
+    _index_stats,
+    lambda: f"{llm_service.prompt_fingerprint()}:{retrieval_config.fingerprint()}",
+    settings.CACHE_NAMESPACE_REFRESH_INTERVAL
+)
@@ -0,0 +1,138 @@
+from app.models.database import FAQ, Message
+from app.core.exceptions import ChatbotException
+from app.core.logger import get_logger
+from app.services.retrieval_profiles import cache_variant
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import time
+
+logger = get_logger()
+
+class CacheWarmer:
+    """
+    Fill the response cache with the questions agents are most likely to ask:
+    all active FAQs plus the top-N most repeated user messages.
+
+    Queries run through RAGService.query with bounded concurrency, spaced to
+    stay under requests_per_minute. A rate-limit error (429) pauses every
+    worker with exponential backoff before retrying.
+
+    profile selects the retrieval profile; None warms the intent's default,
+    which is what /api/v1/chat reads when the client does not pick one.
+    """
+
+    def __init__(
+        self,
+        rag_service,
+        concurrency: int = 2,
+        requests_per_minute: int = 30,
+        max_retries: int = 3,
+        backoff_seconds: float = 5.0,
+        profile: Optional[str] = None
+    ):
+        self.rag_service = rag_service
+        self.profile = profile
+        self.concurrency = concurrency
+        self.interval = 60.0 / max(1, requests_per_minute)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._lock = Lock()
+        self._next_slot = 0.0
+
+    def collect_questions(self, db, top_n: int = 200, days: int = 30) -> List[Tuple[str, str]]:
+        """(question, origin) pairs: active FAQs first, then frequent user messages"""
+        questions = []
+        seen = set()
+
+        def add(text: str, origin: str):
+            key = text.lower().strip()  # Misma normalización que la llave de caché
+            if not key or key in seen:
+                return
+            # Saludos y portales no pasan por el caché de respuestas (plantillas / precalculadas)
+            if self.rag_service.intent_router.route(text)['name'] in ('greeting', 'portal'):
+                return
+            seen.add(key)
+            questions.append((text.strip(), origin))
+
+        for (question,) in db.query(FAQ.question).filter(FAQ.is_active == True).all():
+            add(question, "faq")
+
+        since = datetime.utcnow() - timedelta(days=days)
+        frequent = db.query(Message.content, func.count(Message.id).label('count')) \
+            .filter(Message.role == "user", Message.created_at >= since) \
+            .group_by(Message.content) \
+            .order_by(func.count(Message.id).desc()) \
+            .limit(top_n) \
+            .all()
+        for content, _ in frequent:
+            add(content, "history")
+
+        return questions
+
+    def is_cached(self, question: str) -> bool:
+        intent = self.rag_service.intent_router.route(question)
+        variant = cache_variant(self.rag_service.retrieval_config.resolve(self.profile, intent), intent)
+        cache_key = self.rag_service._generate_cache_key(question, variant)
+        # Las preguntas sin chunks relevantes quedan en el caché negativo: no repetirlas en cada pasada
+        return (
+            self.rag_service._get_from_cache(cache_key) is not None
+            or self.rag_service._get_negative(cache_key) is not None
+        )
+
+    def _wait_for_slot(self):
+        """Space request starts to respect requests_per_minute across workers"""
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _pause_all(self, seconds: float):
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.time() + seconds)
+
+    def _warm_one(self, question: str) -> Dict:
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_slot()
+            start_time = time.time()
+            try:
+                _, _, tokens_used = self.rag_service.query(user_query=question, profile=self.profile)
+                return {'ok': True, 'tokens': tokens_used, 'ms': (time.time() - start_time) * 1000}
+            except ChatbotException as e:
+                if e.status_code != 429 or attempt == self.max_retries:
+                    return {'ok': False, 'error': e.message}
+                wait = self.backoff_seconds * (2 ** attempt)
+                logger.warning(f"Rate limited while warming, pausing {wait:.1f}s")
+                self._pause_all(wait)
+            except Exception as e:
+                return {'ok': False, 'error': str(e)}
+
+    def warm(self, questions: List[Tuple[str, str]]) -> Dict:
+        """Run the questions missing from the cache and report coverage"""
+        start_time = time.time()
+        pending = [q for q in questions if not self.is_cached(q[0])]
+        already_cached = len(questions) - len(pending)
+        logger.info(f"Cache warming: {already_cached}/{len(questions)} already cached, {len(pending)} to run")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cache-warm") as executor:
+            outcomes = list(executor.map(lambda q: self._warm_one(q[0]), pending))
+
+        failures = [(q, o['error']) for q, o in zip(pending, outcomes) if not o['ok']]
+        covered = sum(1 for q in questions if self.is_cached(q[0]))
+        latencies = [o['ms'] for o in outcomes if o['ok']]
+
+        return {
+            'total': len(questions),
+            'already_cached': already_cached,
+            'warmed': len(pending) - len(failures),
+            'failed': failures,
+            'coverage_before': already_cached / len(questions) if questions else 1.0,
+            'coverage_after': covered / len(questions) if questions else 1.0,
+            'tokens_used': sum(o.get('tokens', 0) for o in outcomes),
+            'avg_query_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            'elapsed_s': time.time() - start_time
+        }
@@ -0,0 +1,123 @@
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from typing import Dict, List, Tuple
+import re
+
+logger = get_logger()
+
+CHUNK_SEPARATOR = "\n\n---\n\n"
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?;:])\s+|\n+')
+
+_encoder = None
+_encoder_failed = False
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token in Spanish text)"""
+    return max(1, len(text) // 4)
+
+def load_tokenizer():
+    """
+    Load the tokenizer once; called at startup so a first download (when the
+    encoding is not cached in the image) never happens on a live request.
+    On failure token counts fall back to estimate_tokens.
+    """
+    global _encoder, _encoder_failed
+    if _encoder is None and not _encoder_failed:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+        except Exception as e:
+            _encoder_failed = True
+            logger.warning(f"Tokenizer not available, estimating tokens: {str(e)}")
+    return _encoder
+
+def count_tokens(text: str) -> int:
+    """Count tokens with the local tokenizer of the LLM; estimate if unavailable"""
+    encoder = load_tokenizer()
+    if encoder is None:
+        return estimate_tokens(text)
+    return len(encoder.encode(text, disallowed_special=()))
+
+def truncate_to_sentences(text: str, max_tokens: int) -> str:
+    """Keep whole leading sentences of text within max_tokens"""
+    kept = []
+    used = 0
+    for sentence in SENTENCE_SPLIT.split(text):
+        if not sentence.strip():
+            continue
+        sentence_tokens = count_tokens(sentence) + 1
+        if used + sentence_tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += sentence_tokens
+    return " ".join(kept)
+
+class ContextBuilder:
+    """
+    Assemble the retrieval context for the LLM within a token budget.
+
+    Chunks are added in priority order (synthetic docs first, then by
+    score). The first chunk that no longer fits is truncated at a sentence
+    boundary; the rest are dropped.
+    """
+
+    def __init__(self, min_truncated_tokens: int = 50):
+        self.min_truncated_tokens = min_truncated_tokens
+
+    def available_budget(self, fixed_prompt: str, conversation_history: List[Dict] = None) -> int:
+        """Context budget: configured cap, reduced if prompt + history leave less room"""
+        used = count_tokens(fixed_prompt)
+        for message in conversation_history or []:
+            used += count_tokens(message.get('content', '')) + 4  # Overhead por mensaje
+        room = settings.LLM_MAX_PROMPT_TOKENS - used
+        return max(0, min(settings.CONTEXT_TOKEN_BUDGET, room))
+
+    def build(self, chunks: List[Dict], budget: int) -> Tuple[str, List[Dict], Dict]:
+        """
+        Build the context text.
+
+        Returns:
+            (context_text, used_chunks, stats)
+        """
+        ordered = sorted(chunks, key=lambda c: (
+            1 if 'synthetic' in c['doc_type'] else 0,
+            c.get('fusion_score', c['score'])
+        ), reverse=True)
+
+        separator_tokens = count_tokens(CHUNK_SEPARATOR)
+        parts = []
+        used_chunks = []
+        used_tokens = 0
+        truncated = False
+
+        for chunk in ordered:
+            cost = count_tokens(chunk['text']) + (separator_tokens if parts else 0)
+            if used_tokens + cost <= budget:
+                parts.append(chunk['text'])
+                used_chunks.append(chunk)
+                used_tokens += cost
+                continue
+
+            remaining = budget - used_tokens - (separator_tokens if parts else 0)
+            if remaining >= self.min_truncated_tokens:
+                text = truncate_to_sentences(chunk['text'], remaining)
+                if text:
+                    parts.append(text)
+                    used_chunks.append(dict(chunk, text=text))
+                    used_tokens += count_tokens(text) + (separator_tokens if len(parts) > 1 else 0)
+                    truncated = True
+            break
+
+        stats = {
+            'budget': budget,
+            'tokens': used_tokens,
+            'chunks_in': len(chunks),
+            'chunks_used': len(used_chunks),
+            'truncated': truncated
+        }
+        metrics.incr("context.requests")
+        metrics.incr("context.tokens", used_tokens)
+        return CHUNK_SEPARATOR.join(parts), used_chunks, stats
+
+context_builder = ContextBuilder()
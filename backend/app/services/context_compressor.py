@@ -0,0 +1,86 @@
+from app.services.context_builder import SENTENCE_SPLIT, count_tokens
+from app.services.lexical_index import lexical_index, tokenize
+from app.core.config import settings
+from app.core.metrics import metrics
+from typing import Dict, List, Tuple
+import time
+
+class ContextCompressor:
+    """
+    Extractive compression of retrieved chunks.
+
+    Each sentence is scored locally by the IDF-weighted overlap of its terms
+    with the query terms (IDF from the BM25 index). Matching sentences are
+    kept together with `window` neighbours on each side so numbers and
+    conditions keep their surrounding context. Chunks with no matching
+    sentence are left untouched: they were retrieved semantically and may
+    still be relevant.
+    """
+
+    def __init__(self, window: int = 1, min_chunk_chars: int = 400):
+        self.window = window
+        self.min_chunk_chars = min_chunk_chars
+
+    def _compress_text(self, text: str, query_terms: set, min_score: float) -> str:
+        sentences = [s for s in SENTENCE_SPLIT.split(text) if s.strip()]
+        if len(sentences) <= 2 * self.window + 1:
+            return text
+
+        keep = set()
+        for i, sentence in enumerate(sentences):
+            overlap = query_terms.intersection(tokenize(sentence))
+            score = sum(lexical_index.idf(term) for term in overlap)
+            if score >= min_score:
+                keep.update(range(max(0, i - self.window), min(len(sentences), i + self.window + 1)))
+
+        if not keep:
+            return text
+
+        # Marcar los huecos para que el modelo no una oraciones no contiguas
+        parts = []
+        previous = None
+        for i in sorted(keep):
+            if previous is not None and i != previous + 1:
+                parts.append("[...]")
+            parts.append(sentences[i])
+            previous = i
+        return "\n".join(parts)
+
+    def compress(self, chunks: List[Dict], query: str) -> Tuple[List[Dict], Dict]:
+        """
+        Compress chunk texts against the query.
+
+        Returns:
+            (compressed_chunks, stats)
+        """
+        start_time = time.time()
+        query_terms = set(tokenize(query))
+        tokens_before = 0
+        tokens_after = 0
+        compressed = []
+
+        for chunk in chunks:
+            before = count_tokens(chunk['text'])
+            tokens_before += before
+            if len(chunk['text']) < self.min_chunk_chars or not query_terms:
+                compressed.append(chunk)
+                tokens_after += before
+                continue
+
+            text = self._compress_text(chunk['text'], query_terms, settings.COMPRESSION_MIN_SENTENCE_SCORE)
+            compressed.append(dict(chunk, text=text) if text != chunk['text'] else chunk)
+            tokens_after += count_tokens(text) if text != chunk['text'] else before
+
+        elapsed = (time.time() - start_time) * 1000
+        stats = {
+            'tokens_before': tokens_before,
+            'tokens_after': tokens_after,
+            'ratio': round(tokens_after / tokens_before, 3) if tokens_before else 1.0,
+            'latency_ms': round(elapsed, 1)
+        }
+        metrics.incr("compression.tokens_before", tokens_before)
+        metrics.incr("compression.tokens_after", tokens_after)
+        metrics.observe("compression", elapsed)
+        return compressed, stats
+
+context_compressor = ContextCompressor()
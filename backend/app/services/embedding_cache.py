@@ -0,0 +1,137 @@
+from app.services.embedding_service import embedding_service, EmbeddingService
+from app.core.config import settings
+from app.core.redis_client import get_redis_binary
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional
+from array import array
+import hashlib
+
+logger = get_logger()
+
+class CachedEmbeddingService:
+    """
+    Memoization layer around EmbeddingService for query embeddings.
+
+    Lookups go to a bounded in-process LRU first, then Redis, and only then
+    to the OpenAI API. Vectors are stored in both levels as raw float32
+    bytes (12 KB for 3072 dims, instead of ~60 KB of JSON in Redis or ~98 KB
+    as a list of Python floats in the LRU) and decoded only when returned.
+    """
+
+    def __init__(self, service: EmbeddingService, max_entries: int = None, ttl: int = None):
+        self.service = service
+        self.model = service.model
+        self.redis = get_redis_binary()
+        self.max_entries = max_entries or settings.EMBEDDING_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.EMBEDDING_CACHE_TTL
+        self._lru = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Normalize text so trivial variations share an entry"""
+        return " ".join(text.lower().split())
+
+    def _cache_key(self, text: str) -> str:
+        """Cache key from model + normalized text"""
+        digest = hashlib.sha1(self._normalize(text).encode()).hexdigest()
+        return f"emb:{self.model}:{digest}"
+
+    @staticmethod
+    def _encode(embedding: list) -> bytes:
+        return array('f', embedding).tobytes()
+
+    @staticmethod
+    def _decode(raw: bytes) -> list:
+        vector = array('f')
+        vector.frombytes(raw)
+        return vector.tolist()
+
+    def _lru_get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            raw = self._lru.get(key)
+            if raw is not None:
+                self._lru.move_to_end(key)
+            return raw
+
+    def _lru_put(self, key: str, raw: bytes):
+        with self._lock:
+            self._lru[key] = raw
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def generate_embedding(self, text: str) -> list:
+        """Generate (or reuse) the embedding for a single text"""
+        return self.generate_embeddings_batch([text])[0]
+
+    def generate_embeddings_batch(self, texts: List[str]) -> List[list]:
+        """Generate (or reuse) embeddings, calling the API only for misses"""
+        keys = [self._cache_key(t) for t in texts]
+        cached = [self._lru_get(k) for k in keys]
+        embeddings: List[Optional[list]] = [self._decode(raw) if raw is not None else None for raw in cached]
+        metrics.incr("embedding_cache.memory_hits", sum(1 for e in embeddings if e is not None))
+
+        # Segundo nivel: Redis
+        pending = [i for i, e in enumerate(embeddings) if e is None]
+        if pending:
+            try:
+                raw_values = self.redis.mget([keys[i] for i in pending])
+                for i, raw in zip(pending, raw_values):
+                    if raw:
+                        embeddings[i] = self._decode(raw)
+                        self._lru_put(keys[i], raw)
+                        metrics.incr("embedding_cache.redis_hits")
+            except Exception as e:
+                logger.warning(f"Embedding cache get error: {str(e)}")
+
+        # Misses: un solo request para todos los textos faltantes
+        missing = [i for i, e in enumerate(embeddings) if e is None]
+        if missing:
+            metrics.incr("embedding_cache.misses", len(missing))
+            # Deduplicar textos que normalizan igual dentro del mismo batch
+            unique_keys = list(dict.fromkeys(keys[i] for i in missing))
+            first_index = {}
+            for i in missing:
+                first_index.setdefault(keys[i], i)
+            generated = self.service.generate_embeddings_batch([texts[first_index[k]] for k in unique_keys])
+            by_key = dict(zip(unique_keys, generated))
+            encoded = {key: self._encode(embedding) for key, embedding in by_key.items()}
+
+            for i in missing:
+                embeddings[i] = by_key[keys[i]]
+            for key, raw in encoded.items():
+                self._lru_put(key, raw)
+
+            try:
+                pipe = self.redis.pipeline()
+                for key, raw in encoded.items():
+                    pipe.setex(key, self.ttl, raw)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Embedding cache save error: {str(e)}")
+                # Cache errors should not break the app
+
+        return embeddings
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and LRU size"""
+        memory_hits = metrics.get("embedding_cache.memory_hits")
+        redis_hits = metrics.get("embedding_cache.redis_hits")
+        misses = metrics.get("embedding_cache.misses")
+        total = memory_hits + redis_hits + misses
+        with self._lock:
+            size = len(self._lru)
+        return {
+            'memory_hits': memory_hits,
+            'redis_hits': redis_hits,
+            'misses': misses,
+            'hit_rate': round((memory_hits + redis_hits) / total, 3) if total else 0.0,
+            'lru_size': size,
+            'lru_max_entries': self.max_entries
+        }
+
+cached_embedding_service = CachedEmbeddingService(embedding_service)
@@ -1,6 +1,8 @@
 from openai import OpenAI
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.metrics import metrics
+import time
 
 logger = get_logger()
 
@@ -22,15 +24,29 @@ class EmbeddingService:
             raise
     
     def generate_embeddings_batch(self, texts: list) -> list:
-        """Generate embeddings for multiple texts"""
+        """Generate embeddings for multiple texts in a single request"""
+        if not texts:
+            return []
+        
+        start_time = time.time()
         try:
             response = self.client.embeddings.create(
                 input=texts,
                 model=self.model
             )
-            return [item.embedding for item in response.data]
+            # La API devuelve los embeddings con su índice; ordenar por seguridad
+            embeddings = [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
         except Exception as e:
-            logger.error(f"Error generating batch embeddings: {str(e)}")
+            metrics.incr("embeddings.batch.errors")
+            logger.error(f"Error generating batch embeddings ({len(texts)} texts): {str(e)}")
             raise
+        
+        elapsed = (time.time() - start_time) * 1000
+        metrics.incr("embeddings.batch.calls")
+        metrics.incr("embeddings.batch.texts", len(texts))
+        metrics.observe("embeddings.batch", elapsed)
+        logger.info(f"Generated {len(embeddings)} embeddings in one batch ({elapsed:.0f}ms)")
+        
+        return embeddings
 
 embedding_service = EmbeddingService()
@@ -0,0 +1,173 @@
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+logger = get_logger()
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+# Expansiones por tipo de pregunta: frases fijas o plantillas sobre la query
+EXPANSION_PLANS: Dict[str, List[Dict[str, str]]] = {
+    'listing': [
+        {'static': "catálogo productos GNP seguros"},
+        {'static': "lista completa seguros GNP"},
+        {'template': 'completo'},
+    ],
+    'international': [
+        {'static': "planes internacionales GMM"},
+        {'static': "cobertura internacional GNP"},
+        {'static': "Enlace Vínculo Mundial"},
+    ],
+    'procedure': [
+        {'template': 'procedimiento'},
+        {'template': 'documentos_necesarios'},
+    ],
+    'definition': [
+        {'template': 'definicion'},
+    ],
+}
+
+EXPANSION_TEMPLATES: Dict[str, Callable[[str], str]] = {
+    'completo': lambda query: f"{query} completo",
+    'procedimiento': lambda query: f"{query} procedimiento",
+    'documentos_necesarios': lambda query: f"{query} documentos necesarios",
+    'definicion': lambda query: f"definición {query.replace('qué es', '').replace('?', '')}",
+}
+
+def render_expansion(step: Dict[str, str], query: str) -> str:
+    if 'static' in step:
+        return step['static']
+    return EXPANSION_TEMPLATES[step['template']](query)
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+class ExpansionVectorRegistry:
+    """
+    Precomputed vectors for query expansions, so expanding adds no embedding calls.
+
+    Static phrases are stored with their embedding. Templated expansions
+    ("{query} procedimiento") are composed as normalize(e(query) + d), where
+    d is the mean offset e("{q} procedimiento") - e(q) over a calibration set
+    of real questions. Both are built by scripts/build_expansion_vectors.py
+    and persisted to settings.EXPANSION_VECTORS_PATH; without the file every
+    expansion is embedded as before.
+    """
+
+    def __init__(self, model: str, dimension: int):
+        self.model = model
+        self.dimension = dimension
+        self.static: Dict[str, np.ndarray] = {}
+        self.directions: Dict[str, np.ndarray] = {}
+        self._lock = Lock()
+        self._loaded = False
+
+    def build(
+        self,
+        embed_batch: Callable[[List[str]], List[list]],
+        calibration_queries: List[str],
+        holdout_queries: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Embed the static phrases and learn one direction per template.
+
+        Returns, per template, the mean cosine against the real embedding of
+        the expansion for the composed vector and for the bare query vector,
+        measured on holdout_queries (or the calibration set if not given).
+        """
+        phrases = sorted({s['static'] for plan in EXPANSION_PLANS.values() for s in plan if 'static' in s})
+        self.static = {
+            phrase: _normalize(np.asarray(vector, dtype=np.float32))
+            for phrase, vector in zip(phrases, embed_batch(phrases))
+        }
+
+        eval_queries = holdout_queries or calibration_queries
+        base = np.asarray(embed_batch(calibration_queries), dtype=np.float32)
+        eval_base = np.asarray(embed_batch(eval_queries), dtype=np.float32)
+        eval_base /= np.linalg.norm(eval_base, axis=1, keepdims=True)
+
+        fidelity = {}
+        for name, render in EXPANSION_TEMPLATES.items():
+            rendered = np.asarray(embed_batch([render(q) for q in calibration_queries]), dtype=np.float32)
+            direction = (rendered - base).mean(axis=0).astype(np.float32)
+            self.directions[name] = direction
+
+            real = np.asarray(embed_batch([render(q) for q in eval_queries]), dtype=np.float32)
+            real /= np.linalg.norm(real, axis=1, keepdims=True)
+            composed = eval_base + direction
+            composed /= np.linalg.norm(composed, axis=1, keepdims=True)
+            fidelity[name] = {
+                'composed': float((composed * real).sum(axis=1).mean()),
+                'query_only': float((eval_base * real).sum(axis=1).mean())
+            }
+
+        self._loaded = True
+        return fidelity
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        static_names = list(self.static)
+        direction_names = list(self.directions)
+        np.savez_compressed(
+            path,
+            model=np.array(self.model),
+            static_names=np.array(static_names),
+            static_vectors=np.stack([self.static[n] for n in static_names]),
+            direction_names=np.array(direction_names),
+            direction_vectors=np.stack([self.directions[n] for n in direction_names])
+        )
+
+    def load(self, path: Path):
+        data = np.load(path, allow_pickle=False)
+        if str(data['model']) != self.model or data['static_vectors'].shape[1] != self.dimension:
+            logger.warning(f"Expansion vectors in {path} were built for {data['model']}, ignoring")
+            return
+        self.static = dict(zip(data['static_names'].tolist(), data['static_vectors']))
+        self.directions = dict(zip(data['direction_names'].tolist(), data['direction_vectors']))
+
+    def ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            path = BACKEND_DIR / settings.EXPANSION_VECTORS_PATH
+            if path.exists():
+                try:
+                    self.load(path)
+                    logger.info(
+                        f"Expansion vectors loaded: {len(self.static)} phrases, "
+                        f"{len(self.directions)} templates"
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not load expansion vectors from {path}: {str(e)}")
+            self._loaded = True
+
+    def static_vector(self, text: str) -> Optional[list]:
+        """Precomputed vector of a static expansion phrase, or None"""
+        self.ensure_loaded()
+        vector = self.static.get(text)
+        if vector is None:
+            return None
+        metrics.incr("expansion_vectors.static")
+        return vector.tolist()
+
+    def direction(self, text: str, query: str) -> Optional[np.ndarray]:
+        """Direction of the template that renders text from query, or None"""
+        self.ensure_loaded()
+        for name, direction in self.directions.items():
+            if EXPANSION_TEMPLATES[name](query) == text:
+                return direction
+        return None
+
+    def compose(self, query_vector: list, direction: np.ndarray) -> list:
+        """Templated expansion vector: normalize(e(query) + d)"""
+        metrics.incr("expansion_vectors.composed")
+        return _normalize(np.asarray(query_vector, dtype=np.float32) + direction).tolist()
+
+expansion_vectors = ExpansionVectorRegistry(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIMENSION)
@@ -0,0 +1,162 @@
+from typing import Dict, FrozenSet, Optional, Set
+import re
+
+# Conjuntos de palabras clave (se normalizan al compilar: sin acentos ni signos)
+GREETING_KEYWORDS = [
+    'hola', 'buenos dias', 'buenas tardes', 'buenas noches', 'buen dia',
+    'que tal', 'saludos', 'hey', 'hi', 'hello'
+]
+# Palabras que pueden acompañar a un saludo sin convertirlo en pregunta
+GREETING_FILLER = [
+    'soia', 'como estas', 'como esta', 'como te va', 'gracias', 'amigo', 'amiga',
+    'a todos', 'que onda', 'buenas', 'buen', 'muy', 'y', 'oye'
+]
+PORTAL_KEYWORDS = [
+    'portal', 'portales', 'intermediario', 'intermediarios', 'portal de ideas',
+    'portal idea', 'plataforma', 'donde cotizar', 'donde cotizo'
+]
+FEATURE_KEYWORDS = [
+    # Periodos y tiempos
+    'periodos de espera', 'periodo de espera', 'tiempo de espera', 'tiempos de espera', 'cuanto tiempo',
+    # Costos y pagos
+    'deducible', 'deducibles', 'coaseguro', 'coaseguros', 'copago', 'copagos',
+    'precio', 'precios', 'costo', 'costos', 'prima', 'primas', 'tarifa', 'tarifas',
+    # Coberturas y beneficios
+    'cobertura', 'coberturas', 'beneficio', 'beneficios', 'servicio', 'servicios',
+    'incluye', 'cubre', 'protege', 'ampara',
+    # Exclusiones y limitaciones
+    'exclusiones', 'exclusion', 'limitaciones', 'limitacion', 'restricciones', 'restriccion',
+    'no cubre', 'no incluye', 'excepto', 'salvo',
+    # Requisitos y documentación
+    'requisitos', 'requisito', 'documentos', 'documento', 'papeles', 'tramites', 'tramite',
+    # Listas completas
+    'lista completa', 'todos los', 'todas las', 'todo lo que', 'cuales son todos',
+    'lista de', 'listado de', 'relacion de',
+    # Condiciones
+    'condiciones', 'condicion', 'clausula', 'clausulas', 'terminos',
+    # Sumas aseguradas y límites
+    'suma asegurada', 'sumas aseguradas', 'limite', 'limites', 'tope', 'topes',
+    'monto', 'montos', 'maximo', 'maximos', 'minimo', 'minimos'
+]
+PRODUCT_KEYWORDS = [
+    'versatil', 'premium', 'platino', 'conexion gnp', 'gmm', 'gastos medicos',
+    'vida', 'auto', 'autos', 'danos', 'hogar', 'mascota', 'negocio protegido', 'cyber safe'
+]
+WAITING_PERIOD_KEYWORDS = ['periodo', 'periodos']
+WAITING_KEYWORDS = ['espera', 'esperas']
+
+# Tipos de expansión de la query (en orden de prioridad)
+EXPANSION_KEYWORDS = {
+    'listing': ['todos', 'lista', 'cuales', 'que productos'],
+    'international': ['internacional', 'internacionales'],
+    'procedure': ['requisitos', 'como', 'proceso', 'pasos'],
+    'definition': ['que es', 'define', 'significa'],
+}
+
+# Las letras base también aceptan su versión acentuada, así el mensaje solo se pasa a minúsculas
+_ACCENTS = str.maketrans('áéíóúüñ', 'aeiouun')
+_ACCENTED_CLASSES = {'a': '[aá]', 'e': '[eé]', 'i': '[ií]', 'o': '[oó]', 'u': '[uúü]', 'n': '[nñ]'}
+_WORD = re.compile(r'\w+')
+
+GREETING_LABELS = {'greeting', 'filler'}
+
+def _normalize(text: str) -> str:
+    return text.lower().translate(_ACCENTS)
+
+def _trie_pattern(terms) -> str:
+    """
+    Alternation of the terms factored as a character trie: the regex engine
+    follows one branch per character instead of retrying every keyword at
+    each position. Optional groups are greedy, so longer terms win.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [
+            _ACCENTED_CLASSES.get(char, re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return '(?:' + build(trie) + ')'
+
+class IntentRouter:
+    """
+    Classify a message once per request.
+
+    Every keyword set is compiled at import time into one word-boundary regex
+    shaped as a character trie, so a message is scanned once and "hi" no
+    longer matches "hipertension". Each keyword carries the labels
+    of all the keyword sets it belongs to, including those of shorter
+    keywords it contains ("lista de" is also "lista"), which keeps the
+    single non-overlapping scan equivalent to matching every set. A message
+    is a greeting only when nothing but greeting words is left;
+    "hola, ¿cuál es el deducible de Premium?" goes to retrieval.
+
+    route() returns a dict:
+        name: 'greeting' | 'portal' | 'waiting_periods' | 'comprehensive' | 'general'
+        expansion: 'listing' | 'international' | 'procedure' | 'definition' | None
+    """
+
+    def __init__(self):
+        keyword_sets = {
+            'greeting': GREETING_KEYWORDS,
+            'filler': GREETING_FILLER,
+            'portal': PORTAL_KEYWORDS,
+            'feature': FEATURE_KEYWORDS,
+            'product': PRODUCT_KEYWORDS,
+            'waiting_period': WAITING_PERIOD_KEYWORDS,
+            'waiting': WAITING_KEYWORDS,
+            **EXPANSION_KEYWORDS,
+        }
+        labels: Dict[str, Set[str]] = {}
+        for label, keywords in keyword_sets.items():
+            for keyword in keywords:
+                labels.setdefault(_normalize(keyword).strip(), set()).add(label)
+
+        # Un término hereda las etiquetas de los términos más cortos que contiene
+        self._labels: Dict[str, FrozenSet[str]] = {}
+        for term in labels:
+            inherited = set(labels[term])
+            for other in labels:
+                if other != term and re.search(rf'\b{re.escape(other)}\b', term):
+                    inherited |= labels[other]
+            self._labels[term] = frozenset(inherited)
+
+        self._regex = re.compile(r'\b' + _trie_pattern(self._labels) + r'\b')
+
+    def route(self, message: str) -> Dict[str, Optional[str]]:
+        """Structured intent of the message"""
+        text = message.lower()
+
+        found: Set[str] = set()
+        greeting_words = 0
+        for match in self._regex.finditer(text):
+            term_labels = self._labels[_normalize(match.group())]
+            found |= term_labels
+            if term_labels & GREETING_LABELS:
+                greeting_words += match.group().count(' ') + 1
+
+        if 'greeting' in found and greeting_words == len(_WORD.findall(text)):
+            name = 'greeting'
+        elif 'portal' in found:
+            name = 'portal'
+        elif 'waiting_period' in found and 'waiting' in found:
+            name = 'waiting_periods'
+        elif 'product' in found and 'feature' in found:
+            name = 'comprehensive'
+        else:
+            name = 'general'
+
+        expansion = next((e for e in EXPANSION_KEYWORDS if e in found), None)
+        return {'name': name, 'expansion': expansion}
+
+intent_router = IntentRouter()
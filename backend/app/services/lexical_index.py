@@ -0,0 +1,246 @@
+from app.services.product_catalog import normalize_text
+from app.core.config import settings
+from app.core.logger import get_logger
+from collections import Counter, defaultdict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import gzip
+import hashlib
+import json
+import math
+import re
+import time
+
+logger = get_logger()
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+DATA_DIR = BACKEND_DIR / "data"
+
+# Chunking de los PDFs igual que scripts/process_pdfs.py (por página, ventanas fijas)
+PDF_CHUNK_SIZE = 1000
+PDF_CHUNK_OVERLAP = 200
+PAGE_MARKER = re.compile(r'\n*--- PÁGINA \d+ DE \d+ ---\n*')
+
+# Palabras vacías frecuentes en las preguntas de los agentes
+STOPWORDS = {
+    'a', 'al', 'como', 'con', 'cual', 'cuales', 'de', 'del', 'donde', 'el', 'en', 'es',
+    'esta', 'este', 'hay', 'la', 'las', 'lo', 'los', 'me', 'mi', 'o', 'para', 'por',
+    'que', 'se', 'si', 'sin', 'sobre', 'son', 'su', 'sus', 'tiene', 'un', 'una', 'y'
+}
+
+def _stem(token: str) -> str:
+    """Minimal plural folding: deducibles -> deducible, periodos -> periodo"""
+    return token[:-1] if len(token) > 4 and token.endswith('s') else token
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip accents, drop stopwords and fold plurals"""
+    return [_stem(t) for t in normalize_text(text).split() if t not in STOPWORDS]
+
+def chunk_text(text: str, chunk_size: int = 2000, overlap: int = 200) -> List[str]:
+    """Split text into overlapping chunks, preferring line/sentence boundaries"""
+    chunks = []
+    start = 0
+
+    while start < len(text):
+        end = start + chunk_size
+
+        if end < len(text):
+            search_area = text[end - 200:end]
+            last_newline = search_area.rfind('\n')
+            last_period = search_area.rfind('. ')
+
+            if last_newline > 0:
+                end = end - 200 + last_newline
+            elif last_period > 0:
+                end = end - 200 + last_period + 1
+
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+
+        start = end - overlap if end < len(text) else end
+
+    return chunks
+
+def chunk_pdf_text(text: str, chunk_size: int = PDF_CHUNK_SIZE, overlap: int = PDF_CHUNK_OVERLAP) -> List[str]:
+    """Split an extracted manual page by page into fixed windows, like process_pdfs.py"""
+    chunks = []
+    for page in PAGE_MARKER.split(text):
+        if not page.strip():
+            continue
+        start = 0
+        while start < len(page):
+            chunk = page[start:start + chunk_size]
+            if chunk.strip():
+                chunks.append(chunk)
+            start += chunk_size - overlap
+    return chunks
+
+def load_corpus_documents(data_dir: Path = DATA_DIR) -> List[Dict]:
+    """
+    Chunk the extracted manuals and the synthetic docs into index documents.
+
+    Fallback when the index is not built from the Pinecone metadata: the
+    chunking mirrors the upload scripts, but the extracted text comes from a
+    different PDF parser, so manual chunks may not line up with the dense hits.
+    """
+    # Imports locales: solo se necesitan al construir el índice
+    from app.services.query_understanding import query_understanding
+    from app.services.near_duplicates import simhash_hex
+
+    documents = []
+    files = sorted(data_dir.glob("extracted*/*_extracted.txt")) + sorted(data_dir.glob("synthetic/*.txt"))
+
+    for filepath in files:
+        text = filepath.read_text(encoding='utf-8', errors='ignore')
+        if not text.strip():
+            continue
+
+        if filepath.parent.name == 'synthetic':
+            # Formato: synthetic_producto_categoria.txt
+            parts = filepath.stem.split('_')
+            product = parts[1] if len(parts) >= 3 else None
+            category = '_'.join(parts[2:]) if len(parts) >= 3 else None
+            doc_type = 'synthetic'
+            source = filepath.name
+            chunks = chunk_text(text)  # Igual que upload_synthetic_docs.py
+        else:
+            products = query_understanding.analyze(filepath.stem)['products']
+            product = products[0] if products else None
+            category = None
+            doc_type = 'pdf'
+            source = filepath.name.replace('_extracted.txt', '.pdf')
+            chunks = chunk_pdf_text(text)
+
+        for i, chunk in enumerate(chunks):
+            chunk_hash = hashlib.md5(chunk.encode()).hexdigest()[:12]
+            documents.append({
+                'id': f"lex_{chunk_hash}_{i}",
+                'text': chunk,
+                'source': source,
+                'doc_type': doc_type,
+                'product': product,
+                'category': category,
+                'simhash': simhash_hex(chunk)
+            })
+
+    return documents
+
+class LexicalIndex:
+    """
+    In-memory BM25 index over the knowledge-base chunk texts.
+
+    Complements dense retrieval on exact terms (coaseguro, deducible, plan
+    names, amounts) that embeddings tend to blur.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Dict] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._doc_lengths: List[int] = []
+        self._avgdl = 0.0
+        self._idf: Dict[str, float] = {}
+        self._lock = Lock()
+        self._loaded = False
+
+    def build(self, documents: List[Dict]):
+        """Build the inverted index from a list of {'id', 'text', ...} documents"""
+        postings = defaultdict(list)
+        doc_lengths = []
+
+        for doc_idx, doc in enumerate(documents):
+            tokens = tokenize(doc['text'])
+            doc_lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings[term].append((doc_idx, tf))
+
+        n_docs = len(documents)
+        self.documents = documents
+        self._postings = dict(postings)
+        self._doc_lengths = doc_lengths
+        self._avgdl = (sum(doc_lengths) / n_docs) if n_docs else 0.0
+        self._idf = {
+            term: math.log(1 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            for term, plist in self._postings.items()
+        }
+        self._loaded = True
+
+    def search(self, query: str, top_k: int = 20, products: Optional[List[str]] = None) -> List[Tuple[Dict, float]]:
+        """
+        Return the top_k (document, bm25_score) pairs for the query.
+
+        When products are given, documents tagged with a different product
+        are skipped (untagged documents are kept; tags match without accents).
+        """
+        self.ensure_loaded()
+        if not self.documents:
+            return []
+
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            plist = self._postings.get(term)
+            if not plist:
+                continue
+            idf = self._idf[term]
+            for doc_idx, tf in plist:
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_idx] / self._avgdl)
+                scores[doc_idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        wanted = {normalize_text(p) for p in products or []}
+        results = []
+        for doc_idx, score in ranked:
+            doc = self.documents[doc_idx]
+            if wanted and doc.get('product') and normalize_text(doc['product']) not in wanted:
+                continue
+            results.append((doc, score))
+            if len(results) >= top_k:
+                break
+        return results
+
+    def idf(self, term: str) -> float:
+        """IDF of a (tokenized) term; unseen terms get the maximum IDF"""
+        self.ensure_loaded()
+        if term in self._idf:
+            return self._idf[term]
+        n_docs = len(self.documents)
+        return math.log(1 + (n_docs + 0.5) / 0.5)
+
+    def save(self, path: Path):
+        """Persist the index documents (postings are rebuilt on load)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump({'version': 1, 'documents': self.documents}, f, ensure_ascii=False)
+
+    def load(self, path: Path):
+        """Load documents from a prebuilt file and rebuild postings"""
+        with gzip.open(Path(path), 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+        self.build(payload['documents'])
+
+    def ensure_loaded(self):
+        """Load the prebuilt index if present, otherwise build it from data/"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            start_time = time.time()
+            path = BACKEND_DIR / settings.LEXICAL_INDEX_PATH
+            if path.exists():
+                self.load(path)
+                origin = str(path)
+            else:
+                self.build(load_corpus_documents())
+                origin = str(DATA_DIR)
+            elapsed = (time.time() - start_time) * 1000
+            logger.info(
+                f"Lexical index ready: {len(self.documents)} chunks, "
+                f"{len(self._postings)} terms from {origin} ({elapsed:.0f}ms)"
+            )
+
+lexical_index = LexicalIndex()
@@ -1,7 +1,10 @@
 from openai import OpenAI
 from app.core.config import settings
 from app.core.logger import get_logger
-from typing import List, Dict
+from app.services.response_templates import GREETING_TEMPLATE
+from app.services.intent_router import intent_router
+from typing import Iterator, List, Dict, Optional
+import hashlib
 
 logger = get_logger()
 
@@ -16,71 +19,119 @@ class LLMService:
         self,
         user_message: str,
         context: str = "",
-        conversation_history: List[Dict] = None
+        conversation_history: List[Dict] = None,
+        max_tokens: Optional[int] = None
     ) -> tuple[str, int]:
-        """Generate response using GPT-4o"""
+        """Generate response using GPT-4o (max_tokens defaults to settings.MAX_TOKENS)"""
+        response_text, usage = self.generate_response_with_usage(
+            user_message, context, conversation_history, max_tokens
+        )
+        return response_text, usage['total_tokens']
+    
+    def generate_response_with_usage(
+        self,
+        user_message: str,
+        context: str = "",
+        conversation_history: List[Dict] = None,
+        max_tokens: Optional[int] = None
+    ) -> tuple[str, Dict[str, int]]:
+        """Like generate_response, returning prompt / completion / total token counts"""
         try:
-            system_prompt = self._build_system_prompt(context, user_message)
-            
-            messages = [
-                {"role": "system", "content": system_prompt}
-            ]
-            
-            if conversation_history:
-                messages.extend(conversation_history)
-            
-            messages.append({
-                "role": "user",
-                "content": user_message
-            })
-            
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
+                messages=self._build_messages(user_message, context, conversation_history),
                 temperature=self.temperature,
-                max_tokens=self.max_tokens
+                max_tokens=max_tokens or self.max_tokens
             )
             
             response_text = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens
+            usage = {
+                'prompt_tokens': response.usage.prompt_tokens,
+                'completion_tokens': response.usage.completion_tokens,
+                'total_tokens': response.usage.total_tokens
+            }
             
-            logger.info(f"Generated response with {tokens_used} tokens using {self.model}")
+            logger.info(f"Generated response with {usage['total_tokens']} tokens using {self.model}")
             
-            return response_text, tokens_used
+            return response_text, usage
             
         except Exception as e:
             logger.error(f"Error generating LLM response: {str(e)}")
             raise
     
+    def stream_response(
+        self,
+        user_message: str,
+        context: str = "",
+        conversation_history: List[Dict] = None,
+        max_tokens: Optional[int] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> Iterator[str]:
+        """
+        Yield the response text as GPT-4o produces it.
+        
+        usage, when given, is filled with the token counts once the stream ends.
+        """
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(user_message, context, conversation_history),
+                temperature=self.temperature,
+                max_tokens=max_tokens or self.max_tokens,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            
+            for chunk in stream:
+                # El último chunk trae solo el uso de tokens, sin choices
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if chunk.usage and usage is not None:
+                    usage.update({
+                        'prompt_tokens': chunk.usage.prompt_tokens,
+                        'completion_tokens': chunk.usage.completion_tokens,
+                        'total_tokens': chunk.usage.total_tokens
+                    })
+            
+            logger.info(f"Streamed response with {(usage or {}).get('total_tokens', '?')} tokens using {self.model}")
+            
+        except Exception as e:
+            logger.error(f"Error streaming LLM response: {str(e)}")
+            raise
+    
+    def _build_messages(self, user_message: str, context: str, conversation_history: List[Dict] = None) -> List[Dict]:
+        messages = [
+            {"role": "system", "content": self._build_system_prompt(context, user_message)}
+        ]
+        
+        if conversation_history:
+            messages.extend(conversation_history)
+        
+        messages.append({
+            "role": "user",
+            "content": user_message
+        })
+        return messages
+    
+    def prompt_fingerprint(self) -> str:
+        """Short hash of the model and base system prompt, for cache invalidation"""
+        raw = f"{self.model}\n{self._build_system_prompt()}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:12]
+    
     def _is_greeting(self, message: str) -> bool:
         """Detect if message is a greeting"""
-        greetings = [
-            'hola', 'buenos días', 'buenas tardes', 'buenas noches',
-            'qué tal', 'saludos', 'hey', 'hi', 'hello', 'buen día'
-        ]
-        msg_lower = message.lower().strip()
-        return any(greeting in msg_lower for greeting in greetings)
+        return intent_router.route(message)['name'] == 'greeting'
     
     def _build_system_prompt(self, context: str = "", user_message: str = "") -> str:
         """Build system prompt with greeting detection and strict formatting"""
         
         # Detectar si es saludo
         if self._is_greeting(user_message):
-            return """Eres SOIA, asistente virtual de Consolida Capital.
+            return f"""Eres SOIA, asistente virtual de Consolida Capital.
 
 El usuario te está saludando. Responde de manera amigable y profesional siguiendo este formato EXACTO:
 
-¡Hola! Soy SOIA, tu asistente virtual de Consolida Capital.
-
-Estoy aquí para ayudarte con información sobre los productos y servicios de GNP. Como agente de Consolida Capital, puedo asistirte con:
-
-- Información de productos (GMM, Vida, Autos, Daños)
-- Requisitos y procedimientos
-- Coberturas y beneficios
-- Gestión de pólizas
-- Preguntas frecuentes
-
-¿En qué puedo ayudarte hoy?
+{GREETING_TEMPLATE}
 
 IMPORTANTE: Usa EXACTAMENTE este formato. No agregues ni quites nada."""
         
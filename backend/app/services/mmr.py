@@ -0,0 +1,70 @@
+"""
+Maximal Marginal Relevance selection
+
+Pick a diverse subset of candidate chunks under a token budget, so that
+near-identical fragments of the same manual page don't fill the prompt.
+"""
+
+from app.services.context_builder import count_tokens
+from typing import Callable, Dict, List
+import numpy as np
+
+def mmr_select(
+    candidates: List[Dict],
+    max_chunks: int,
+    token_budget: int,
+    lambda_mult: float = 0.7,
+    count_tokens: Callable[[str], int] = count_tokens
+) -> List[Dict]:
+    """
+    Greedy MMR over candidates already ordered by priority (best first).
+
+    Relevance comes from the candidate's position in that order, so the
+    synthetic-first / fusion ranking is preserved. Redundancy is the max
+    cosine similarity to the already selected chunks, computed from the
+    Pinecone vectors in candidate['values']; candidates without a vector
+    (e.g. lexical-only hits) count as non-redundant.
+
+    Args:
+        candidates: Chunks ordered best-first
+        max_chunks: Maximum number of chunks to return
+        token_budget: Maximum total tokens of the selected texts
+        lambda_mult: 1.0 = pure relevance, 0.0 = pure diversity
+        count_tokens: Token counter for chunk texts
+    """
+    n = len(candidates)
+    if n == 0:
+        return []
+
+    relevance = 1.0 - np.arange(n, dtype=np.float32) / n
+    tokens = np.array([count_tokens(c['text']) for c in candidates])
+
+    # Matriz de similitud coseno entre candidatos (vectorizada)
+    dimension = next((len(c['values']) for c in candidates if c.get('values')), 0)
+    vectors = np.zeros((n, max(dimension, 1)), dtype=np.float32)
+    for i, c in enumerate(candidates):
+        if c.get('values') and len(c['values']) == dimension:
+            vectors[i] = c['values']
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+    similarity = vectors @ vectors.T
+
+    max_redundancy = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected = []
+    remaining_budget = token_budget
+
+    while len(selected) < max_chunks and available.any():
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        available[best] = False
+
+        if tokens[best] > remaining_budget:
+            continue  # No cabe; probar con el siguiente
+
+        selected.append(best)
+        remaining_budget -= tokens[best]
+        max_redundancy = np.maximum(max_redundancy, similarity[best])
+
+    return [candidates[i] for i in selected]
@@ -0,0 +1,108 @@
+from app.services.product_catalog import normalize_text
+from app.services.context_builder import count_tokens
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+import hashlib
+import numpy as np
+
+logger = get_logger()
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word 3-shingles of the normalized text"""
+    words = normalize_text(text).split()
+    if len(words) < SHINGLE_SIZE:
+        shingles = Counter([" ".join(words)])
+    else:
+        shingles = Counter(
+            " ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)
+        )
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.md5(s.encode()).digest()[:8], 'big') for s in shingles],
+        dtype=np.uint64
+    )
+    counts = np.array(list(shingles.values()), dtype=np.int64)
+
+    # Suma ponderada por bit: +count si el bit está encendido, -count si no
+    bits = (hashes[:, None] >> np.arange(SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)
+    weights = ((bits.astype(np.int64) * 2 - 1) * counts[:, None]).sum(axis=0)
+
+    signature = 0
+    for bit in np.flatnonzero(weights > 0):
+        signature |= 1 << int(bit)
+    return signature
+
+def simhash_hex(text: str) -> str:
+    """SimHash as a hex string, for Pinecone metadata (no 64-bit ints there)"""
+    return f"{simhash(text):016x}"
+
+class NearDuplicateFilter:
+    """
+    Collapse near-identical chunks (same manual stored in several folders,
+    overlapping chunk windows) before context assembly.
+
+    Uses the precomputed 'simhash' metadata when present and computes the
+    signature on the fly otherwise. Two chunks are duplicates when their
+    signatures differ in at most max_distance bits; the first one (highest
+    priority) is kept.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._stats_hooks: List[Callable[[Dict], None]] = []
+
+    def register_stats_hook(self, hook: Callable[[Dict], None]):
+        """Call hook(stats) after every filtering pass"""
+        self._stats_hooks.append(hook)
+
+    @staticmethod
+    def _signature(chunk: Dict) -> int:
+        precomputed: Optional[str] = chunk.get('simhash')
+        if precomputed:
+            try:
+                return int(precomputed, 16)
+            except ValueError:
+                pass
+        return simhash(chunk['text'])
+
+    def filter(self, chunks: List[Dict]) -> Tuple[List[Dict], Dict]:
+        """
+        Drop near-duplicates from chunks ordered best-first.
+
+        Returns:
+            (kept_chunks, stats)
+        """
+        kept = []
+        kept_signatures = []
+        removed = 0
+        removed_tokens = 0
+
+        for chunk in chunks:
+            signature = self._signature(chunk)
+            if any((signature ^ other).bit_count() <= self.max_distance for other in kept_signatures):
+                removed += 1
+                removed_tokens += count_tokens(chunk['text'])
+                continue
+            kept.append(chunk)
+            kept_signatures.append(signature)
+
+        stats = {'chunks_in': len(chunks), 'removed': removed, 'tokens_removed': removed_tokens}
+        for hook in self._stats_hooks:
+            try:
+                hook(stats)
+            except Exception as e:
+                logger.warning(f"Near-duplicate stats hook error: {str(e)}")
+
+        return kept, stats
+
+def _record_metrics(stats: Dict):
+    metrics.incr("near_duplicates.removed", stats['removed'])
+    metrics.incr("near_duplicates.tokens_removed", stats['tokens_removed'])
+
+near_duplicate_filter = NearDuplicateFilter()
+near_duplicate_filter.register_stats_hook(_record_metrics)
@@ -58,7 +58,13 @@ class PineconeService:
             logger.error(f"Error upserting vectors: {str(e)}")
             raise
     
-    def query_vectors(self, query_vector: list, top_k: int = None, filter_dict: dict = None):
+    def query_vectors(
+        self,
+        query_vector: list,
+        top_k: int = None,
+        filter_dict: dict = None,
+        include_values: bool = False
+    ):
         """Query vectors from Pinecone"""
         if top_k is None:
             top_k = settings.TOP_K
@@ -69,11 +75,20 @@ class PineconeService:
                 vector=query_vector,
                 top_k=top_k,
                 filter=filter_dict,
-                include_metadata=True
+                include_metadata=True,
+                include_values=include_values
             )
             return results
         except Exception as e:
             logger.error(f"Error querying vectors: {str(e)}")
             raise
 
+    def get_stats(self):
+        """Index statistics (vector counts per namespace)"""
+        try:
+            return self.get_index().describe_index_stats()
+        except Exception as e:
+            logger.error(f"Error getting index stats: {str(e)}")
+            raise
+
 pinecone_service = PineconeService()
@@ -0,0 +1,105 @@
+from app.services.llm_service import llm_service
+from app.services.product_catalog import normalize_text
+from app.core.redis_client import get_redis
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+import hashlib
+import json
+
+logger = get_logger()
+
+# Preguntas canónicas que se precalculan en el despliegue (scripts/precompute_answers.py)
+CANONICAL_QUESTIONS: Dict[str, List[str]] = {
+    'portal': [
+        "¿Qué es el portal de intermediarios?",
+        "¿Qué es el portal de ideas?",
+        "¿Dónde cotizo?",
+        "¿Dónde puedo cotizar?",
+        "¿Qué portales puedo usar?",
+        "¿Cuál es la diferencia entre el portal de intermediarios y el portal de ideas?",
+        "¿Qué plataforma uso para gestionar pólizas?",
+    ],
+}
+
+class PrecomputedAnswerStore:
+    """
+    Answers for static-knowledge intents (e.g. portals), whose content comes
+    entirely from the system prompt and not from retrieval.
+
+    Entries live in Redis under precomputed:{intent}:{prompt_hash}:{question_hash};
+    only the answers to CANONICAL_QUESTIONS are also kept in memory, so the
+    worker's memory stays bounded. The prompt hash covers the model and the
+    system prompt, so editing the prompt invalidates every stored answer
+    without touching Redis; old keys expire with their TTL.
+    """
+
+    def __init__(self, redis_client, prompt_provider: Callable[[], str], ttl: int):
+        self.redis = redis_client
+        self.prompt_provider = prompt_provider
+        self.ttl = ttl
+        self._memory: Dict[str, str] = {}  # Solo preguntas canónicas
+        self._canonical = {
+            (intent, self._normalize(q)) for intent, questions in CANONICAL_QUESTIONS.items() for q in questions
+        }
+        self._lock = Lock()
+        self._prompt_hash: Optional[str] = None
+
+    @property
+    def prompt_hash(self) -> str:
+        if self._prompt_hash is None:
+            self._prompt_hash = self.prompt_provider()
+        return self._prompt_hash
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        return " ".join(normalize_text(question).split())
+
+    def _key(self, intent: str, question: str) -> str:
+        question_hash = hashlib.md5(self._normalize(question).encode()).hexdigest()
+        return f"precomputed:{intent}:{self.prompt_hash}:{question_hash}"
+
+    def _memoize(self, intent: str, question: str) -> bool:
+        return (intent, self._normalize(question)) in self._canonical
+
+    def get(self, intent: str, question: str) -> Optional[str]:
+        """Stored answer for the question, or None"""
+        key = self._key(intent, question)
+        with self._lock:
+            answer = self._memory.get(key)
+        if answer is None:
+            try:
+                raw = self.redis.get(key)
+                if raw:
+                    answer = json.loads(raw)['response']
+                    if self._memoize(intent, question):
+                        with self._lock:
+                            self._memory[key] = answer
+            except Exception as e:
+                logger.warning(f"Precomputed answer read error: {str(e)}")
+
+        metrics.incr("precomputed.hits" if answer is not None else "precomputed.misses")
+        return answer
+
+    def put(self, intent: str, question: str, answer: str):
+        """Store an answer in Redis (and in memory for canonical questions)"""
+        key = self._key(intent, question)
+        if self._memoize(intent, question):
+            with self._lock:
+                self._memory[key] = answer
+        try:
+            self.redis.setex(key, self.ttl, json.dumps({'question': question, 'response': answer}))
+        except Exception as e:
+            logger.warning(f"Precomputed answer write error: {str(e)}")
+
+    def generate(self, intent: str, question: str) -> Tuple[str, int]:
+        """Answer the question with the LLM (no history) and store it"""
+        answer, tokens_used = llm_service.generate_response(user_message=question, context="")
+        self.put(intent, question, answer)
+        return answer, tokens_used
+
+precomputed_answers = PrecomputedAnswerStore(
+    get_redis(), llm_service.prompt_fingerprint, settings.PRECOMPUTED_ANSWERS_TTL
+)
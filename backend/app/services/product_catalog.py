@@ -0,0 +1,203 @@
+"""
+Catálogo de productos GNP
+
+Patrones de productos, áreas y categorías compartidos por los scripts de
+ingesta (que los usan para etiquetar la metadata de los vectores) y por
+el servicio de query understanding (que los usa para filtrar búsquedas).
+"""
+
+import re
+
+# ESTRUCTURA REAL COMPLETA DE GNP
+GNP_PRODUCTS = {
+    'GMM': {
+        'Individual': {
+            'name': 'Gastos Médicos Mayores Individual',
+            'products': [
+                'Premium', 'Platino', 'Flexibles', 'Versátil',
+                'Conexión GNP', 'Conexión Línea Azul',
+                'GNP Indemniza', 'Acceso', 'Esencial', 'Plenitud', 'VIP',
+                'Internacional', 'GNP Enlace Internacional', 
+                'Vínculo Mundial', 'Alta Especialidad'
+            ]
+        },
+        'PyMES_Corporativo': {
+            'name': 'Gastos Médicos Mayores PyMES y Corporativo',
+            'products': [
+                'GMM Grupo', 'GNP Indemniza', 'Respaldo Hospitalario',
+                'Línea Azul VIP', 'Línea Azul Internacional', 
+                'Línea Azul Premier', 'Seguro por Hospitalización',
+                'Accidentes Personales'
+            ]
+        }
+    },
+    'Vida': {
+        'Individual': {
+            'name': 'Vida Individual',
+            'products': {
+                'Protección y Ahorro': [
+                    'Visión Plus', 'Privilegio Universal', 'Trasciende',
+                    'Ordinario de Vida', 'Platino Universal'
+                ],
+                'Retiro': [
+                    'Consolida', 'Proyecta', 'Proyecta Afecto',
+                    'Consolida Total', 'Elige'
+                ],
+                'Ahorro': [
+                    'Vida a tus sueños', 'Dotal', 'Inversión',
+                    'Capitaliza', 'Vida Inversión'
+                ],
+                'Educación': [
+                    'Profesional Abuelos', 'Profesional'
+                ],
+                'Protección': [
+                    'Platino', 'Privilegio'
+                ]
+            }
+        },
+        'PyMES_Corporativo': {
+            'name': 'Vida PyMES y Corporativo',
+            'products': [
+                'Vida Grupo', 'GNP Vida Deudor', 'Vida Escolar GNP'
+            ]
+        }
+    },
+    'Autos': {
+        'Individual': {
+            'name': 'Autos Individual',
+            'products': [
+                'Auto Más', 'Auto Élite', 'Motos',
+                'Automóviles Individual', 'Auto Más Información C.',
+                'Autos Turistas GNP'
+            ]
+        },
+        'PyMES_Corporativo': {
+            'name': 'Autos PyMES y Corporativo',
+            'products': [
+                'Flotillas PyMEs y Corporativo', 'Micronegocio'
+            ]
+        }
+    },
+    'Daños': {
+        'Individual': {
+            'name': 'Daños Individual',
+            'products': [
+                'GNP Riesgos Naturales', 'Mi Mascota GNP',
+                'Hogar versátil'
+            ]
+        },
+        'PyMES_Corporativo': {
+            'name': 'Daños PyMES y Corporativo',
+            'products': [
+                'Negocio Protegido GNP', 'Cyber Safe',
+                'Transporte de Mercancías', 'Responsabilidad Civil',
+                'Condominios - Áreas Comunes', 
+                'Responsabilidad Civil Profesional',
+                'Equipo de Contratistas con RC', 'Equipo Electrónico',
+                'Técnicos', 'Embarcaciones Menores de Placer',
+                'Multirriesgo Protegido GNP', 
+                'Responsabilidad Ambiental GNP',
+                'Agricultura Protegida GNP'
+            ]
+        }
+    }
+}
+
+# Mapeo de patrones de productos conocidos con sus áreas
+PRODUCT_PATTERNS = {
+    # GMM - Gastos Médicos Mayores
+    'premium': {
+        'patterns': ['premium', 'prémium'],
+        'area': 'gmm'
+    },
+    'conexión gnp': {
+        'patterns': ['conexion', 'conexión', 'conexion gnp', 'conexión gnp'],
+        'area': 'gmm'
+    },
+    'versátil': {
+        'patterns': ['versatil', 'versátil'],
+        'area': 'gmm'
+    },
+    'alta especialidad': {
+        'patterns': ['alta especialidad', 'altaespecialidad', 'alta_especialidad'],
+        'area': 'gmm'
+    },
+    'línea azul vip': {
+        'patterns': ['linea azul vip', 'línea azul vip', 'lineaazulvip', 'vip'],
+        'area': 'gmm'
+    },
+    'línea azul': {
+        'patterns': ['linea azul', 'línea azul', 'lineaazul'],
+        'area': 'gmm'
+    },
+    'vip internacional': {
+        'patterns': ['vip internacional', 'vipinternacional'],
+        'area': 'gmm'
+    },
+    'enlace internacional': {
+        'patterns': ['enlace internacional', 'enlaceinternacional'],
+        'area': 'gmm'
+    },
+    'vínculo mundial': {
+        'patterns': ['vinculo mundial', 'vínculo mundial', 'vinculomundial'],
+        'area': 'gmm'
+    },
+    'personaliza': {
+        'patterns': ['personaliza'],
+        'area': 'gmm'
+    },
+    'flexibles': {
+        'patterns': ['flexibles', 'flexible'],
+        'area': 'gmm'
+    },
+    'acceso': {
+        'patterns': ['acceso'],
+        'area': 'gmm'
+    },
+    'esencial': {
+        'patterns': ['esencial'],
+        'area': 'gmm'
+    },
+    'plenitud': {
+        'patterns': ['plenitud'],
+        'area': 'gmm'
+    },
+    'platino': {
+        'patterns': ['platino'],
+        'area': 'gmm'
+    },
+    'gnp indemniza': {
+        'patterns': ['gnp indemniza', 'indemniza'],
+        'area': 'gmm'
+    },
+}
+
+# Patrones para detectar áreas en nombres de archivo y queries
+AREA_PATTERNS = {
+    'gmm': ['gmm', 'gastos medicos', 'gastos médicos', 'medico', 'médico', 'salud'],
+    'vida': ['vida', 'fallecimiento', 'sobrevivencia'],
+    'autos': ['autos', 'auto', 'vehiculo', 'vehículo', 'automovil', 'automóvil'],
+    'daños': ['daños', 'danos', 'hogar', 'empresarial', 'incendio', 'terremoto']
+}
+
+# Categorías de los documentos sintéticos (synthetic_<producto>_<categoría>.txt)
+CATEGORY_PATTERNS = {
+    'periodos_espera': ['periodo de espera', 'periodos de espera', 'tiempo de espera', 'tiempos de espera'],
+    'deducibles': ['deducible', 'deducibles'],
+    'coaseguros': ['coaseguro', 'coaseguros'],
+    'coberturas': ['cobertura', 'coberturas', 'cubre', 'ampara'],
+    'exclusiones': ['exclusion', 'exclusiones', 'no cubre', 'excluye'],
+    'requisitos': ['requisito', 'requisitos', 'documentos necesarios'],
+    'sumas_aseguradas': ['suma asegurada', 'sumas aseguradas'],
+    'indemnizaciones': ['indemnizacion', 'indemnizaciones'],
+}
+
+def normalize_text(text: str) -> str:
+    """Normaliza texto para comparación"""
+    text = text.lower()
+    # Remover acentos
+    text = text.replace('á', 'a').replace('é', 'e').replace('í', 'i')
+    text = text.replace('ó', 'o').replace('ú', 'u').replace('ñ', 'n')
+    # Remover caracteres especiales
+    text = re.sub(r'[^a-z0-9\s]', '', text)
+    return text.strip()
@@ -0,0 +1,113 @@
+from app.services.product_catalog import (
+    PRODUCT_PATTERNS, AREA_PATTERNS, CATEGORY_PATTERNS, normalize_text
+)
+from app.core.logger import get_logger
+from typing import Dict, List, Optional
+import re
+
+logger = get_logger()
+
+# Productos cuyo nombre es una palabra común en español ("acceso a hospitales",
+# "plan flexible"). Solo se reconocen junto a un calificador explícito.
+AMBIGUOUS_PRODUCTS = {'acceso', 'esencial', 'flexibles', 'plenitud', 'personaliza'}
+PRODUCT_QUALIFIERS = r'(?:plan|producto|seguro|gmm|gnp)'
+
+# Etiqueta de update_vector_metadata.py para chunks sin un producto único
+UNTAGGED_PRODUCT = 'unknown'
+
+class QueryUnderstandingService:
+    """
+    Resolve product, area and category mentions in a user query against the
+    GNP catalog and translate them into Pinecone metadata filters.
+    """
+
+    def __init__(self):
+        # Patrones más largos primero para que "linea azul vip" gane a "vip"
+        product_terms = []
+        for product, config in PRODUCT_PATTERNS.items():
+            for pattern in config['patterns']:
+                product_terms.append((normalize_text(pattern), product))
+        product_terms.sort(key=lambda item: len(item[0]), reverse=True)
+
+        self._product_patterns = []
+        for term, product in product_terms:
+            if product in AMBIGUOUS_PRODUCTS:
+                regex = rf'\b{PRODUCT_QUALIFIERS}\s+{re.escape(term)}\b|\b{re.escape(term)}\s+gnp\b'
+            else:
+                regex = rf'\b{re.escape(term)}\b'
+            self._product_patterns.append((re.compile(regex), product))
+
+        self._area_patterns = [
+            (re.compile(rf'\b{re.escape(normalize_text(p))}\b'), area)
+            for area, patterns in AREA_PATTERNS.items()
+            for p in patterns
+        ]
+        self._category_patterns = [
+            (re.compile(rf'\b{re.escape(normalize_text(p))}\b'), category)
+            for category, patterns in CATEGORY_PATTERNS.items()
+            for p in patterns
+        ]
+
+    def analyze(self, query: str) -> Dict[str, List[str]]:
+        """Detect products, areas and categories mentioned in the query"""
+        text = normalize_text(query)
+
+        products = []
+        for regex, product in self._product_patterns:
+            if product in products:
+                continue
+            if regex.search(text):
+                products.append(product)
+                # Consumir la mención para que "vip" no vuelva a coincidir dentro de "linea azul vip"
+                text = regex.sub(' ', text)
+
+        areas = [PRODUCT_PATTERNS[p]['area'] for p in products]
+        for regex, area in self._area_patterns:
+            if area not in areas and regex.search(text):
+                areas.append(area)
+        areas = list(dict.fromkeys(areas))
+
+        categories = []
+        for regex, category in self._category_patterns:
+            if category not in categories and regex.search(text):
+                categories.append(category)
+
+        return {'products': products, 'areas': areas, 'categories': categories}
+
+    def build_filter(self, understanding: Dict[str, List[str]]) -> Optional[dict]:
+        """
+        Build a Pinecone metadata filter.
+
+        Products are the primary filter (matched with or without accents and
+        keeping untagged chunks, like the lexical search); areas are only used
+        when no product was detected. Categories only exist on synthetic docs, so they narrow
+        synthetic chunks without excluding manual chunks.
+        """
+        products = understanding.get('products', [])
+        areas = understanding.get('areas', [])
+        categories = understanding.get('categories', [])
+
+        clauses = []
+        if products:
+            # Etiquetas con y sin acentos (los sintéticos se subieron como "versatil") y los
+            # chunks multiproducto marcados 'unknown' (guía de productos, cédula Conexión)
+            tags = list(dict.fromkeys(tag for p in products for tag in (p, normalize_text(p))))
+            clauses.append({'product': {'$in': tags + [UNTAGGED_PRODUCT]}})
+        elif areas:
+            # Los sintéticos (todos GMM) no siempre tienen 'area'
+            area_clause = {'area': {'$in': areas}}
+            if 'gmm' in areas:
+                area_clause = {'$or': [area_clause, {'doc_type': {'$eq': 'synthetic'}}]}
+            clauses.append(area_clause)
+        else:
+            return None
+
+        if categories:
+            clauses.append({'$or': [
+                {'category': {'$in': categories}},
+                {'doc_type': {'$ne': 'synthetic'}}
+            ]})
+
+        return clauses[0] if len(clauses) == 1 else {'$and': clauses}
+
+query_understanding = QueryUnderstandingService()
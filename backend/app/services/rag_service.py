@@ -1,107 +1,119 @@
-from app.services.embedding_service import embedding_service
+from app.services.embedding_cache import cached_embedding_service
 from app.services.pinecone_service import pinecone_service
 from app.services.llm_service import llm_service
-from app.core.redis_client import get_redis
+from app.services.semantic_cache import semantic_cache
+from app.services.query_understanding import query_understanding
+from app.services.lexical_index import lexical_index
+from app.services.result_fusion import fuse
+from app.services.mmr import mmr_select
+from app.services.context_builder import context_builder
+from app.services.near_duplicates import near_duplicate_filter
+from app.services.context_compressor import context_compressor
+from app.services.response_templates import response_templates
+from app.services.precomputed_answers import precomputed_answers
+from app.services.intent_router import intent_router
+from app.services.cache_namespace import cache_namespace, INDEX_VERSION_KEY
+from app.services.expansion_vectors import expansion_vectors, EXPANSION_PLANS, render_expansion
+from app.services.retrieval_profiles import cache_variant, RETRIEVAL_PROFILES
+from app.services.retrieval_config import retrieval_config
+from app.core.redis_client import get_redis, get_redis_binary
+from app.core.cache_codec import cache_codec
 from app.core.logger import get_logger
-from app.core.exceptions import RAGException, LLMException, CacheException, handle_service_error
-from typing import List, Dict, Tuple
-import json
+from app.core.singleflight import SingleFlight
+from app.core.metrics import metrics
+from app.core.config import settings
+from app.core.exceptions import ChatbotException, RAGException, handle_service_error
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Iterator, List, Dict, Optional, Tuple
 import hashlib
+import re
 import time
 
 logger = get_logger()
 
+NO_RESULTS_RESPONSE = (
+    "Lo siento, no encontré información relevante sobre esa pregunta en los manuales de GNP. "
+    "¿Podrías reformular tu pregunta o ser más específico?"
+)
+
+# Palabras por evento al reproducir una respuesta ya hecha como stream
+REPLAY_WORDS_PER_EVENT = 8
+
 class RAGService:
     def __init__(self):
-        self.embedding_service = embedding_service
+        self.embedding_service = cached_embedding_service  # LRU + Redis delante de OpenAI
         self.pinecone_service = pinecone_service
         self.llm_service = llm_service
+        self.semantic_cache = semantic_cache
+        self.query_understanding = query_understanding
+        self.lexical_index = lexical_index
+        self.context_builder = context_builder
+        self.near_duplicate_filter = near_duplicate_filter
+        self.context_compressor = context_compressor
+        self.response_templates = response_templates
+        self.precomputed_answers = precomputed_answers
+        self.intent_router = intent_router
+        self.cache_namespace = cache_namespace
+        self.expansion_vectors = expansion_vectors
+        self.retrieval_config = retrieval_config
         self.redis = get_redis()
-        self.cache_ttl = 86400  # 24 horas (queries similares son comunes)
-    
-    def _is_greeting(self, message: str) -> bool:
-        """Detect if message is a greeting"""
-        greetings = [
-            'hola', 'buenos días', 'buenas tardes', 'buenas noches',
-            'qué tal', 'saludos', 'hey', 'hi', 'hello', 'buen día'
-        ]
-        msg_lower = message.lower().strip()
-        return any(greeting in msg_lower for greeting in greetings)
-    
-    def _is_portal_question(self, message: str) -> bool:
-        """Detect if message is about portals"""
-        portal_keywords = [
-            'portal', 'portales', 'intermediario', 'intermediarios',
-            'portal de ideas', 'portal idea', 'plataforma',
-            'donde cotizar', 'dónde cotizar', 'donde cotizo'
-        ]
-        msg_lower = message.lower().strip()
-        return any(keyword in msg_lower for keyword in portal_keywords)
-    
-    def _needs_comprehensive_search(self, message: str) -> bool:
-        """Detect if message needs comprehensive information (all details)"""
-        msg_lower = message.lower().strip()
-        
-        # Palabras que indican que se pregunta sobre características específicas
-        specific_feature_keywords = [
-            # Periodos y tiempos
-            'periodos de espera', 'periodo de espera', 'períodos de espera', 'período de espera',
-            'tiempo de espera', 'tiempos de espera', 'cuánto tiempo',
-            # Costos y pagos
-            'deducible', 'deducibles', 'coaseguro', 'coaseguros', 'copago', 'copagos',
-            'precio', 'precios', 'costo', 'costos', 'prima', 'primas', 'tarifa', 'tarifas',
-            # Coberturas y beneficios
-            'cobertura', 'coberturas', 'beneficio', 'beneficios', 'servicio', 'servicios',
-            'incluye', 'cubre', 'protege', 'ampara',
-            # Exclusiones y limitaciones
-            'exclusiones', 'exclusión', 'limitaciones', 'limitación', 'restricciones', 'restricción',
-            'no cubre', 'no incluye', 'excepto', 'salvo',
-            # Requisitos y documentación
-            'requisitos', 'requisito', 'documentos', 'documento', 'papeles', 'trámites', 'trámite',
-            # Listas completas
-            'lista completa', 'todos los', 'todas las', 'todo lo que', 'cuáles son todos',
-            'lista de', 'listado de', 'relación de',
-            # Condiciones
-            'condiciones', 'condición', 'cláusula', 'cláusulas', 'términos',
-            # Sumas aseguradas y límites
-            'suma asegurada', 'sumas aseguradas', 'límite', 'límites', 'tope', 'topes',
-            'monto', 'montos', 'máximo', 'máximos', 'mínimo', 'mínimos'
-        ]
-        
-        # Detectar si menciona un producto específico + alguna característica
-        productos = [
-            'versátil', 'versatil', 'premium', 'platino', 'conexión gnp',
-            'gmm', 'gastos médicos', 'vida', 'auto', 'autos', 'daños',
-            'hogar', 'mascota', 'negocio protegido', 'cyber safe'
-        ]
-        
-        has_product = any(prod in msg_lower for prod in productos)
-        has_feature = any(keyword in msg_lower for keyword in specific_feature_keywords)
-        
-        # Si pregunta sobre un producto Y una característica específica, necesita búsqueda comprehensiva
-        return has_product and has_feature
+        self.redis_binary = get_redis_binary()  # Caché de respuestas (codec binario)
+        self.cache_codec = cache_codec
+        self.cache_ttl = settings.RESPONSE_CACHE_HARD_TTL  # Queries similares son comunes
+        self.cache_soft_ttl = settings.RESPONSE_CACHE_SOFT_TTL
+        self.singleflight = SingleFlight(
+            self.redis,
+            lock_ttl=settings.SINGLEFLIGHT_LOCK_TTL,
+            wait_timeout=settings.SINGLEFLIGHT_WAIT_TIMEOUT,
+            prefix="rag:inflight"
+        )
+        # Pool compartido por todas las requests (chat, SSE, refrescos, warmers):
+        # se dimensiona para requests concurrentes, no para expansiones por request
+        self.search_executor = ThreadPoolExecutor(
+            max_workers=settings.RAG_SEARCH_WORKERS,
+            thread_name_prefix="rag-search"
+        )
+        # Refrescos de entradas vencidas (stale-while-revalidate)
+        self.refresh_executor = ThreadPoolExecutor(
+            max_workers=settings.RESPONSE_CACHE_MAX_REFRESHES,
+            thread_name_prefix="rag-refresh"
+        )
+        self._refreshing = set()
+        self._refreshing_lock = Lock()
     
     def query(
         self,
         user_query: str,
         conversation_history: List[Dict] = None,
-        top_k: int = 25  # Más resultados para mejor cobertura
+        top_k: Optional[int] = None,
+        profile: Optional[str] = None,
+        conversation_id: Optional[str] = None
     ) -> Tuple[str, List[Dict], int]:
         """
         Optimized RAG query with aggressive caching
+        
+        profile picks a retrieval profile ('fast' | 'balanced' | 'thorough');
+        by default it follows the intent. top_k overrides its chunks per query.
+        conversation_id assigns the request to the running A/B experiment.
         """
         start_time = time.time()
+        assignment = None
+        # Resultado de la petición para las métricas del experimento
+        outcome = {'cache': None, 'fallback': False, 'error': False, 'llm_calls': 0, 'prompt_tokens': 0}
         
         try:
-            # Validate input
-            if not user_query or not user_query.strip():
-                raise RAGException(
-                    message="La consulta no puede estar vacía",
-                    details={"type": "validation_error"}
-                )
+            # Validar y clasificar la intención una sola vez por request
+            intent = self._route(user_query, profile)
+            
+            # Respuesta fija desde plantilla (configurable por intención): sin llamada al LLM
+            template = self.response_templates.get(intent['name'])
+            if template is not None:
+                logger.info(f"Intent '{intent['name']}' detected, responding from template")
+                return (template, [], 0)
             
             # Detectar saludos y responder directamente
-            if self._is_greeting(user_query):
+            if intent['name'] == 'greeting':
                 logger.info("Greeting detected, responding directly")
                 try:
                     response, tokens_used = self.llm_service.generate_response(
@@ -115,220 +127,836 @@ class RAGService:
                     raise handle_service_error("GPT-4o API", e)
             
             # Detectar preguntas sobre portales y responder con contexto del system prompt
-            if self._is_portal_question(user_query):
+            if intent['name'] == 'portal':
+                # La respuesta sale solo del system prompt: se precalcula y se reutiliza.
+                # Solo preguntas sin historial: un seguimiento ("¿y el otro portal?") depende del contexto
+                if not conversation_history:
+                    answer = self.precomputed_answers.get('portal', user_query)
+                    if answer is not None:
+                        logger.info("Portal question detected, serving precomputed answer")
+                        return (answer, [], 0)
+                
                 logger.info("Portal question detected, using system prompt context")
                 try:
-                    # El system prompt ya tiene información sobre portales
-                    response, tokens_used = self.llm_service.generate_response(
-                        user_message=user_query,
-                        context="",  # El contexto de portales está en el system prompt
-                        conversation_history=conversation_history
-                    )
+                    if conversation_history:
+                        response, tokens_used = self.llm_service.generate_response(
+                            user_message=user_query,
+                            context="",
+                            conversation_history=conversation_history
+                        )
+                    else:
+                        response, tokens_used = self.precomputed_answers.generate('portal', user_query)
                     return (response, [], tokens_used)
                 except Exception as e:
                     logger.error(f"LLM error on portal question: {str(e)}")
                     raise handle_service_error("GPT-4o API", e)
             
+            # Parámetros de búsqueda vigentes (config en caliente + variante del experimento)
+            assignment = self.retrieval_config.assign(conversation_id)
+            retrieval = self.retrieval_config.resolve(profile, intent, top_k, assignment)
+            
             # Check cache FIRST (fastest path)
-            cache_key = self._generate_cache_key(user_query)
-            cached_response = self._get_from_cache(cache_key)
+            cache_key = self._generate_cache_key(user_query, cache_variant(retrieval, intent))
+            cached_response = self._get_cached_result(user_query, cache_key, start_time, intent, retrieval, outcome)
             if cached_response:
-                elapsed = (time.time() - start_time) * 1000
-                logger.info(f"⚡ Cache HIT - Response in {elapsed:.0f}ms")
                 return cached_response
             
-            logger.info(f"Processing query: {user_query[:100]}...")
-            
-            # Query expansion para mejor recall
-            search_queries = self._expand_query(user_query)
-            logger.info(f"Expanded to {len(search_queries)} queries")
-            
-            # Búsqueda con manejo de errores
-            all_chunks = []
-            seen_ids = set()
-            
-            # Detectar si necesita búsqueda comprehensiva (más chunks)
-            # Para periodos de espera, usar MUCHOS más chunks porque está fragmentado
-            if 'periodo' in user_query.lower() and 'espera' in user_query.lower():
-                chunks_per_query = 60  # MÁXIMO para periodos de espera
-                max_final_chunks = 80
-                similarity_threshold = 0.25  # Muy bajo para capturar todo
-                logger.info("Waiting periods question - using MAXIMUM chunks (threshold: 0.25)")
-            elif self._needs_comprehensive_search(user_query):
-                chunks_per_query = 30
-                max_final_chunks = 35
-                similarity_threshold = 0.35
-                logger.info(f"Comprehensive search detected - using more chunks (threshold: {similarity_threshold})")
-            else:
-                chunks_per_query = 15
-                max_final_chunks = 20
-                similarity_threshold = 0.45
-            
-            try:
-                for sq in search_queries:
-                    # Generate embedding
-                    try:
-                        query_embedding = self.embedding_service.generate_embedding(sq)
-                    except Exception as e:
-                        logger.error(f"Embedding error: {str(e)}")
-                        raise handle_service_error("OpenAI Embeddings", e)
-                    
-                    # Query Pinecone
-                    try:
-                        results = self.pinecone_service.query_vectors(
-                            query_vector=query_embedding,
-                            top_k=chunks_per_query  # Dinámico según tipo de pregunta
-                        )
-                    except Exception as e:
-                        logger.error(f"Pinecone query error: {str(e)}")
-                        raise handle_service_error("Pinecone", e)
-                    
-                    for match in results.matches:
-                        if match.id not in seen_ids and match.score > similarity_threshold:
-                            seen_ids.add(match.id)
-                            all_chunks.append({
-                                'id': match.id,
-                                'text': match.metadata.get('text', ''),
-                                'score': match.score,
-                                'source': match.metadata.get('source', 'Manual GNP'),
-                                'doc_type': match.metadata.get('doc_type', 'pdf')
-                            })
+            # Coalescer queries idénticas en vuelo (en proceso y entre workers)
+            outcome['cache'] = 'singleflight'  # _answer_query lo limpia si esta petición calcula la respuesta
+            return self.singleflight.do(
+                cache_key,
+                lambda: self._answer_query(
+                    user_query, conversation_history, cache_key, start_time, intent, retrieval, outcome=outcome
+                ),
+                lambda: self._get_from_cache(cache_key) or self._get_negative(cache_key)
+            )
             
-            except RAGException:
-                raise  # Re-raise our custom exceptions
-            except Exception as e:
-                logger.error(f"Search error: {str(e)}")
-                raise RAGException(
-                    message="Error al buscar en la base de conocimiento",
-                    details={"error": str(e)}
-                )
+        except ChatbotException:
+            # Re-raise custom exceptions (incluye 429 / 503 de handle_service_error)
+            outcome['error'] = True
+            raise
+        except Exception as e:
+            outcome['error'] = True
+            logger.error(f"Unexpected error in RAG query: {str(e)}")
+            raise RAGException(
+                message="Ocurrió un error al procesar tu consulta",
+                details={"error": str(e)}
+            )
+        finally:
+            if assignment:
+                self.retrieval_config.record(assignment, (time.time() - start_time) * 1000, outcome)
+    
+    def query_stream(
+        self,
+        user_query: str,
+        conversation_history: List[Dict] = None,
+        profile: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Streaming variant of query: yields (event, data) pairs.
+        
+        'sources' comes first, then 'token' events with text deltas as the
+        LLM produces them, then 'metadata' (tokens_used, cached, profile).
+        Greetings, portal answers and cache hits are replayed as a fast
+        stream of the stored text, so clients handle a single protocol.
+        The generated answer is cached once the stream completes.
+        """
+        start_time = time.time()
+        assignment = None
+        outcome = {'cache': None, 'fallback': False, 'error': False, 'llm_calls': 0, 'prompt_tokens': 0}
+        
+        try:
+            intent = self._route(user_query, profile)
             
-            # Priorizar documentos sintéticos (tienen info consolidada)
-            all_chunks.sort(key=lambda x: (
-                1 if 'synthetic' in x['doc_type'] else 0,  # Sintéticos primero
-                x['score']  # Luego por score
-            ), reverse=True)
+            # Plantillas y respuestas precalculadas: mismo camino que query()
+            if intent['name'] in ('greeting', 'portal') or self.response_templates.has(intent['name']):
+                result = self.query(user_query, conversation_history, profile=profile)
+                yield from self._replay(result, {'cached': result[2] == 0, 'profile': None})
+                return
             
-            # Tomar top chunks (dinámico según tipo de pregunta)
-            top_chunks = all_chunks[:max_final_chunks]
+            assignment = self.retrieval_config.assign(conversation_id)
+            retrieval = self.retrieval_config.resolve(profile, intent, None, assignment)
+            metadata = {'profile': retrieval['name']}
             
-            if not top_chunks:
-                logger.warning("No relevant chunks found")
-                return (
-                    "Lo siento, no encontré información relevante sobre esa pregunta en los manuales de GNP. "
-                    "¿Podrías reformular tu pregunta o ser más específico?",
-                    [],
-                    0
-                )
+            cache_key = self._generate_cache_key(user_query, cache_variant(retrieval, intent))
+            cached_response = self._get_cached_result(user_query, cache_key, start_time, intent, retrieval, outcome)
+            if cached_response:
+                yield from self._replay(cached_response, dict(metadata, cached=True))
+                return
             
-            # Construir contexto
-            context_text = "\n\n---\n\n".join([c['text'] for c in top_chunks])
+            # Sin singleflight: esta petición genera su propia respuesta mientras la transmite
+            prepared = self._prepare_answer(
+                user_query, conversation_history, cache_key, start_time, intent, retrieval, False, outcome
+            )
+            if 'result' in prepared:
+                yield from self._replay(prepared['result'], dict(metadata, cached=outcome['cache'] is not None))
+                return
             
-            logger.info(f"Found {len(top_chunks)} chunks (best: {top_chunks[0]['score']:.3f})")
-            logger.info(f"Context size: {len(context_text)} chars")
+            yield ('sources', {'sources': prepared['sources']})
             
-            # Generar respuesta con manejo de errores
+            usage = {}
+            parts = []
             try:
-                response, tokens_used = self.llm_service.generate_response(
+                for delta in self.llm_service.stream_response(
                     user_message=user_query,
-                    context=context_text,
-                    conversation_history=conversation_history
-                )
+                    context=prepared['context'],
+                    conversation_history=conversation_history,
+                    max_tokens=retrieval['max_tokens'],
+                    usage=usage
+                ):
+                    parts.append(delta)
+                    yield ('token', {'text': delta})
             except Exception as e:
-                logger.error(f"LLM error: {str(e)}")
-                raise handle_service_error("Claude API", e)
+                logger.error(f"LLM streaming error: {str(e)}")
+                raise handle_service_error("GPT-4o API", e)
             
-            # Preparar sources
-            sources = [{
-                'source': c['source'],
-                'score': round(c['score'], 3),
-                'text_preview': c['text'][:200] + '...' if len(c['text']) > 200 else c['text']
-            } for c in top_chunks[:10]]  # Top 10 sources
-            
-            # Cache agresivo
-            result = (response, sources, tokens_used)
-            self._save_to_cache(cache_key, result)
+            outcome['llm_calls'] = 1
+            outcome['prompt_tokens'] = usage.get('prompt_tokens', 0)
+            result = ("".join(parts), prepared['sources'], usage.get('total_tokens', 0))
+            self._store_answer(cache_key, result, prepared)
             
             elapsed = (time.time() - start_time) * 1000
-            logger.info(f"⚡ Total time: {elapsed:.0f}ms")
-            
-            return result
+            logger.info(f"⚡ Streamed in {elapsed:.0f}ms")
+            yield ('metadata', dict(metadata, cached=False, tokens_used=result[2]))
             
-        except (RAGException, LLMException):
-            # Re-raise custom exceptions
+        except ChatbotException:
+            outcome['error'] = True
             raise
         except Exception as e:
-            logger.error(f"Unexpected error in RAG query: {str(e)}")
+            outcome['error'] = True
+            logger.error(f"Unexpected error in RAG stream: {str(e)}")
             raise RAGException(
                 message="Ocurrió un error al procesar tu consulta",
                 details={"error": str(e)}
             )
+        finally:
+            if assignment:
+                self.retrieval_config.record(assignment, (time.time() - start_time) * 1000, outcome)
     
-    def _expand_query(self, query: str) -> List[str]:
-        """Smart query expansion"""
-        query_lower = query.lower()
-        expansions = [query]
+    def _replay(self, result, metadata: Dict) -> Iterator[Tuple[str, Dict]]:
+        """Emit a finished (response, sources, tokens_used) with the streaming protocol"""
+        response, sources, tokens_used = result
+        yield ('sources', {'sources': sources})
+        words = re.findall(r'\s*\S+|\s+$', response)
+        for i in range(0, len(words), REPLAY_WORDS_PER_EVENT):
+            yield ('token', {'text': "".join(words[i:i + REPLAY_WORDS_PER_EVENT])})
+        yield ('metadata', dict(metadata, tokens_used=tokens_used))
+    
+    def _route(self, user_query: str, profile: Optional[str]) -> Dict:
+        """Validate the request and classify its intent"""
+        if not user_query or not user_query.strip():
+            raise RAGException(
+                message="La consulta no puede estar vacía",
+                details={"type": "validation_error"}
+            )
+        if profile is not None and profile not in RETRIEVAL_PROFILES:
+            raise RAGException(
+                message=f"Perfil de búsqueda desconocido: {profile}",
+                details={"type": "validation_error", "profiles": list(RETRIEVAL_PROFILES)}
+            )
+        return self.intent_router.route(user_query)
+    
+    def _get_cached_result(
+        self,
+        user_query: str,
+        cache_key: str,
+        start_time: float,
+        intent: Dict,
+        retrieval: Dict,
+        outcome: Dict
+    ) -> Optional[list]:
+        """Response cache (refreshing stale entries in the background), then the negative cache"""
+        cached_response, is_stale = self._get_cache_entry(cache_key)
+        if cached_response:
+            elapsed = (time.time() - start_time) * 1000
+            if is_stale:
+                # Servir la respuesta vencida ya y regenerarla en segundo plano
+                metrics.incr("cache.stale_served")
+                self._schedule_refresh(user_query, cache_key, intent, retrieval)
+                logger.info(f"⚡ Cache HIT (stale, refreshing) - Response in {elapsed:.0f}ms")
+            else:
+                logger.info(f"⚡ Cache HIT - Response in {elapsed:.0f}ms")
+            outcome['cache'] = 'response'
+            return cached_response
         
-        # Detectar tipo de pregunta
-        if any(word in query_lower for word in ['todos', 'lista', 'cuáles', 'qué productos']):
-            # Pregunta de listado
-            expansions.extend([
-                "catálogo productos GNP seguros",
-                "lista completa seguros GNP",
-                f"{query} completo"
-            ])
+        # Caché negativo: la misma pregunta ya no encontró chunks con este estado del índice
+        negative_response = self._get_negative(cache_key)
+        if negative_response:
+            logger.info(f"⚡ Negative cache HIT - Response in {(time.time() - start_time) * 1000:.0f}ms")
+            outcome.update(cache='negative', fallback=True)
+            return negative_response
         
-        elif 'internacional' in query_lower:
-            expansions.extend([
-                "planes internacionales GMM",
-                "cobertura internacional GNP",
-                "Enlace Vínculo Mundial"
-            ])
+        return None
+    
+    def _answer_query(
+        self,
+        user_query: str,
+        conversation_history: List[Dict],
+        cache_key: str,
+        start_time: float,
+        intent: Dict,
+        retrieval: Dict,
+        refresh: bool = False,
+        outcome: Optional[Dict] = None
+    ) -> Tuple[str, List[Dict], int]:
+        """
+        Retrieval + generation for a query that missed the response cache,
+        with the parameters of the resolved retrieval profile.
+        
+        With refresh=True (background regeneration of a stale entry) the
+        semantic cache is not consulted, since it would return the stale entry.
+        outcome, when given, receives cache / fallback / token details.
+        """
+        outcome = outcome if outcome is not None else {}
+        prepared = self._prepare_answer(
+            user_query, conversation_history, cache_key, start_time, intent, retrieval, refresh, outcome
+        )
+        if 'result' in prepared:
+            return prepared['result']
+        
+        # Generar respuesta con manejo de errores
+        try:
+            response, usage = self.llm_service.generate_response_with_usage(
+                user_message=user_query,
+                context=prepared['context'],
+                conversation_history=conversation_history,
+                max_tokens=retrieval['max_tokens']
+            )
+            tokens_used = usage['total_tokens']
+            outcome['llm_calls'] = 1
+            outcome['prompt_tokens'] = usage['prompt_tokens']
+        except Exception as e:
+            logger.error(f"LLM error: {str(e)}")
+            raise handle_service_error("Claude API", e)
+        
+        # Cache agresivo
+        result = (response, prepared['sources'], tokens_used)
+        self._store_answer(cache_key, result, prepared)
+        
+        elapsed = (time.time() - start_time) * 1000
+        logger.info(f"⚡ Total time: {elapsed:.0f}ms")
+        
+        return result
+    
+    def _prepare_answer(
+        self,
+        user_query: str,
+        conversation_history: List[Dict],
+        cache_key: str,
+        start_time: float,
+        intent: Dict,
+        retrieval: Dict,
+        refresh: bool,
+        outcome: Dict
+    ) -> Dict:
+        """
+        Retrieval and context building, everything before the LLM call.
+        
+        Returns {'result': ...} when no generation is needed (semantic cache
+        hit or no relevant chunks), otherwise the context, sources and the
+        data _store_answer needs.
+        """
+        outcome['cache'] = None
+        logger.info(f"Processing query: {user_query[:100]}...")
+        
+        # Query expansion para mejor recall
+        search_queries = self._expand_query(user_query, intent, retrieval['max_queries'])
+        logger.info(f"Expanded to {len(search_queries)} queries")
+        
+        # Parámetros del perfil (periodos de espera: muchos más chunks porque está fragmentado)
+        chunks_per_query = retrieval['chunks_per_query']
+        max_final_chunks = retrieval['max_final_chunks']
+        similarity_threshold = retrieval['similarity_threshold']
+        logger.info(
+            f"Retrieval profile '{retrieval['name']}' ({intent['name']}): {chunks_per_query} chunks/query, "
+            f"max {max_final_chunks}, threshold {similarity_threshold}"
+        )
+        
+        try:
+            # Un solo request de embeddings para la query original y sus expansiones
+            query_embeddings = self._embed_queries(search_queries)
+        except ChatbotException:
+            raise  # Incluye 429 / 503 de handle_service_error
+        except Exception as e:
+            logger.error(f"Search error: {str(e)}")
+            raise RAGException(
+                message="Error al buscar en la base de conocimiento",
+                details={"error": str(e)}
+            )
+        
+        # Productos / áreas / categorías mencionados -> filtros de Pinecone
+        understanding = self.query_understanding.analyze(user_query)
+        metadata_filter = self.query_understanding.build_filter(understanding)
+        semantic_tag = "|".join(sorted(understanding['products']))
+        variant = cache_variant(retrieval, intent)
+        if variant:
+            semantic_tag += f"#{variant}"  # Otro perfil, otra calidad de respuesta
+        
+        # Caché semántico: una query equivalente (sobre los mismos productos) ya respondida
+        cached_response = None if refresh else self._get_from_semantic_cache(query_embeddings[0], semantic_tag)
+        if cached_response:
+            elapsed = (time.time() - start_time) * 1000
+            logger.info(f"⚡ Semantic cache HIT - Response in {elapsed:.0f}ms")
+            outcome['cache'] = 'semantic'
+            return {'result': cached_response}
+        
+        # Búsqueda con manejo de errores; un solo plazo para todas las etapas
+        deadline = time.time() + settings.RAG_SEARCH_TIMEOUT
+        try:
+            probe_top_k = None
+            if settings.RAG_ADAPTIVE_ENABLED and retrieval['adaptive']:
+                # Todas las búsquedas salen juntas; si los primeros chunks de la query
+                # original ya son confiables no se esperan las expansiones
+                probe_top_k = min(settings.RAG_ADAPTIVE_INITIAL_TOP_K, chunks_per_query)
+            
+            ranked_lists, early_stop = self._search_ranked(
+                search_queries, query_embeddings, chunks_per_query,
+                similarity_threshold, metadata_filter, understanding, deadline, probe_top_k
+            )
+            
+            if early_stop:
+                logger.info(
+                    f"Adaptive retrieval: confident chunks in the top {probe_top_k}, "
+                    f"skipping {len(search_queries) - 1} expansions"
+                )
+                metrics.incr("retrieval.early_stop")
+                max_final_chunks = min(max_final_chunks, probe_top_k)
+            elif probe_top_k:
+                logger.info(f"Adaptive retrieval: weak scores, using all {len(search_queries)} queries at top_k {chunks_per_query}")
+                metrics.incr("retrieval.widened")
+        
+        except ChatbotException:
+            raise  # Re-raise our custom exceptions (incluye 429 / 503)
+        except Exception as e:
+            logger.error(f"Search error: {str(e)}")
+            raise RAGException(
+                message="Error al buscar en la base de conocimiento",
+                details={"error": str(e)}
+            )
+        
+        # Búsqueda léxica (BM25) para términos exactos: coaseguro, deducible, montos...
+        lexical_chunks = self._search_lexical(user_query, understanding['products'])
+        if lexical_chunks and any(ranked_lists):
+            ranked_lists.append(lexical_chunks)
+            # Con fusión híbrida el recall llega con menos chunks en el prompt (tope del perfil)
+            max_final_chunks = min(max_final_chunks, retrieval['hybrid_max_final_chunks'])
+        
+        # Consenso entre expansiones (RRF por defecto)
+        all_chunks = fuse(ranked_lists)
+        
+        # Priorizar documentos sintéticos (tienen info consolidada)
+        all_chunks.sort(key=lambda x: (
+            1 if 'synthetic' in x['doc_type'] else 0,  # Sintéticos primero
+            x['fusion_score']  # Luego por score de fusión
+        ), reverse=True)
+        
+        # Colapsar casi-duplicados (mismo manual en varias carpetas, ventanas solapadas)
+        all_chunks, dedup_stats = self.near_duplicate_filter.filter(all_chunks)
+        if dedup_stats['removed']:
+            logger.info(
+                f"Near-duplicates removed: {dedup_stats['removed']} chunks "
+                f"(~{dedup_stats['tokens_removed']} tokens)"
+            )
+        
+        # Tomar top chunks (dinámico según tipo de pregunta)
+        if settings.MMR_ENABLED and len(all_chunks) > 1:
+            # Subconjunto diverso bajo presupuesto de tokens (evita fragmentos casi idénticos)
+            top_chunks = mmr_select(
+                all_chunks,
+                max_chunks=max_final_chunks,
+                token_budget=settings.MMR_TOKEN_BUDGET,
+                lambda_mult=settings.MMR_LAMBDA
+            )
+            logger.info(f"MMR selected {len(top_chunks)} of {len(all_chunks)} candidates")
+        else:
+            top_chunks = all_chunks[:max_final_chunks]
+        
+        if not top_chunks:
+            logger.warning("No relevant chunks found")
+            self._save_negative(cache_key)
+            outcome['fallback'] = True
+            return {'result': (NO_RESULTS_RESPONSE, [], 0)}
+        
+        logger.info(f"Found {len(top_chunks)} chunks (best: {top_chunks[0]['score']:.3f})")
+        
+        # Compresión extractiva opcional: solo las oraciones relevantes y sus vecinas
+        if settings.CONTEXT_COMPRESSION_ENABLED:
+            top_chunks, compression_stats = self.context_compressor.compress(top_chunks, user_query)
+            logger.info(
+                f"Context compression: {compression_stats['tokens_before']} -> "
+                f"{compression_stats['tokens_after']} tokens (ratio {compression_stats['ratio']:.2f}, "
+                f"{compression_stats['latency_ms']:.0f}ms)"
+            )
+        
+        # Construir contexto dentro del presupuesto de tokens
+        fixed_prompt = self.llm_service._build_system_prompt("", user_query) + user_query
+        budget = self.context_builder.available_budget(fixed_prompt, conversation_history)
+        context_text, top_chunks, context_stats = self.context_builder.build(top_chunks, budget)
+        
+        logger.info(
+            f"Context budget: {context_stats['tokens']}/{context_stats['budget']} tokens "
+            f"({context_stats['tokens'] / max(1, context_stats['budget']):.0%}), "
+            f"{context_stats['chunks_used']}/{context_stats['chunks_in']} chunks"
+            f"{', last one truncated' if context_stats['truncated'] else ''}"
+        )
         
-        elif any(word in query_lower for word in ['requisitos', 'cómo', 'proceso', 'pasos']):
-            # Pregunta de procedimiento
-            expansions.extend([
-                f"{query} procedimiento",
-                f"{query} documentos necesarios"
+        # Preparar sources (los hits solo léxicos no tienen similitud que mostrar)
+        sources = []
+        for c in top_chunks[:10]:  # Top 10 sources
+            source = {'source': c['source']}
+            if c['score'] > 0:
+                source['score'] = round(c['score'], 3)
+            source['text_preview'] = c['text'][:200] + '...' if len(c['text']) > 200 else c['text']
+            sources.append(source)
+        
+        return {
+            'context': context_text,
+            'sources': sources,
+            'query_embedding': query_embeddings[0],
+            'semantic_tag': semantic_tag
+        }
+    
+    def _store_answer(self, cache_key: str, result: Tuple[str, List[Dict], int], prepared: Dict):
+        """Save a generated answer in the response and semantic caches"""
+        self._save_to_cache(cache_key, result)
+        if settings.SEMANTIC_CACHE_ENABLED:
+            self.semantic_cache.add(prepared['query_embedding'], cache_key, prepared['semantic_tag'])
+    
+    def _embed_queries(self, search_queries: List[str]) -> List[list]:
+        """
+        Embed the query in a single request: static expansions come from the
+        precomputed registry, templated ones are composed from the query
+        vector, and any expansion without a precomputed vector joins the batch.
+        """
+        try:
+            query = search_queries[0]
+            embeddings = [None] + [self.expansion_vectors.static_vector(sq) for sq in search_queries[1:]]
+            directions = {
+                i: self.expansion_vectors.direction(sq, query)
+                for i, sq in enumerate(search_queries)
+                if i > 0 and embeddings[i] is None
+            }
+            
+            # La query original y las expansiones sin vector van en la misma llamada
+            batch_ids = [0] + [i for i, direction in directions.items() if direction is None]
+            if len(batch_ids) > 1:
+                metrics.incr("expansion_vectors.embedded", len(batch_ids) - 1)
+            batch = self.embedding_service.generate_embeddings_batch([search_queries[i] for i in batch_ids])
+            for i, embedding in zip(batch_ids, batch):
+                embeddings[i] = embedding
+            
+            for i, direction in directions.items():
+                if direction is not None:
+                    embeddings[i] = self.expansion_vectors.compose(embeddings[0], direction)
+            return embeddings
+        except Exception as e:
+            logger.error(f"Batch embedding error: {str(e)}")
+            raise handle_service_error("OpenAI Embeddings", e)
+    
+    def _search_expansion(
+        self,
+        search_query: str,
+        query_embedding: list,
+        top_k: int,
+        filter_dict: dict = None
+    ) -> Dict:
+        """Search a single expanded query, capturing errors and timings"""
+        outcome = {'query': search_query, 'results': None, 'error': None}
+        
+        search_start = time.time()
+        try:
+            outcome['results'] = self.pinecone_service.query_vectors(
+                query_vector=query_embedding,
+                top_k=top_k,  # Dinámico según tipo de pregunta
+                filter_dict=filter_dict,
+                include_values=settings.MMR_ENABLED  # MMR necesita los vectores candidatos
+            )
+        except Exception as e:
+            outcome['error'] = e
+        finally:
+            outcome['search_ms'] = (time.time() - search_start) * 1000
+        
+        return outcome
+    
+    def _search_parallel(
+        self,
+        search_queries: List[str],
+        query_embeddings: List[list],
+        top_k: int,
+        filter_dict: dict = None,
+        deadline: Optional[float] = None
+    ) -> list:
+        """
+        Run all expanded queries concurrently.
+        
+        deadline (epoch seconds) bounds the whole request, queueing included;
+        by default it is RAG_SEARCH_TIMEOUT from now. A failing or late
+        expansion is logged and skipped; the request only fails when every
+        expansion fails.
+        """
+        if deadline is None:
+            deadline = time.time() + settings.RAG_SEARCH_TIMEOUT
+        futures = self._submit_searches(search_queries, query_embeddings, top_k, filter_dict)
+        results_per_query, failures = self._await_searches(search_queries, futures, deadline)
+        
+        if not results_per_query and failures:
+            logger.error(f"All {len(failures)} expansions failed")
+            raise handle_service_error("Pinecone", failures[0]['error'])
+        
+        return results_per_query
+    
+    def _submit_searches(
+        self,
+        search_queries: List[str],
+        query_embeddings: List[list],
+        top_k: int,
+        filter_dict: dict = None
+    ) -> list:
+        return [
+            self.search_executor.submit(self._search_expansion, sq, embedding, top_k, filter_dict)
+            for sq, embedding in zip(search_queries, query_embeddings)
+        ]
+    
+    def _await_searches(self, search_queries: List[str], futures: list, deadline: float) -> Tuple[list, list]:
+        """Wait for the searches until the deadline: (results per query, failed outcomes)"""
+        wait_start = time.time()
+        done, _ = wait(futures, timeout=max(0.0, deadline - time.time()))
+        
+        results_per_query = []
+        failures = []
+        for sq, future in zip(search_queries, futures):
+            if future in done:
+                outcome = future.result()
+            else:
+                future.cancel()  # Si sigue en cola ya no se ejecuta
+                outcome = {
+                    'query': sq, 'results': None,
+                    'error': TimeoutError(f"search timeout: {settings.RAG_SEARCH_TIMEOUT}s deadline exceeded"),
+                    'search_ms': (time.time() - wait_start) * 1000
+                }
+            
+            if outcome['error'] is not None:
+                logger.warning(f"Expansion failed for '{sq[:60]}': {str(outcome['error'])}")
+                failures.append(outcome)
+                continue
+            
+            logger.info(
+                f"Expansion '{sq[:60]}': search {outcome['search_ms']:.0f}ms, "
+                f"{len(outcome['results'].matches)} matches"
+            )
+            results_per_query.append(outcome['results'])
+        
+        return results_per_query, failures
+    
+    def _search_stage(
+        self,
+        search_queries: List[str],
+        query_embeddings: List[list],
+        top_k: int,
+        similarity_threshold: float,
+        filter_dict: Optional[dict],
+        deadline: float,
+        probe_top_k: Optional[int]
+    ) -> Tuple[List[List[Dict]], bool]:
+        """
+        Search every query at once; with probe_top_k, return early when the
+        original query's top probe_top_k chunks are already confident.
+        """
+        futures = self._submit_searches(search_queries, query_embeddings, top_k, filter_dict)
+        results_per_query, failures = [], []
+        
+        if probe_top_k:
+            # La query original decide si hace falta esperar a las expansiones
+            results_per_query, failures = self._await_searches(search_queries[:1], futures[:1], deadline)
+            probe = [ranked[:probe_top_k] for ranked in self._collect_ranked_lists(results_per_query, similarity_threshold)]
+            if self._count_confident(probe) >= settings.RAG_ADAPTIVE_MIN_CONFIDENT:
+                for future in futures[1:]:
+                    future.cancel()
+                return probe, True
+            search_queries, futures = search_queries[1:], futures[1:]
+        
+        more_results, more_failures = self._await_searches(search_queries, futures, deadline)
+        results_per_query += more_results
+        failures += more_failures
+        
+        if not results_per_query and failures:
+            logger.error(f"All {len(failures)} expansions failed")
+            raise handle_service_error("Pinecone", failures[0]['error'])
+        
+        return self._collect_ranked_lists(results_per_query, similarity_threshold), False
+    
+    def _search_ranked(
+        self,
+        search_queries: List[str],
+        query_embeddings: List[list],
+        top_k: int,
+        similarity_threshold: float,
+        metadata_filter: Optional[dict],
+        understanding: Dict,
+        deadline: float,
+        probe_top_k: Optional[int] = None
+    ) -> Tuple[List[List[Dict]], bool]:
+        """
+        Filtered search when there is a filter, falling back to unfiltered when too sparse.
+        
+        Returns the ranked lists and whether the probe was confident enough
+        to skip the expansions (see _search_stage).
+        """
+        ranked_lists, early_stop = [], False
+        if metadata_filter:
+            # Con filtro el espacio de búsqueda es mucho menor: basta un top_k chico
+            filtered_top_k = min(top_k, settings.RAG_FILTERED_TOP_K)
+            logger.info(f"Filtered search {understanding} (top_k: {filtered_top_k})")
+            ranked_lists, early_stop = self._search_stage(
+                search_queries, query_embeddings, filtered_top_k,
+                similarity_threshold, metadata_filter, deadline, probe_top_k
+            )
+            
+            unique_ids = {c['id'] for ranked in ranked_lists for c in ranked}
+            if len(unique_ids) < settings.RAG_FILTER_MIN_RESULTS:
+                logger.info(f"Filtered search too sparse ({len(unique_ids)} chunks), falling back to unfiltered")
+                ranked_lists = []
+        
+        if not any(ranked_lists):
+            ranked_lists, early_stop = self._search_stage(
+                search_queries, query_embeddings, top_k,
+                similarity_threshold, None, deadline, probe_top_k
+            )
+        
+        return ranked_lists, early_stop
+    
+    def _count_confident(self, ranked_lists: List[List[Dict]]) -> int:
+        """Number of distinct chunks scoring at or above the high-confidence threshold"""
+        return len({
+            c['id'] for ranked in ranked_lists for c in ranked
+            if c['score'] >= settings.RAG_ADAPTIVE_CONFIDENT_SCORE
+        })
+    
+    def _collect_ranked_lists(self, results_per_query: list, similarity_threshold: float) -> List[List[Dict]]:
+        """Convert each expansion's matches above the threshold into a ranked chunk list"""
+        ranked_lists = []
+        for results in results_per_query:
+            ranked_lists.append([
+                {
+                    'id': match.id,
+                    'text': match.metadata.get('text', ''),
+                    'score': match.score,
+                    'source': match.metadata.get('source', 'Manual GNP'),
+                    'doc_type': match.metadata.get('doc_type', 'pdf'),
+                    'simhash': match.metadata.get('simhash'),
+                    'values': match.values or None
+                }
+                for match in results.matches
+                if match.score > similarity_threshold
             ])
+        return ranked_lists
+    
+    def _search_lexical(self, user_query: str, products: List[str]) -> List[Dict]:
+        """BM25 search over the local chunk index; errors only disable the lexical leg"""
+        if not settings.LEXICAL_INDEX_ENABLED:
+            return []
+        
+        search_start = time.time()
+        try:
+            hits = self.lexical_index.search(user_query, top_k=settings.LEXICAL_TOP_K, products=products)
+        except Exception as e:
+            logger.warning(f"Lexical search error: {str(e)}")
+            return []
+        
+        elapsed = (time.time() - search_start) * 1000
+        logger.info(f"Lexical search: {len(hits)} hits ({elapsed:.0f}ms)")
+        return [
+            {
+                'id': doc['id'],
+                'text': doc['text'],
+                'score': 0.0,  # Sin similitud densa; no se muestra en sources
+                'source': doc.get('source', 'Manual GNP'),
+                'doc_type': doc.get('doc_type', 'pdf'),
+                'simhash': doc.get('simhash'),
+                'lexical_score': bm25_score
+            }
+            for doc, bm25_score in hits
+        ]
+    
+    def _expand_query(self, query: str, intent: Dict = None, max_queries: int = 3) -> List[str]:
+        """Smart query expansion"""
+        expansion = (intent or self.intent_router.route(query))['expansion']
+        expansions = [query]
         
-        elif any(word in query_lower for word in ['qué es', 'define', 'significa']):
-            # Pregunta de definición
-            expansions.append(f"definición {query.replace('qué es', '').replace('?', '')}")
+        # Frases fijas o plantillas según el tipo de pregunta (listado, internacional, procedimiento, definición)
+        for step in EXPANSION_PLANS.get(expansion, []):
+            expansions.append(render_expansion(step, query))
         
-        return expansions[:3]  # Max 3 queries
+        return expansions[:max_queries]
     
-    def _generate_cache_key(self, query: str) -> str:
-        """Generate cache key"""
+    def _generate_cache_key(self, query: str, variant: Optional[str] = None) -> str:
+        """Generate cache key within the current knowledge-base namespace"""
         normalized = query.lower().strip()
         query_hash = hashlib.md5(normalized.encode()).hexdigest()
-        return f"rag:v7:{query_hash}"  # v7 con documentos sintéticos de todos los productos
+        if variant:
+            query_hash += f":{variant}"  # Perfil distinto al de la intención
+        return self.cache_namespace.key(query_hash)
+    
+    def _schedule_refresh(self, user_query: str, cache_key: str, intent: Dict, retrieval: Dict):
+        """Regenerate a stale entry in the background; one worker at a time per key"""
+        with self._refreshing_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        
+        try:
+            # El lock no se libera: su TTL también frena reintentos si el refresco falla
+            acquired = self.redis.set(
+                f"rag:refresh:{cache_key}", "1",
+                nx=True, ex=settings.RESPONSE_CACHE_REFRESH_LOCK_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Cache refresh lock error: {str(e)}")
+            acquired = False
+        
+        if not acquired:
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+            return
+        
+        self.refresh_executor.submit(self._refresh_entry, user_query, cache_key, intent, retrieval)
+    
+    def _refresh_entry(self, user_query: str, cache_key: str, intent: Dict, retrieval: Dict):
+        start_time = time.time()
+        try:
+            self._answer_query(user_query, None, cache_key, start_time, intent, retrieval, refresh=True)
+            metrics.incr("cache.refreshes")
+            logger.info(f"Cache entry refreshed in {(time.time() - start_time) * 1000:.0f}ms")
+        except Exception as e:
+            metrics.incr("cache.refresh_errors")
+            logger.warning(f"Cache refresh failed for '{user_query[:60]}': {str(e)}")
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
     
     def _get_from_cache(self, cache_key: str):
         """Get from cache with error handling"""
+        return self._get_cache_entry(cache_key)[0]
+    
+    def _get_cache_entry(self, cache_key: str) -> Tuple[Optional[list], bool]:
+        """Cached result and whether it is past its soft TTL"""
         try:
-            cached = self.redis.get(cache_key)
+            cached = self.redis_binary.get(cache_key)
             if cached:
-                return json.loads(cached)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Cache JSON decode error: {str(e)}")
+                entry = self.cache_codec.decode(cached)
+                if isinstance(entry, dict):
+                    return entry['result'], time.time() > entry['soft_expires_at']
+                return entry, False  # Formato anterior, sin TTL suave
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Cache decode error: {str(e)}")
             # Delete corrupted cache entry
             try:
-                self.redis.delete(cache_key)
+                self.redis_binary.delete(cache_key)
             except:
                 pass
         except Exception as e:
             logger.warning(f"Cache get error: {str(e)}")
             # Cache errors should not break the app
+        return None, False
+    
+    def _get_negative(self, cache_key: str):
+        """
+        Fallback response if this query recently found no chunks.
+        
+        Entries store the index version they were written under; a bump by
+        the ingestion scripts invalidates them on the next read.
+        """
+        try:
+            recorded, current = self.redis.mget([f"{cache_key}:neg", INDEX_VERSION_KEY])
+            if recorded is not None and recorded == (current or "0"):
+                metrics.incr("negative_cache.hits")
+                return (NO_RESULTS_RESPONSE, [], 0)
+        except Exception as e:
+            logger.warning(f"Negative cache get error: {str(e)}")
         return None
     
+    def _save_negative(self, cache_key: str):
+        """Remember an empty retrieval outcome for a short TTL"""
+        try:
+            version = self.redis.get(INDEX_VERSION_KEY) or "0"
+            self.redis.setex(f"{cache_key}:neg", settings.NEGATIVE_CACHE_TTL, version)
+            metrics.incr("negative_cache.stores")
+        except Exception as e:
+            logger.warning(f"Negative cache save error: {str(e)}")
+    
+    def _get_from_semantic_cache(self, query_embedding: list, tag: str = ""):
+        """Serve the cached response of a semantically equivalent query"""
+        if not settings.SEMANTIC_CACHE_ENABLED:
+            return None
+        
+        match = self.semantic_cache.lookup(query_embedding, tag)
+        if not match:
+            return None
+        
+        cache_key, similarity = match
+        if not cache_key.startswith(self.cache_namespace.prefix()):
+            # Respuesta de un estado anterior de la base de conocimiento
+            self.semantic_cache.invalidate(cache_key)
+            return None
+        
+        cached = self._get_from_cache(cache_key)
+        if cached is None:
+            # La respuesta ya expiró en Redis
+            self.semantic_cache.invalidate(cache_key)
+            return None
+        
+        logger.info(f"Semantic match {cache_key} (similarity: {similarity:.3f})")
+        return cached
+    
     def _save_to_cache(self, cache_key: str, result):
         """Save to cache with error handling"""
         try:
-            self.redis.setex(
+            entry = {'result': result, 'soft_expires_at': time.time() + self.cache_soft_ttl}
+            self.redis_binary.setex(
                 cache_key,
                 self.cache_ttl,
-                json.dumps(result)
+                self.cache_codec.encode(entry)
             )
         except Exception as e:
             logger.warning(f"Cache save error: {str(e)}")
@@ -0,0 +1,78 @@
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from pathlib import Path
+from typing import Dict, Optional
+import json
+
+logger = get_logger()
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+GREETING_TEMPLATE = """¡Hola! Soy SOIA, tu asistente virtual de Consolida Capital.
+
+Estoy aquí para ayudarte con información sobre los productos y servicios de GNP. Como agente de Consolida Capital, puedo asistirte con:
+
+- Información de productos (GMM, Vida, Autos, Daños)
+- Requisitos y procedimientos
+- Coberturas y beneficios
+- Gestión de pólizas
+- Preguntas frecuentes
+
+¿En qué puedo ayudarte hoy?"""
+
+DEFAULT_TEMPLATES: Dict[str, str] = {
+    'greeting': GREETING_TEMPLATE,
+}
+
+class ResponseTemplateRegistry:
+    """
+    Fixed answers for intents whose response is fully determined by a template.
+
+    Consulted for every routed intent (greeting, portal, waiting_periods,
+    comprehensive, general) before retrieval or the LLM; only the greeting
+    has a default. A JSON file (settings.RESPONSE_TEMPLATES_PATH) mapping
+    intent -> text adds or overrides templates; mapping an intent to null
+    disables its template so it goes back to the LLM.
+    """
+
+    def __init__(self, defaults: Dict[str, str] = None):
+        self._templates: Dict[str, str] = dict(defaults or DEFAULT_TEMPLATES)
+        self._loaded = False
+
+    def load(self, path: Path):
+        """Merge the overrides from a JSON file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        for intent, text in overrides.items():
+            if text is None:
+                self._templates.pop(intent, None)
+            else:
+                self._templates[intent] = str(text)
+        logger.info(f"Response templates loaded from {path}: {sorted(self._templates)}")
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if settings.RESPONSE_TEMPLATES_PATH:
+            path = BACKEND_DIR / settings.RESPONSE_TEMPLATES_PATH
+            if path.exists():
+                try:
+                    self.load(path)
+                except Exception as e:
+                    logger.warning(f"Could not load response templates from {path}: {str(e)}")
+
+    def has(self, intent: str) -> bool:
+        self._ensure_loaded()
+        return intent in self._templates
+
+    def get(self, intent: str) -> Optional[str]:
+        """Template text for the intent, or None when it must go to the LLM"""
+        self._ensure_loaded()
+        template = self._templates.get(intent)
+        if template is not None:
+            metrics.incr(f"templates.{intent}")
+        return template
+
+response_templates = ResponseTemplateRegistry()
@@ -0,0 +1,65 @@
+"""
+Result fusion strategies
+
+Merge several ranked chunk lists (one per expanded query, plus the lexical
+leg) into a single ranking. Each strategy receives lists of chunk dicts
+ordered best-first and returns unique chunks with a 'fusion_score'.
+Chunks are identified by their normalized text, so the same passage stored
+under different vector IDs is merged as well.
+"""
+
+from app.core.config import settings
+from typing import Callable, Dict, List
+import hashlib
+
+def _chunk_key(chunk: Dict) -> str:
+    return hashlib.md5(" ".join(chunk['text'].split()).encode()).hexdigest()
+
+def first_seen_fusion(ranked_lists: List[List[Dict]]) -> List[Dict]:
+    """Legacy behavior: keep the first occurrence, rank by its own score"""
+    fused = {}
+    for ranked in ranked_lists:
+        for chunk in ranked:
+            key = _chunk_key(chunk)
+            if key not in fused:
+                fused[key] = dict(chunk, fusion_score=chunk['score'], hits=1)
+            else:
+                fused[key]['hits'] += 1
+    return list(fused.values())
+
+def rrf_fusion(ranked_lists: List[List[Dict]], k: int = None) -> List[Dict]:
+    """
+    Reciprocal rank fusion: score = sum(1 / (k + rank)) over every list
+    that contains the chunk. Only ranks are used, so scores from different
+    queries (or BM25 vs cosine) never need to be comparable, and chunks
+    found by several expansions rise to the top.
+    """
+    k = k or settings.RRF_K
+    fused = {}
+    for ranked in ranked_lists:
+        for rank, chunk in enumerate(ranked):
+            key = _chunk_key(chunk)
+            contribution = 1.0 / (k + rank + 1)
+            entry = fused.get(key)
+            if entry is None:
+                fused[key] = dict(chunk, fusion_score=contribution, hits=1)
+                continue
+            entry['fusion_score'] += contribution
+            entry['hits'] += 1
+            # Conservar la mejor similitud densa y el score léxico si existe
+            entry['score'] = max(entry['score'], chunk['score'])
+            if 'lexical_score' in chunk:
+                entry['lexical_score'] = chunk['lexical_score']
+    return list(fused.values())
+
+FUSION_STRATEGIES: Dict[str, Callable[[List[List[Dict]]], List[Dict]]] = {
+    'rrf': rrf_fusion,
+    'first_seen': first_seen_fusion,
+}
+
+def fuse(ranked_lists: List[List[Dict]], strategy: str = None) -> List[Dict]:
+    """Fuse ranked lists with the named (or configured) strategy"""
+    strategy = strategy or settings.RAG_FUSION_STRATEGY
+    if strategy not in FUSION_STRATEGIES:
+        raise ValueError(f"Unknown fusion strategy: {strategy}")
+    return FUSION_STRATEGIES[strategy](ranked_lists)
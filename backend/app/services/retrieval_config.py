@@ -0,0 +1,220 @@
+from app.services.retrieval_profiles import RETRIEVAL_PROFILES, INTENT_OVERRIDES, resolve_profile
+from app.core.redis_client import get_redis
+from app.core.config import settings
+from app.core.logger import get_logger
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import time
+
+logger = get_logger()
+
+RETRIEVAL_CONFIG_KEY = "rag:retrieval_config"
+# Fuera de rag:*, que los scripts del caché recorren como respuestas
+EXPERIMENT_STATS_PREFIX = "experiment"
+
+# Parámetros que se pueden ajustar en caliente y su tipo
+PARAM_TYPES = {
+    'chunks_per_query': int,
+    'max_final_chunks': int,
+    'hybrid_max_final_chunks': int,
+    'similarity_threshold': float,
+    'max_queries': int,
+    'adaptive': bool,
+    'max_tokens': int,
+}
+ROUTED_INTENTS = ('waiting_periods', 'comprehensive', 'general')
+
+# Contadores por variante (hash en Redis)
+STAT_FIELDS = ('requests', 'cache_hits', 'fallbacks', 'errors', 'llm_calls', 'prompt_tokens', 'latency_ms')
+
+def _validate_params(params: Dict) -> Dict:
+    validated = {}
+    for key, value in params.items():
+        if key not in PARAM_TYPES:
+            raise ValueError(f"unknown retrieval parameter '{key}'")
+        validated[key] = None if value is None and key == 'max_tokens' else PARAM_TYPES[key](value)
+    return validated
+
+def _patch(tables: Dict[str, Dict], patch: Optional[Dict], allowed: Tuple[str, ...]) -> Dict[str, Dict]:
+    merged = {name: dict(params) for name, params in tables.items()}
+    for name, params in (patch or {}).items():
+        if name not in allowed:
+            raise ValueError(f"unknown profile or intent '{name}'")
+        merged.setdefault(name, {}).update(_validate_params(params))
+    return merged
+
+def parse_config(raw: Optional[Dict]) -> Dict:
+    """
+    Validate a config document and precompute the tables of each variant.
+
+    Document format (every section optional):
+        {
+          "profiles": {"balanced": {"similarity_threshold": 0.4}},
+          "intent_overrides": {"waiting_periods": {"chunks_per_query": 50}},
+          "experiment": {
+            "name": "threshold-040",
+            "variants": {
+              "control": {"weight": 50},
+              "low_threshold": {"weight": 50, "profiles": {"balanced": {"similarity_threshold": 0.4}}}
+            }
+          }
+        }
+
+    Raises ValueError on unknown profiles, intents or parameters.
+    """
+    raw = raw or {}
+    profiles = _patch(RETRIEVAL_PROFILES, raw.get('profiles'), tuple(RETRIEVAL_PROFILES))
+    overrides = _patch(INTENT_OVERRIDES, raw.get('intent_overrides'), ROUTED_INTENTS)
+    base = json.dumps({'profiles': profiles, 'intent_overrides': overrides}, sort_keys=True)
+
+    experiment = None
+    if raw.get('experiment'):
+        name = raw['experiment']['name']
+        variants = {}
+        for variant, spec in raw['experiment']['variants'].items():
+            changes = bool(spec.get('profiles') or spec.get('intent_overrides'))
+            variants[variant] = {
+                'weight': int(spec.get('weight', 1)),
+                'changes': changes,
+                'profiles': _patch(profiles, spec.get('profiles'), tuple(RETRIEVAL_PROFILES)),
+                'intent_overrides': _patch(overrides, spec.get('intent_overrides'), ROUTED_INTENTS),
+            }
+        if not variants or sum(v['weight'] for v in variants.values()) <= 0:
+            raise ValueError(f"experiment '{name}' has no weighted variants")
+        experiment = {'name': name, 'variants': variants}
+
+    return {
+        'profiles': profiles,
+        'intent_overrides': overrides,
+        'experiment': experiment,
+        'fingerprint': hashlib.sha1(base.encode()).hexdigest()[:8]
+    }
+
+class RetrievalConfig:
+    """
+    Retrieval parameters that can change without a redeploy, plus A/B experiments.
+
+    The config document lives in Redis (RETRIEVAL_CONFIG_KEY, managed with
+    scripts/set_retrieval_config.py) and is re-read every refresh_interval
+    seconds; an invalid document is logged and the last valid one is kept.
+    Its base tables feed the cache namespace, so tuning them retires cached
+    answers. An experiment assigns each conversation to a variant by hash
+    and records latency, prompt tokens, cache hits and fallbacks per variant.
+    """
+
+    def __init__(self, redis_client, refresh_interval: float = 30.0, latency_samples: int = 1000):
+        self.redis = redis_client
+        self.refresh_interval = refresh_interval
+        self.latency_samples = latency_samples
+        self._lock = Lock()
+        self._config = parse_config(None)
+        self._loaded_at = 0.0
+
+    def current(self) -> Dict:
+        """Parsed config, reloaded from Redis every refresh_interval"""
+        with self._lock:
+            if time.time() - self._loaded_at > self.refresh_interval:
+                self._loaded_at = time.time()
+                try:
+                    raw = self.redis.get(RETRIEVAL_CONFIG_KEY)
+                    config = parse_config(json.loads(raw) if raw else None)
+                    if config['fingerprint'] != self._config['fingerprint']:
+                        logger.info(f"Retrieval config changed: {self._config['fingerprint']} -> {config['fingerprint']}")
+                    self._config = config
+                except Exception as e:
+                    logger.warning(f"Retrieval config reload failed, keeping last valid: {str(e)}")
+            return self._config
+
+    def fingerprint(self) -> str:
+        return self.current()['fingerprint']
+
+    def assign(self, conversation_id: Optional[str]) -> Optional[Tuple[str, str]]:
+        """(experiment, variant) for a conversation, stable while the experiment runs"""
+        experiment = self.current()['experiment']
+        if not experiment or not conversation_id:
+            return None
+        variants = experiment['variants']
+        digest = hashlib.sha1(f"{experiment['name']}:{conversation_id}".encode()).hexdigest()
+        bucket = int(digest[:8], 16) % sum(v['weight'] for v in variants.values())
+        for variant, spec in variants.items():
+            bucket -= spec['weight']
+            if bucket < 0:
+                return experiment['name'], variant
+        return None
+
+    def resolve(
+        self,
+        name: Optional[str],
+        intent: Dict,
+        top_k: Optional[int] = None,
+        assignment: Optional[Tuple[str, str]] = None
+    ) -> Dict:
+        """Retrieval profile with the runtime config and the variant's changes applied"""
+        config = self.current()
+        tables = config
+        experiment = config['experiment']
+        variant = None
+        if assignment and experiment and experiment['name'] == assignment[0]:
+            variant = experiment['variants'].get(assignment[1])
+            if variant:
+                tables = variant
+
+        profile = resolve_profile(name, intent, top_k, tables['profiles'], tables['intent_overrides'])
+        # Variantes que cambian parámetros no comparten caché con el control
+        profile['experiment'] = f"{assignment[0]}.{assignment[1]}" if variant and variant['changes'] else None
+        return profile
+
+    def _stats_key(self, experiment: str, variant: str) -> str:
+        return f"{EXPERIMENT_STATS_PREFIX}:{experiment}:{variant}"
+
+    def record(self, assignment: Tuple[str, str], latency_ms: float, outcome: Dict):
+        """Add one request to the variant's counters; never raises"""
+        key = self._stats_key(*assignment)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hincrby(key, 'requests', 1)
+            pipe.hincrby(key, 'cache_hits', 1 if outcome.get('cache') else 0)
+            pipe.hincrby(key, 'fallbacks', 1 if outcome.get('fallback') else 0)
+            pipe.hincrby(key, 'errors', 1 if outcome.get('error') else 0)
+            pipe.hincrby(key, 'llm_calls', outcome.get('llm_calls', 0))
+            pipe.hincrby(key, 'prompt_tokens', outcome.get('prompt_tokens', 0))
+            pipe.hincrby(key, 'latency_ms', int(latency_ms))
+            pipe.lpush(f"{key}:latency", int(latency_ms))
+            pipe.ltrim(f"{key}:latency", 0, self.latency_samples - 1)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Experiment stats error: {str(e)}")
+
+    def report(self, experiment: str, variants: List[str]) -> Dict[str, Dict]:
+        """Per-variant totals and rates for an experiment"""
+        results = {}
+        for variant in variants:
+            key = self._stats_key(experiment, variant)
+            raw = self.redis.hgetall(key)
+            stats = {field: int(raw.get(field, 0)) for field in STAT_FIELDS}
+            samples = sorted(int(v) for v in self.redis.lrange(f"{key}:latency", 0, -1))
+            requests = max(1, stats['requests'])
+            stats.update({
+                'avg_latency_ms': stats['latency_ms'] / requests,
+                'p50_latency_ms': samples[len(samples) // 2] if samples else 0,
+                'p95_latency_ms': samples[int(len(samples) * 0.95)] if samples else 0,
+                'cache_hit_rate': stats['cache_hits'] / requests,
+                'fallback_rate': stats['fallbacks'] / requests,
+                'error_rate': stats['errors'] / requests,
+                'prompt_tokens_per_call': stats['prompt_tokens'] / max(1, stats['llm_calls']),
+            })
+            results[variant] = stats
+        return results
+
+    def reset(self, experiment: str, variants: List[str]):
+        for variant in variants:
+            key = self._stats_key(experiment, variant)
+            self.redis.delete(key, f"{key}:latency")
+
+retrieval_config = RetrievalConfig(
+    get_redis(),
+    settings.RETRIEVAL_CONFIG_REFRESH_INTERVAL,
+    settings.EXPERIMENT_LATENCY_SAMPLES
+)
@@ -0,0 +1,93 @@
+from typing import Dict, Optional
+
+# Perfiles de recuperación: velocidad vs. cobertura.
+# hybrid_max_final_chunks reemplaza a max_final_chunks cuando BM25 aporta resultados
+# (con fusión híbrida el recall llega con menos chunks); se ajustan juntos.
+RETRIEVAL_PROFILES: Dict[str, Dict] = {
+    # UI sensible a latencia: solo la query original, una etapa
+    'fast': {
+        'chunks_per_query': 8,
+        'max_final_chunks': 8,
+        'hybrid_max_final_chunks': 8,
+        'similarity_threshold': 0.45,
+        'max_queries': 1,
+        'adaptive': False,
+        'max_tokens': 800,
+    },
+    'balanced': {
+        'chunks_per_query': 15,
+        'max_final_chunks': 20,
+        'hybrid_max_final_chunks': 20,
+        'similarity_threshold': 0.45,
+        'max_queries': 3,
+        'adaptive': True,
+        'max_tokens': None,  # settings.MAX_TOKENS
+    },
+    # Preguntas de productos + características y jobs offline
+    'thorough': {
+        'chunks_per_query': 30,
+        'max_final_chunks': 35,
+        'hybrid_max_final_chunks': 30,
+        'similarity_threshold': 0.35,
+        'max_queries': 3,  # Como el resto: 3 búsquedas por etapa
+        'adaptive': True,
+        'max_tokens': None,
+    },
+}
+
+# Perfil por defecto según la intención detectada
+INTENT_PROFILES = {
+    'waiting_periods': 'thorough',
+    'comprehensive': 'thorough',
+}
+DEFAULT_PROFILE = 'balanced'
+
+# Ajustes por intención sobre el perfil por defecto de esa intención
+INTENT_OVERRIDES = {
+    # Los periodos de espera están fragmentados en muchos chunks: máximo recall
+    'waiting_periods': {
+        'chunks_per_query': 60,
+        'max_final_chunks': 80,
+        'hybrid_max_final_chunks': 60,
+        'similarity_threshold': 0.25,
+        'adaptive': False,
+    },
+}
+
+def default_profile(intent: Dict) -> str:
+    return INTENT_PROFILES.get(intent['name'], DEFAULT_PROFILE)
+
+def resolve_profile(
+    name: Optional[str],
+    intent: Dict,
+    top_k: Optional[int] = None,
+    profiles: Optional[Dict[str, Dict]] = None,
+    overrides: Optional[Dict[str, Dict]] = None
+) -> Dict:
+    """
+    Retrieval parameters for a request.
+
+    Without a name the profile follows the intent. The intent overrides only
+    apply when the chosen profile is the intent's default, so an explicit
+    'fast' stays fast. top_k, when given, replaces chunks_per_query.
+    profiles / overrides replace the built-in tables (runtime config).
+    Raises KeyError for unknown profile names.
+    """
+    profiles = profiles or RETRIEVAL_PROFILES
+    overrides = INTENT_OVERRIDES if overrides is None else overrides
+    name = name or default_profile(intent)
+    profile = dict(profiles[name], name=name, top_k=top_k)
+    if name == default_profile(intent):
+        profile.update(overrides.get(intent['name'], {}))
+    if top_k:
+        profile['chunks_per_query'] = top_k
+    return profile
+
+def cache_variant(profile: Dict, intent: Dict) -> Optional[str]:
+    """Cache-key suffix: None for the intent's default profile, so chat and warming share entries"""
+    variant = None if profile['name'] == default_profile(intent) else profile['name']
+    if profile['top_k']:
+        variant = f"{variant or profile['name']}:k{profile['top_k']}"
+    if profile.get('experiment'):
+        variant = f"{variant or profile['name']}@{profile['experiment']}"
+    return variant
@@ -0,0 +1,129 @@
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+logger = get_logger()
+
+class SemanticCache:
+    """
+    Semantic tier in front of the exact response cache.
+
+    Keeps the (L2-normalized) embeddings of answered queries in a fixed-size
+    float32 matrix together with the Redis key of their cached response.
+    A lookup is a single matrix-vector product; the best match is a hit when
+    its cosine similarity reaches the configured threshold. Entries carry a
+    tag (the products mentioned in the query) and only match the same tag,
+    so "deducible premium" never serves "deducible platino". When the matrix
+    is full the least recently used entry is overwritten.
+    """
+
+    def __init__(self, dimension: int, max_entries: int, threshold: float):
+        self.dimension = dimension
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = Lock()
+        self._vectors = None  # Se reserva en el primer add()
+        self._keys = [None] * max_entries
+        self._tags = np.empty(max_entries, dtype=object)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._clock = 0
+        self._size = 0
+
+    def _normalize(self, embedding) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if vector.shape != (self.dimension,) or norm == 0:
+            return None
+        return vector / norm
+
+    def lookup(self, embedding, tag: str = "") -> Optional[Tuple[str, float]]:
+        """Return (cache_key, similarity) of the closest cached query above threshold"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        metrics.incr("semantic_cache.lookups")
+        with self._lock:
+            if self._size == 0:
+                metrics.incr("semantic_cache.misses")
+                return None
+
+            similarities = self._vectors[:self._size] @ vector
+            similarities[self._tags[:self._size] != tag] = -1.0
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity < self.threshold:
+                metrics.incr("semantic_cache.misses")
+                return None
+
+            self._clock += 1
+            self._last_used[best] = self._clock
+            cache_key = self._keys[best]
+
+        metrics.incr("semantic_cache.hits")
+        return cache_key, similarity
+
+    def add(self, embedding, cache_key: str, tag: str = ""):
+        """Store the embedding of an answered query"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, self.dimension), dtype=np.float32)
+
+            if cache_key in self._keys[:self._size]:
+                slot = self._keys.index(cache_key)
+            elif self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                # Evict least recently used
+                slot = int(np.argmin(self._last_used[:self._size]))
+                metrics.incr("semantic_cache.evictions")
+
+            self._vectors[slot] = vector
+            self._keys[slot] = cache_key
+            self._tags[slot] = tag
+            self._clock += 1
+            self._last_used[slot] = self._clock
+
+    def invalidate(self, cache_key: str):
+        """Drop an entry whose response is no longer in Redis"""
+        with self._lock:
+            if cache_key not in self._keys[:self._size]:
+                return
+            slot = self._keys.index(cache_key)
+            last = self._size - 1
+            # Mover la última entrada al hueco para mantener el bloque contiguo
+            self._vectors[slot] = self._vectors[last]
+            self._keys[slot] = self._keys[last]
+            self._tags[slot] = self._tags[last]
+            self._last_used[slot] = self._last_used[last]
+            self._keys[last] = None
+            self._size -= 1
+
+    def stats(self) -> Dict:
+        """Size and hit-rate metrics"""
+        lookups = metrics.get("semantic_cache.lookups")
+        hits = metrics.get("semantic_cache.hits")
+        return {
+            'size': self._size,
+            'max_entries': self.max_entries,
+            'threshold': self.threshold,
+            'lookups': lookups,
+            'hits': hits,
+            'evictions': metrics.get("semantic_cache.evictions"),
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0
+        }
+
+semantic_cache = SemanticCache(
+    dimension=settings.EMBEDDING_DIMENSION,
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD
+)
@@ -0,0 +1,70 @@
+"""
+Script para precalcular firmas SimHash en la metadata de Pinecone
+
+Agrega el campo 'simhash' (64 bits en hexadecimal) a los vectores que no lo
+tienen. El RAG lo usa para colapsar chunks casi idénticos sin recalcular la
+firma en cada consulta.
+
+Uso:
+    python backend/scripts/backfill_simhash.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.pinecone_service import pinecone_service
+from app.services.near_duplicates import simhash_hex
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+def main():
+    """Script principal"""
+
+    print("=" * 80)
+    print("PRECÁLCULO DE FIRMAS SIMHASH")
+    print("=" * 80)
+
+    try:
+        index = pinecone_service.get_index()
+
+        scanned = 0
+        updated = 0
+        errors = 0
+
+        for id_page in index.list(limit=100):
+            fetched = index.fetch(ids=list(id_page))
+            for vector_id, vector in fetched.vectors.items():
+                scanned += 1
+                metadata = vector.metadata or {}
+                if metadata.get('simhash') or not metadata.get('text'):
+                    continue
+                try:
+                    index.update(id=vector_id, set_metadata={'simhash': simhash_hex(metadata['text'])})
+                    updated += 1
+                except Exception as e:
+                    errors += 1
+                    logger.error(f"Error actualizando {vector_id}: {str(e)}")
+
+            print(f"   Revisados: {scanned:,} | Actualizados: {updated:,}", end='\r')
+            time.sleep(0.1)  # Pequeña pausa para no saturar
+
+        print("\n\n" + "=" * 80)
+        print(f"✅ Vectores revisados: {scanned:,}")
+        print(f"✅ Firmas agregadas: {updated:,}")
+        print(f"❌ Errores: {errors:,}")
+        print("=" * 80)
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        logger.error(f"Error en backfill_simhash: {str(e)}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,9 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from app.services.embedding_service import embedding_service
 from app.services.pinecone_service import pinecone_service
+from app.services.product_catalog import PRODUCT_PATTERNS
+from app.services.near_duplicates import simhash_hex
+from app.services.cache_namespace import cache_namespace
 from app.core.logger import get_logger
 
 logger = get_logger()
@@ -122,7 +125,9 @@ def upload_synthetic_document(filepath: Path):
                 "source": filepath.name,
                 "doc_type": "synthetic",
                 "product": product,
+                "area": PRODUCT_PATTERNS.get(product, {}).get('area', 'unknown'),
                 "category": category,
+                "simhash": simhash_hex(chunk),
                 "chunk_index": i,
                 "total_chunks": len(chunks),
                 "uploaded_at": timestamp
@@ -234,6 +239,15 @@ def main():
     
     print(f"\n🎉 Los documentos sintéticos están ahora disponibles en Pinecone")
     print(f"   con prioridad máxima en las búsquedas (doc_type='synthetic')")
+    
+    # Nuevo namespace de caché: las respuestas anteriores no incluyen estos documentos
+    if results:
+        try:
+            version = cache_namespace.bump()
+            print(f"\n🔄 Versión del índice: {version} (caché de respuestas renovado)")
+        except Exception as e:
+            print(f"\n⚠️  No se pudo incrementar la versión del índice: {str(e)}")
+            print("   Ejecuta: python scripts/clear_redis_cache.py --bump")
 
 if __name__ == "__main__":
     main()
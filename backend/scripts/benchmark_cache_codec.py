@@ -0,0 +1,126 @@
+"""
+Benchmark de codecs del caché de respuestas
+
+Compara, sobre entradas reales del caché (o, si no hay, entradas armadas
+con los documentos de data/synthetic):
+
+- JSON (formato anterior)
+- msgpack
+- msgpack + zstd
+- msgpack + zstd con el diccionario entrenado (si existe)
+
+Reporta bytes por entrada, memoria en Redis por entrada (MEMORY USAGE
+sobre llaves temporales) y latencia de decodificación.
+
+Uso:
+    python backend/scripts/benchmark_cache_codec.py
+    python backend/scripts/benchmark_cache_codec.py --max-samples 500 --no-redis
+"""
+
+import sys
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.redis_client import get_redis_binary
+from app.core.cache_codec import CacheCodec, BACKEND_DIR
+
+logger = get_logger()
+
+def load_entries(max_samples: int, use_redis: bool) -> list:
+    """Entradas del caché de Redis; si no hay, entradas sintéticas"""
+    entries = []
+    if use_redis:
+        redis_client = get_redis_binary()
+        reader = CacheCodec(settings.CACHE_CODEC, settings.CACHE_CODEC_LEVEL, settings.CACHE_CODEC_DICT_PATH)
+        for key in redis_client.scan_iter(match="rag:*", count=500):
+            if key.startswith(b"rag:inflight") or key.startswith(b"rag:refresh") or key in (b"rag:index_version", b"rag:retrieval_config"):
+                continue
+            try:
+                entries.append(reader.decode(redis_client.get(key)))
+            except ValueError:
+                continue
+            if len(entries) >= max_samples:
+                break
+
+    if not entries:
+        # Respuesta ~ texto de un documento sintético, fuentes ~ fragmentos de otros
+        texts = [p.read_text(encoding='utf-8') for p in sorted((BACKEND_DIR / "data" / "synthetic").glob("*.txt"))]
+        for i, text in enumerate(texts[:max_samples]):
+            sources = [{
+                'source': f"synthetic_{(i + j) % len(texts)}.txt",
+                'score': 0.6,
+                'text_preview': texts[(i + j) % len(texts)][:200] + '...'
+            } for j in range(10)]
+            entries.append({'result': [text[:3000], sources, 4000], 'soft_expires_at': 1.0e9})
+    return entries
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Benchmark de codecs del caché de respuestas")
+    parser.add_argument('--max-samples', type=int, default=1000)
+    parser.add_argument('--no-redis', action='store_true',
+                        help="No leer entradas ni medir memoria en Redis")
+    args = parser.parse_args()
+
+    import msgpack
+    import zstandard
+
+    print("=" * 80)
+    print("BENCHMARK DE CODECS DEL CACHÉ")
+    print("=" * 80)
+
+    entries = load_entries(args.max_samples, not args.no_redis)
+    print(f"\n📄 Entradas: {len(entries):,}")
+
+    level = settings.CACHE_CODEC_LEVEL
+    plain_c = zstandard.ZstdCompressor(level=level)
+    plain_d = zstandard.ZstdDecompressor()
+    codecs = [
+        ("json", lambda v: json.dumps(v).encode(), json.loads),
+        ("msgpack", lambda v: msgpack.packb(v, use_bin_type=True), lambda b: msgpack.unpackb(b, raw=False)),
+        ("msgpack+zstd",
+         lambda v: plain_c.compress(msgpack.packb(v, use_bin_type=True)),
+         lambda b: msgpack.unpackb(plain_d.decompress(b), raw=False)),
+    ]
+    dict_path = BACKEND_DIR / settings.CACHE_CODEC_DICT_PATH
+    if dict_path.exists():
+        trained = CacheCodec("msgpack_zstd", level, settings.CACHE_CODEC_DICT_PATH)
+        codecs.append(("msgpack+zstd+dict", trained.encode, trained.decode))
+    else:
+        print(f"   (sin diccionario en {dict_path}; ejecuta train_cache_dictionary.py)")
+
+    redis_client = None if args.no_redis else get_redis_binary()
+
+    print(f"\n{'codec':<20} {'bytes/entrada':>14} {'redis/entrada':>14} {'decode µs':>10}")
+    for name, encode, decode in codecs:
+        encoded = [encode(e) for e in entries]
+        avg_bytes = sum(len(b) for b in encoded) / len(encoded)
+        elapsed = timeit.timeit(lambda: [decode(b) for b in encoded], number=5)
+        decode_us = elapsed / (5 * len(encoded)) * 1e6
+
+        redis_bytes = "-"
+        if redis_client is not None:
+            try:
+                keys = [f"bench:codec:{name}:{i}" for i in range(min(len(encoded), 200))]
+                for key, value in zip(keys, encoded):
+                    redis_client.set(key, value, ex=300)
+                usage = [redis_client.memory_usage(key) or 0 for key in keys]
+                redis_client.delete(*keys)
+                redis_bytes = f"{sum(usage) / len(usage):,.0f}"
+            except Exception as e:
+                logger.warning(f"Redis memory usage not available: {str(e)}")
+
+        print(f"{name:<20} {avg_bytes:>14,.0f} {redis_bytes:>14} {decode_us:>10.1f}")
+
+    print("\n" + "=" * 80)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
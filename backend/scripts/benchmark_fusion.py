@@ -0,0 +1,113 @@
+"""
+Benchmark de estrategias de fusión de resultados
+
+Para cada pregunta de scripts/faqs_gmm.json ejecuta la etapa de búsqueda
+(expansiones + Pinecone + BM25) una sola vez y compara cómo cada estrategia
+de fusión llena el contexto con distintos valores de max_final_chunks:
+
+- Tokens de contexto (aprox. caracteres / 4)
+- Cobertura: fracción de los chunks de referencia (first_seen con la
+  profundidad original) que siguen presentes en la selección
+
+No llama al LLM ni escribe en caché.
+
+Uso:
+    python backend/scripts/benchmark_fusion.py
+    python backend/scripts/benchmark_fusion.py --limit 10 --chunks 10 15 20 35
+"""
+
+import sys
+import argparse
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.rag_service import rag_service
+from app.services.result_fusion import fuse, FUSION_STRATEGIES
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+def select(ranked_lists, strategy: str, max_final_chunks: int) -> list:
+    """Misma ordenación que RAGService: sintéticos primero, luego fusión"""
+    chunks = fuse([list(r) for r in ranked_lists], strategy)
+    chunks.sort(key=lambda x: (1 if 'synthetic' in x['doc_type'] else 0, x['fusion_score']), reverse=True)
+    return chunks[:max_final_chunks]
+
+def context_tokens(chunks: list) -> int:
+    return sum(len(c['text']) for c in chunks) // 4
+
+def retrieve_ranked_lists(question: str, chunks_per_query: int, threshold: float) -> list:
+    search_queries = rag_service._expand_query(question)
+    embeddings = rag_service._embed_queries(search_queries)
+    results = rag_service._search_parallel(search_queries, embeddings, chunks_per_query)
+    ranked_lists = rag_service._collect_ranked_lists(results, threshold)
+    understanding = rag_service.query_understanding.analyze(question)
+    lexical = rag_service._search_lexical(question, understanding['products'])
+    if lexical:
+        ranked_lists.append(lexical)
+    return ranked_lists
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Benchmark de fusión de resultados")
+    parser.add_argument('--limit', type=int, default=20, help="Número de preguntas")
+    parser.add_argument('--chunks', type=int, nargs='+', default=[10, 15, 20, 35],
+                        help="Valores de max_final_chunks a comparar")
+    parser.add_argument('--baseline-chunks', type=int, default=35,
+                        help="max_final_chunks de la referencia first_seen")
+    parser.add_argument('--chunks-per-query', type=int, default=30)
+    parser.add_argument('--threshold', type=float, default=0.35)
+    args = parser.parse_args()
+
+    faqs_path = Path(__file__).parent / "faqs_gmm.json"
+    questions = json.loads(faqs_path.read_text(encoding='utf-8'))['questions'][:args.limit]
+
+    print("=" * 80)
+    print("BENCHMARK DE FUSIÓN DE RESULTADOS")
+    print("=" * 80)
+    print(f"\nPreguntas: {len(questions)} | Estrategias: {', '.join(FUSION_STRATEGIES)}")
+
+    totals = {}
+    baseline_tokens = 0
+
+    for i, question in enumerate(questions, 1):
+        print(f"\n[{i}/{len(questions)}] {question}")
+        try:
+            ranked_lists = retrieve_ranked_lists(question, args.chunks_per_query, args.threshold)
+        except Exception as e:
+            print(f"   ❌ Error: {str(e)}")
+            continue
+
+        baseline = select(ranked_lists, 'first_seen', args.baseline_chunks)
+        baseline_keys = {" ".join(c['text'].split()) for c in baseline}
+        baseline_tokens += context_tokens(baseline)
+
+        for strategy in FUSION_STRATEGIES:
+            for max_chunks in args.chunks:
+                selected = select(ranked_lists, strategy, max_chunks)
+                keys = {" ".join(c['text'].split()) for c in selected}
+                coverage = len(keys & baseline_keys) / len(baseline_keys) if baseline_keys else 1.0
+                entry = totals.setdefault((strategy, max_chunks), {'tokens': 0, 'coverage': 0.0, 'n': 0})
+                entry['tokens'] += context_tokens(selected)
+                entry['coverage'] += coverage
+                entry['n'] += 1
+
+    print("\n" + "=" * 80)
+    print("RESULTADOS (promedio por pregunta)")
+    print("=" * 80)
+    n_questions = max(1, max((e['n'] for e in totals.values()), default=1))
+    avg_baseline = baseline_tokens / n_questions
+    print(f"\nReferencia first_seen@{args.baseline_chunks}: {avg_baseline:,.0f} tokens de contexto\n")
+    print(f"{'Estrategia':<12} {'Chunks':>6} {'Tokens':>9} {'Ahorro':>8} {'Cobertura':>10}")
+    for (strategy, max_chunks), entry in sorted(totals.items()):
+        avg_tokens = entry['tokens'] / entry['n']
+        savings = 1 - avg_tokens / avg_baseline if avg_baseline else 0.0
+        print(f"{strategy:<12} {max_chunks:>6} {avg_tokens:>9,.0f} {savings:>7.0%} {entry['coverage'] / entry['n']:>10.0%}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
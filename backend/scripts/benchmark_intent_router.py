@@ -0,0 +1,139 @@
+"""
+Microbenchmark y evaluación del enrutador de intenciones
+
+Compara IntentRouter contra la detección anterior por listas de palabras
+(`any(k in msg_lower ...)`) sobre el conjunto etiquetado
+scripts/intent_labels.json:
+
+- Exactitud de cada implementación contra las etiquetas (name y expansion)
+- Tiempo por mensaje (timeit)
+
+No usa red: solo clasifica texto.
+
+Uso:
+    python backend/scripts/benchmark_intent_router.py
+    python backend/scripts/benchmark_intent_router.py --repeat 2000
+"""
+
+import sys
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.intent_router import intent_router
+
+LABELS_PATH = Path(__file__).parent / "intent_labels.json"
+
+def legacy_route(message: str) -> dict:
+    """Detección anterior: búsqueda de subcadenas en listas construidas por request"""
+    msg_lower = message.lower().strip()
+
+    greetings = [
+        'hola', 'buenos días', 'buenas tardes', 'buenas noches',
+        'qué tal', 'saludos', 'hey', 'hi', 'hello', 'buen día'
+    ]
+    portal_keywords = [
+        'portal', 'portales', 'intermediario', 'intermediarios',
+        'portal de ideas', 'portal idea', 'plataforma',
+        'donde cotizar', 'dónde cotizar', 'donde cotizo'
+    ]
+    specific_feature_keywords = [
+        'periodos de espera', 'periodo de espera', 'períodos de espera', 'período de espera',
+        'tiempo de espera', 'tiempos de espera', 'cuánto tiempo',
+        'deducible', 'deducibles', 'coaseguro', 'coaseguros', 'copago', 'copagos',
+        'precio', 'precios', 'costo', 'costos', 'prima', 'primas', 'tarifa', 'tarifas',
+        'cobertura', 'coberturas', 'beneficio', 'beneficios', 'servicio', 'servicios',
+        'incluye', 'cubre', 'protege', 'ampara',
+        'exclusiones', 'exclusión', 'limitaciones', 'limitación', 'restricciones', 'restricción',
+        'no cubre', 'no incluye', 'excepto', 'salvo',
+        'requisitos', 'requisito', 'documentos', 'documento', 'papeles', 'trámites', 'trámite',
+        'lista completa', 'todos los', 'todas las', 'todo lo que', 'cuáles son todos',
+        'lista de', 'listado de', 'relación de',
+        'condiciones', 'condición', 'cláusula', 'cláusulas', 'términos',
+        'suma asegurada', 'sumas aseguradas', 'límite', 'límites', 'tope', 'topes',
+        'monto', 'montos', 'máximo', 'máximos', 'mínimo', 'mínimos'
+    ]
+    productos = [
+        'versátil', 'versatil', 'premium', 'platino', 'conexión gnp',
+        'gmm', 'gastos médicos', 'vida', 'auto', 'autos', 'daños',
+        'hogar', 'mascota', 'negocio protegido', 'cyber safe'
+    ]
+
+    if any(g in msg_lower for g in greetings):
+        name = 'greeting'
+    elif any(k in msg_lower for k in portal_keywords):
+        name = 'portal'
+    elif 'periodo' in msg_lower and 'espera' in msg_lower:
+        name = 'waiting_periods'
+    elif any(p in msg_lower for p in productos) and any(k in msg_lower for k in specific_feature_keywords):
+        name = 'comprehensive'
+    else:
+        name = 'general'
+
+    if any(w in msg_lower for w in ['todos', 'lista', 'cuáles', 'qué productos']):
+        expansion = 'listing'
+    elif 'internacional' in msg_lower:
+        expansion = 'international'
+    elif any(w in msg_lower for w in ['requisitos', 'cómo', 'proceso', 'pasos']):
+        expansion = 'procedure'
+    elif any(w in msg_lower for w in ['qué es', 'define', 'significa']):
+        expansion = 'definition'
+    else:
+        expansion = None
+
+    return {'name': name, 'expansion': expansion}
+
+def evaluate(route, examples: list) -> tuple:
+    """(aciertos de name, aciertos de expansion, errores de name)"""
+    name_ok = 0
+    expansion_ok = 0
+    mistakes = []
+    for example in examples:
+        result = route(example['message'])
+        if result['name'] == example['name']:
+            name_ok += 1
+        else:
+            mistakes.append((example['message'], example['name'], result['name']))
+        if result['expansion'] == example['expansion']:
+            expansion_ok += 1
+    return name_ok, expansion_ok, mistakes
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Benchmark del enrutador de intenciones")
+    parser.add_argument('--repeat', type=int, default=1000,
+                        help="Pasadas sobre el conjunto etiquetado para medir tiempo")
+    args = parser.parse_args()
+
+    with open(LABELS_PATH, 'r', encoding='utf-8') as f:
+        examples = json.load(f)['examples']
+    messages = [e['message'] for e in examples]
+
+    print("=" * 80)
+    print("BENCHMARK DEL ENRUTADOR DE INTENCIONES")
+    print("=" * 80)
+    print(f"\n📋 Ejemplos etiquetados: {len(examples)}")
+
+    implementations = [("Listas (anterior)", legacy_route), ("IntentRouter", intent_router.route)]
+
+    for label, route in implementations:
+        name_ok, expansion_ok, mistakes = evaluate(route, examples)
+        elapsed = timeit.timeit(lambda: [route(m) for m in messages], number=args.repeat)
+        per_message_us = elapsed / (args.repeat * len(messages)) * 1e6
+
+        print(f"\n🔎 {label}")
+        print(f"   Intención:  {name_ok}/{len(examples)} ({name_ok / len(examples):.0%})")
+        print(f"   Expansión:  {expansion_ok}/{len(examples)} ({expansion_ok / len(examples):.0%})")
+        print(f"   Tiempo:     {per_message_us:.1f} µs por mensaje")
+        for message, expected, got in mistakes:
+            print(f"   ❌ {message!r}: esperado {expected}, obtenido {got}")
+
+    print("\n" + "=" * 80)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
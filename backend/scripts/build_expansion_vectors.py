@@ -0,0 +1,95 @@
+"""
+Script para construir los vectores de expansión de queries
+
+Genera data/expansion_vectors.npz con:
+  - el embedding de cada frase fija de expansión ("catálogo productos GNP seguros", ...)
+  - un vector de dirección por plantilla ("{query} procedimiento", ...), calculado
+    como el promedio de e("{q} procedimiento") - e(q) sobre preguntas reales
+
+Con este archivo la API solo genera el embedding de la pregunta original; las
+expansiones se obtienen sin llamar a OpenAI. Se reporta la similitud coseno
+entre el vector compuesto y el embedding real en un conjunto de validación.
+
+Uso:
+    python backend/scripts/build_expansion_vectors.py
+    python backend/scripts/build_expansion_vectors.py --holdout 0.2
+"""
+
+import sys
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.embedding_cache import cached_embedding_service
+from app.services.expansion_vectors import ExpansionVectorRegistry, BACKEND_DIR
+
+logger = get_logger()
+
+DEFAULT_QUESTIONS = Path(__file__).parent / "faqs_gmm.json"
+
+def load_questions(path: Path) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    questions = data['questions'] if isinstance(data, dict) else data
+    return list(dict.fromkeys(q.strip() for q in questions if q.strip()))
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Construye los vectores de expansión de queries")
+    parser.add_argument('--questions', type=Path, default=DEFAULT_QUESTIONS,
+                        help="JSON con las preguntas de calibración")
+    parser.add_argument('--holdout', type=float, default=0.2,
+                        help="Fracción de preguntas reservadas para validar (default: 0.2)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONSTRUCCIÓN DE VECTORES DE EXPANSIÓN")
+    print("=" * 80)
+
+    start_time = time.time()
+
+    try:
+        questions = load_questions(args.questions)
+        random.Random(42).shuffle(questions)
+        n_holdout = int(len(questions) * args.holdout)
+        holdout, calibration = questions[:n_holdout], questions[n_holdout:]
+        print(f"\n📄 Preguntas: {len(calibration)} de calibración, {len(holdout)} de validación")
+
+        registry = ExpansionVectorRegistry(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIMENSION)
+        fidelity = registry.build(
+            cached_embedding_service.generate_embeddings_batch,
+            calibration,
+            holdout or None
+        )
+
+        output_path = BACKEND_DIR / settings.EXPANSION_VECTORS_PATH
+        registry.save(output_path)
+
+        print(f"\n📊 Similitud con el embedding real de la expansión:")
+        print(f"   {'Plantilla':<24} {'Compuesto':>10} {'Solo query':>11}")
+        for name, scores in fidelity.items():
+            print(f"   {name:<24} {scores['composed']:>10.4f} {scores['query_only']:>11.4f}")
+
+        elapsed = time.time() - start_time
+        print(f"\n✅ Vectores guardados en {output_path}")
+        print(f"   Frases fijas: {len(registry.static)}")
+        print(f"   Plantillas: {len(registry.directions)}")
+        print(f"   Modelo: {registry.model}")
+        print(f"   Tiempo: {elapsed:.1f}s")
+
+    except Exception as e:
+        print(f"\n❌ Error construyendo los vectores: {str(e)}")
+        logger.error(f"Error en build_expansion_vectors: {str(e)}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Script para construir el índice léxico (BM25)
+
+Genera el archivo data/lexical_index.json.gz con los textos guardados en la
+metadata de los vectores de Pinecone: son los mismos chunks (y los mismos IDs)
+que devuelve la búsqueda densa, así la fusión RRF y el filtro SimHash unen los
+resultados de ambas. Con --local-only se construye a partir de data/extracted*
+y data/synthetic (sin acceso a Pinecone). La API lo carga al arrancar en lugar
+de reconstruirlo.
+
+Uso:
+    python backend/scripts/build_lexical_index.py
+    python backend/scripts/build_lexical_index.py --local-only
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.lexical_index import LexicalIndex, load_corpus_documents, BACKEND_DIR
+
+logger = get_logger()
+
+def load_pinecone_documents(batch_size: int = 100) -> list:
+    """Lee los textos de la metadata de todos los vectores del índice"""
+    from app.services.pinecone_service import pinecone_service
+    from app.services.near_duplicates import simhash_hex
+
+    index = pinecone_service.get_index()
+    documents = []
+
+    for id_page in index.list(limit=batch_size):
+        fetched = index.fetch(ids=list(id_page))
+        for vector_id, vector in fetched.vectors.items():
+            metadata = vector.metadata or {}
+            text = metadata.get('text', '')
+            if not text:
+                continue
+            product = metadata.get('product')
+            documents.append({
+                'id': vector_id,
+                'text': text,
+                'source': metadata.get('source', 'Manual GNP'),
+                'doc_type': metadata.get('doc_type', 'pdf'),
+                'product': product if product and product != 'unknown' else None,
+                'category': metadata.get('category'),
+                'simhash': metadata.get('simhash') or simhash_hex(text)
+            })
+        print(f"   Leídos {len(documents):,} vectores...", end='\r')
+
+    print()
+    return documents
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Construye el índice léxico BM25")
+    parser.add_argument('--local-only', action='store_true',
+                        help="Construir desde los archivos locales en lugar de la metadata de Pinecone")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONSTRUCCIÓN DEL ÍNDICE LÉXICO (BM25)")
+    print("=" * 80)
+
+    start_time = time.time()
+
+    try:
+        if args.local_only:
+            documents = load_corpus_documents()
+            print(f"\n📄 Chunks de archivos locales: {len(documents):,}")
+        else:
+            print("\n🔍 Leyendo metadata de Pinecone...")
+            documents = load_pinecone_documents()
+            print(f"   ✅ Chunks desde Pinecone: {len(documents):,}")
+
+        index = LexicalIndex()
+        index.build(documents)
+
+        output_path = BACKEND_DIR / settings.LEXICAL_INDEX_PATH
+        index.save(output_path)
+
+        elapsed = time.time() - start_time
+        print(f"\n✅ Índice guardado en {output_path}")
+        print(f"   Chunks: {len(index.documents):,}")
+        print(f"   Términos: {len(index._postings):,}")
+        print(f"   Tiempo: {elapsed:.1f}s")
+
+    except Exception as e:
+        print(f"\n❌ Error construyendo el índice: {str(e)}")
+        logger.error(f"Error en build_lexical_index: {str(e)}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,21 @@
 """
 Script para limpiar el caché de Redis
 
-Limpia completamente el caché de Redis para forzar la regeneración
-de respuestas con los documentos actualizados.
+Por defecto limpia completamente el caché de Redis para forzar la
+regeneración de respuestas con los documentos actualizados.
+
+Con --bump no borra nada: incrementa la versión del índice, con lo que
+todos los workers pasan a un namespace de caché nuevo en menos de
+CACHE_NAMESPACE_REFRESH_INTERVAL segundos y las entradas anteriores
+expiran solas.
 
 Uso:
     python backend/scripts/clear_redis_cache.py
+    python backend/scripts/clear_redis_cache.py --bump
 """
 
 import sys
+import argparse
 from pathlib import Path
 import redis
 
@@ -20,8 +27,14 @@ from app.core.logger import get_logger
 
 logger = get_logger()
 
+INDEX_VERSION_KEY = "rag:index_version"  # Igual que app.services.cache_namespace
+
 def main():
     """Script principal"""
+    parser = argparse.ArgumentParser(description="Limpia o invalida el caché de Redis")
+    parser.add_argument('--bump', action='store_true',
+                        help="Cambiar de namespace en lugar de borrar todo")
+    args = parser.parse_args()
     
     print("=" * 80)
     print("LIMPIEZA DE CACHÉ DE REDIS")
@@ -31,12 +44,18 @@ def main():
         # Conectar a Redis
         redis_client = redis.from_url(settings.REDIS_URL)
         
-        # Limpiar todo el caché
-        redis_client.flushdb()
-        
-        print("\n✅ Caché de Redis limpiado exitosamente")
-        print("\n📝 Todas las consultas futuras generarán respuestas nuevas")
-        print("   usando los documentos más recientes de Pinecone")
+        if args.bump:
+            version = redis_client.incr(INDEX_VERSION_KEY)
+            print(f"\n✅ Versión del índice incrementada a {version}")
+            print("\n📝 Las consultas usarán un namespace de caché nuevo; las")
+            print("   entradas anteriores expiran con su TTL")
+        else:
+            # Limpiar todo el caché
+            redis_client.flushdb()
+            
+            print("\n✅ Caché de Redis limpiado exitosamente")
+            print("\n📝 Todas las consultas futuras generarán respuestas nuevas")
+            print("   usando los documentos más recientes de Pinecone")
         
         print("\n" + "=" * 80)
         print("✅ LIMPIEZA COMPLETADA")
@@ -10,105 +10,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.services.embedding_service import embedding_service
 from app.services.pinecone_service import pinecone_service
+from app.services.product_catalog import GNP_PRODUCTS
 from app.core.logger import get_logger
 
 logger = get_logger()
 
-# ESTRUCTURA REAL COMPLETA DE GNP
-GNP_PRODUCTS = {
-    'GMM': {
-        'Individual': {
-            'name': 'Gastos Médicos Mayores Individual',
-            'products': [
-                'Premium', 'Platino', 'Flexibles', 'Versátil',
-                'Conexión GNP', 'Conexión Línea Azul',
-                'GNP Indemniza', 'Acceso', 'Esencial', 'Plenitud', 'VIP',
-                'Internacional', 'GNP Enlace Internacional', 
-                'Vínculo Mundial', 'Alta Especialidad'
-            ]
-        },
-        'PyMES_Corporativo': {
-            'name': 'Gastos Médicos Mayores PyMES y Corporativo',
-            'products': [
-                'GMM Grupo', 'GNP Indemniza', 'Respaldo Hospitalario',
-                'Línea Azul VIP', 'Línea Azul Internacional', 
-                'Línea Azul Premier', 'Seguro por Hospitalización',
-                'Accidentes Personales'
-            ]
-        }
-    },
-    'Vida': {
-        'Individual': {
-            'name': 'Vida Individual',
-            'products': {
-                'Protección y Ahorro': [
-                    'Visión Plus', 'Privilegio Universal', 'Trasciende',
-                    'Ordinario de Vida', 'Platino Universal'
-                ],
-                'Retiro': [
-                    'Consolida', 'Proyecta', 'Proyecta Afecto',
-                    'Consolida Total', 'Elige'
-                ],
-                'Ahorro': [
-                    'Vida a tus sueños', 'Dotal', 'Inversión',
-                    'Capitaliza', 'Vida Inversión'
-                ],
-                'Educación': [
-                    'Profesional Abuelos', 'Profesional'
-                ],
-                'Protección': [
-                    'Platino', 'Privilegio'
-                ]
-            }
-        },
-        'PyMES_Corporativo': {
-            'name': 'Vida PyMES y Corporativo',
-            'products': [
-                'Vida Grupo', 'GNP Vida Deudor', 'Vida Escolar GNP'
-            ]
-        }
-    },
-    'Autos': {
-        'Individual': {
-            'name': 'Autos Individual',
-            'products': [
-                'Auto Más', 'Auto Élite', 'Motos',
-                'Automóviles Individual', 'Auto Más Información C.',
-                'Autos Turistas GNP'
-            ]
-        },
-        'PyMES_Corporativo': {
-            'name': 'Autos PyMES y Corporativo',
-            'products': [
-                'Flotillas PyMEs y Corporativo', 'Micronegocio'
-            ]
-        }
-    },
-    'Daños': {
-        'Individual': {
-            'name': 'Daños Individual',
-            'products': [
-                'GNP Riesgos Naturales', 'Mi Mascota GNP',
-                'Hogar versátil'
-            ]
-        },
-        'PyMES_Corporativo': {
-            'name': 'Daños PyMES y Corporativo',
-            'products': [
-                'Negocio Protegido GNP', 'Cyber Safe',
-                'Transporte de Mercancías', 'Responsabilidad Civil',
-                'Condominios - Áreas Comunes', 
-                'Responsabilidad Civil Profesional',
-                'Equipo de Contratistas con RC', 'Equipo Electrónico',
-                'Técnicos', 'Embarcaciones Menores de Placer',
-                'Multirriesgo Protegido GNP', 
-                'Responsabilidad Ambiental GNP',
-                'Agricultura Protegida GNP'
-            ]
-        }
-    }
-}
-
 def create_master_index():
     """Crear índice maestro con TODOS los productos"""
     
@@ -0,0 +1,73 @@
+"""
+Script para comparar las variantes del experimento A/B de búsqueda
+
+Lee de Redis las métricas que registra cada worker por variante: latencia
+(promedio, p50, p95), tokens de prompt por llamada al LLM, tasa de
+aciertos de caché, tasa de fallback (sin chunks relevantes) y errores.
+
+Uso:
+    python backend/scripts/experiment_report.py
+    python backend/scripts/experiment_report.py --experiment threshold-040 --variants control low_threshold
+    python backend/scripts/experiment_report.py --reset
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.logger import get_logger
+from app.services.retrieval_config import retrieval_config
+
+logger = get_logger()
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Reporte del experimento A/B de búsqueda")
+    parser.add_argument('--experiment', help="Nombre del experimento (default: el activo)")
+    parser.add_argument('--variants', nargs='+', help="Variantes a reportar (default: las del activo)")
+    parser.add_argument('--reset', action='store_true', help="Borrar las métricas del experimento")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("REPORTE DE EXPERIMENTO A/B")
+    print("=" * 80)
+
+    try:
+        active = retrieval_config.current()['experiment']
+        name = args.experiment or (active and active['name'])
+        variants = args.variants or (list(active['variants']) if active and active['name'] == name else None)
+        if not name or not variants:
+            print("\n⚠️  Sin experimento activo: indica --experiment y --variants")
+            return 1
+
+        if args.reset:
+            retrieval_config.reset(name, variants)
+            print(f"\n✅ Métricas de '{name}' borradas")
+            return 0
+
+        report = retrieval_config.report(name, variants)
+
+        print(f"\n🧪 Experimento '{name}'\n")
+        print(f"   {'Variante':<18} {'Requests':>9} {'Prom ms':>8} {'p50 ms':>7} {'p95 ms':>7} "
+              f"{'Tok prompt':>11} {'Caché':>6} {'Fallback':>9} {'Errores':>8}")
+        for variant, stats in report.items():
+            print(f"   {variant:<18} {stats['requests']:>9,} {stats['avg_latency_ms']:>8.0f} "
+                  f"{stats['p50_latency_ms']:>7} {stats['p95_latency_ms']:>7} "
+                  f"{stats['prompt_tokens_per_call']:>11,.0f} {stats['cache_hit_rate']:>6.0%} "
+                  f"{stats['fallback_rate']:>9.1%} {stats['error_rate']:>8.1%}")
+
+        if any(stats['requests'] < 100 for stats in report.values()):
+            print("\n📝 Menos de 100 requests en alguna variante: los resultados aún no son confiables")
+
+    except Exception as e:
+        print(f"\n❌ Error generando el reporte: {str(e)}")
+        logger.error(f"Error en experiment_report: {str(e)}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
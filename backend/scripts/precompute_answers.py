@@ -0,0 +1,71 @@
+"""
+Script para precalcular respuestas de intenciones estáticas (portales)
+
+Genera con el LLM la respuesta de cada pregunta canónica y la guarda en
+Redis bajo el hash del system prompt actual. Si el prompt cambia, las
+respuestas anteriores dejan de usarse y basta con volver a ejecutar el
+script en el despliegue.
+
+Uso:
+    python backend/scripts/precompute_answers.py
+    python backend/scripts/precompute_answers.py --force
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.precomputed_answers import precomputed_answers, CANONICAL_QUESTIONS
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Precalcula respuestas de intenciones estáticas")
+    parser.add_argument('--force', action='store_true',
+                        help="Regenerar aunque ya exista la respuesta")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PRECÁLCULO DE RESPUESTAS ESTÁTICAS")
+    print("=" * 80)
+    print(f"\n🔑 Hash del system prompt: {precomputed_answers.prompt_hash}")
+
+    generated = 0
+    skipped = 0
+    errors = 0
+    tokens_total = 0
+
+    for intent, questions in CANONICAL_QUESTIONS.items():
+        print(f"\n📝 Intención: {intent} ({len(questions)} preguntas)")
+        for question in questions:
+            if not args.force and precomputed_answers.get(intent, question) is not None:
+                skipped += 1
+                print(f"   ⏭️  {question}")
+                continue
+            try:
+                _, tokens_used = precomputed_answers.generate(intent, question)
+                generated += 1
+                tokens_total += tokens_used
+                print(f"   ✅ {question} ({tokens_used} tokens)")
+                time.sleep(0.5)  # Pequeña pausa para no saturar
+            except Exception as e:
+                errors += 1
+                print(f"   ❌ {question}: {str(e)}")
+                logger.error(f"Error precalculando '{question}': {str(e)}")
+
+    print("\n" + "=" * 80)
+    print(f"✅ Respuestas generadas: {generated} ({tokens_total:,} tokens)")
+    print(f"⏭️  Ya existentes: {skipped}")
+    print(f"❌ Errores: {errors}")
+    print("=" * 80)
+
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,8 @@ import fitz  # PyMuPDF
 from pathlib import Path
 from app.services.embedding_service import embedding_service
 from app.services.pinecone_service import pinecone_service
+from app.services.near_duplicates import simhash_hex
+from app.services.cache_namespace import cache_namespace
 from app.core.database import SessionLocal
 from app.models.database import Document
 from app.core.logger import get_logger
@@ -115,6 +117,7 @@ def process_pdf(pdf_path: Path, db_session):
                     'page': page_num,
                     'chunk': chunk_idx,
                     'text': chunk,
+                    'simhash': simhash_hex(chunk),
                     'document_id': str(doc_record.id)
                 }
                 
@@ -167,6 +170,13 @@ def main():
         db.close()
     
     logger.info("✅ PDF processing completed!")
+    
+    # Nuevo namespace de caché: las respuestas anteriores no incluyen estos documentos
+    try:
+        version = cache_namespace.bump()
+        logger.info(f"Index version bumped to {version}")
+    except Exception as e:
+        logger.warning(f"Could not bump index version, run clear_redis_cache.py --bump: {str(e)}")
 
 if __name__ == "__main__":
     main()
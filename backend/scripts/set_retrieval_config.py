@@ -0,0 +1,105 @@
+"""
+Script para ver o cambiar los parámetros de búsqueda en caliente
+
+La config (perfiles, ajustes por intención y experimento A/B) se guarda en
+Redis; cada worker la vuelve a leer cada RETRIEVAL_CONFIG_REFRESH_INTERVAL
+segundos, sin redeploy. Cambiar los perfiles base cambia el namespace del
+caché de respuestas; cambiar solo el experimento no.
+
+Nota: clear_redis_cache.py sin --bump (flushdb) también borra esta config.
+
+Ejemplo de archivo:
+    {
+      "profiles": {"balanced": {"similarity_threshold": 0.4}},
+      "intent_overrides": {"waiting_periods": {"chunks_per_query": 50}},
+      "experiment": {
+        "name": "threshold-040",
+        "variants": {
+          "control": {"weight": 50},
+          "low_threshold": {"weight": 50, "profiles": {"balanced": {"similarity_threshold": 0.35}}}
+        }
+      }
+    }
+
+Uso:
+    python backend/scripts/set_retrieval_config.py
+    python backend/scripts/set_retrieval_config.py --set config.json
+    python backend/scripts/set_retrieval_config.py --clear
+"""
+
+import sys
+import argparse
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.logger import get_logger
+from app.core.redis_client import get_redis
+from app.services.retrieval_config import parse_config, RETRIEVAL_CONFIG_KEY
+
+logger = get_logger()
+
+def print_config(config: dict):
+    print(f"\n📋 Huella de parámetros base: {config['fingerprint']}")
+    print(f"\n   {'Perfil':<12} {'chunks/q':>9} {'final':>6} {'híbrido':>8} {'umbral':>7} {'queries':>8} {'adapt':>6} {'max_tokens':>11}")
+    for name, p in config['profiles'].items():
+        print(f"   {name:<12} {p['chunks_per_query']:>9} {p['max_final_chunks']:>6} {p['hybrid_max_final_chunks']:>8} "
+              f"{p['similarity_threshold']:>7.2f} {p['max_queries']:>8} {str(p['adaptive']):>6} "
+              f"{str(p['max_tokens'] or 'default'):>11}")
+    for intent, overrides in config['intent_overrides'].items():
+        print(f"   Ajuste '{intent}': {overrides}")
+
+    experiment = config['experiment']
+    if not experiment:
+        print("\n🧪 Sin experimento activo")
+        return
+    total = sum(v['weight'] for v in experiment['variants'].values())
+    print(f"\n🧪 Experimento '{experiment['name']}':")
+    for name, variant in experiment['variants'].items():
+        changes = "cambia parámetros" if variant['changes'] else "sin cambios (control)"
+        print(f"   - {name}: {variant['weight'] / total:.0%} del tráfico, {changes}")
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Config de búsqueda en caliente y experimentos A/B")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--set', type=Path, metavar='ARCHIVO',
+                       help="JSON con la nueva config (se valida antes de guardar)")
+    group.add_argument('--clear', action='store_true',
+                       help="Volver a los valores del código")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONFIG DE BÚSQUEDA EN CALIENTE")
+    print("=" * 80)
+
+    try:
+        redis_client = get_redis()
+
+        if args.set:
+            raw = json.loads(args.set.read_text(encoding='utf-8'))
+            config = parse_config(raw)  # ValueError si hay perfiles o parámetros desconocidos
+            redis_client.set(RETRIEVAL_CONFIG_KEY, json.dumps(raw))
+            print(f"\n✅ Config guardada desde {args.set}")
+        elif args.clear:
+            redis_client.delete(RETRIEVAL_CONFIG_KEY)
+            config = parse_config(None)
+            print("\n✅ Config eliminada: se usan los valores del código")
+        else:
+            raw = redis_client.get(RETRIEVAL_CONFIG_KEY)
+            config = parse_config(json.loads(raw) if raw else None)
+            print(f"\n{'📄 Config en Redis' if raw else '📄 Sin config en Redis: valores del código'}")
+
+        print_config(config)
+
+    except Exception as e:
+        print(f"\n❌ Error con la config de búsqueda: {str(e)}")
+        logger.error(f"Error en set_retrieval_config: {str(e)}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Script para entrenar el diccionario zstd del caché de respuestas
+
+Toma como muestras las respuestas que ya están en el caché de Redis (o,
+si hay pocas, las FAQs de la base de datos) y entrena un diccionario zstd
+compartido. Las respuestas comparten mucho texto (encabezados, frases
+de cierre, nombres de manuales), así que el diccionario reduce bastante
+el tamaño de cada entrada.
+
+Después de entrenar hay que reiniciar la API. Las entradas comprimidas con
+el diccionario anterior ya no se pueden leer: se tratan como miss y se
+regeneran.
+
+Uso:
+    python backend/scripts/train_cache_dictionary.py
+    python backend/scripts/train_cache_dictionary.py --size 65536 --max-samples 5000
+"""
+
+import sys
+import argparse
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.redis_client import get_redis_binary
+from app.core.cache_codec import CacheCodec, BACKEND_DIR
+
+logger = get_logger()
+
+def load_cached_samples(max_samples: int) -> list:
+    """Payloads msgpack de las respuestas en caché (rag:*)"""
+    import msgpack
+
+    redis_client = get_redis_binary()
+    reader = CacheCodec(settings.CACHE_CODEC, settings.CACHE_CODEC_LEVEL, settings.CACHE_CODEC_DICT_PATH)
+    samples = []
+    for key in redis_client.scan_iter(match="rag:*", count=500):
+        if key.startswith(b"rag:inflight") or key.startswith(b"rag:refresh") or key in (b"rag:index_version", b"rag:retrieval_config"):
+            continue
+        raw = redis_client.get(key)
+        try:
+            entry = reader.decode(raw)
+        except ValueError:
+            continue
+        samples.append(msgpack.packb(entry, use_bin_type=True))
+        if len(samples) >= max_samples:
+            break
+    return samples
+
+def load_faq_samples(max_samples: int) -> list:
+    """Payloads msgpack armados con las FAQs guardadas en la base de datos"""
+    import msgpack
+    from app.core.database import SessionLocal
+    from app.models.database import FAQ
+
+    db = SessionLocal()
+    try:
+        samples = []
+        for faq in db.query(FAQ).filter(FAQ.is_active == True).limit(max_samples).all():
+            sources = json.loads(faq.sources) if faq.sources else []
+            entry = {'result': [faq.answer, sources, faq.tokens_used or 0], 'soft_expires_at': 0.0}
+            samples.append(msgpack.packb(entry, use_bin_type=True))
+        return samples
+    finally:
+        db.close()
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Entrena el diccionario zstd del caché")
+    parser.add_argument('--size', type=int, default=64 * 1024,
+                        help="Tamaño del diccionario en bytes")
+    parser.add_argument('--max-samples', type=int, default=5000,
+                        help="Máximo de muestras")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("ENTRENAMIENTO DEL DICCIONARIO DEL CACHÉ")
+    print("=" * 80)
+
+    try:
+        import zstandard
+
+        samples = load_cached_samples(args.max_samples)
+        print(f"\n📄 Muestras del caché de Redis: {len(samples):,}")
+        if len(samples) < 100:
+            faq_samples = load_faq_samples(args.max_samples)
+            print(f"📄 Muestras de FAQs: {len(faq_samples):,}")
+            samples.extend(faq_samples)
+
+        if len(samples) < 20:
+            print("\n❌ Muy pocas muestras para entrenar un diccionario útil")
+            return 1
+
+        dictionary = zstandard.train_dictionary(args.size, samples)
+        output_path = BACKEND_DIR / settings.CACHE_CODEC_DICT_PATH
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(dictionary.as_bytes())
+
+        plain = zstandard.ZstdCompressor(level=settings.CACHE_CODEC_LEVEL)
+        trained = zstandard.ZstdCompressor(level=settings.CACHE_CODEC_LEVEL, dict_data=dictionary)
+        raw_size = sum(len(s) for s in samples)
+        plain_size = sum(len(plain.compress(s)) for s in samples)
+        trained_size = sum(len(trained.compress(s)) for s in samples)
+
+        print(f"\n✅ Diccionario guardado en {output_path} (id {dictionary.dict_id()}, {len(dictionary.as_bytes()):,} bytes)")
+        print(f"   msgpack:                {raw_size / len(samples):,.0f} bytes por entrada")
+        print(f"   + zstd:                 {plain_size / len(samples):,.0f} bytes por entrada")
+        print(f"   + zstd con diccionario: {trained_size / len(samples):,.0f} bytes por entrada")
+        print("\n💡 Reinicia la API para usar el diccionario nuevo")
+
+    except Exception as e:
+        print(f"\n❌ Error entrenando el diccionario: {str(e)}")
+        logger.error(f"Error en train_cache_dictionary: {str(e)}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
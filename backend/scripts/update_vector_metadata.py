@@ -18,97 +18,11 @@ import time
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.services.pinecone_service import pinecone_service
+from app.services.product_catalog import PRODUCT_PATTERNS, AREA_PATTERNS, normalize_text
 from app.core.logger import get_logger
 
 logger = get_logger()
 
-# Mapeo de patrones de productos conocidos con sus áreas
-PRODUCT_PATTERNS = {
-    # GMM - Gastos Médicos Mayores
-    'premium': {
-        'patterns': ['premium', 'prémium'],
-        'area': 'gmm'
-    },
-    'conexión gnp': {
-        'patterns': ['conexion', 'conexión', 'conexion gnp', 'conexión gnp'],
-        'area': 'gmm'
-    },
-    'versátil': {
-        'patterns': ['versatil', 'versátil'],
-        'area': 'gmm'
-    },
-    'alta especialidad': {
-        'patterns': ['alta especialidad', 'altaespecialidad', 'alta_especialidad'],
-        'area': 'gmm'
-    },
-    'línea azul vip': {
-        'patterns': ['linea azul vip', 'línea azul vip', 'lineaazulvip', 'vip'],
-        'area': 'gmm'
-    },
-    'línea azul': {
-        'patterns': ['linea azul', 'línea azul', 'lineaazul'],
-        'area': 'gmm'
-    },
-    'vip internacional': {
-        'patterns': ['vip internacional', 'vipinternacional'],
-        'area': 'gmm'
-    },
-    'enlace internacional': {
-        'patterns': ['enlace internacional', 'enlaceinternacional'],
-        'area': 'gmm'
-    },
-    'vínculo mundial': {
-        'patterns': ['vinculo mundial', 'vínculo mundial', 'vinculomundial'],
-        'area': 'gmm'
-    },
-    'personaliza': {
-        'patterns': ['personaliza'],
-        'area': 'gmm'
-    },
-    'flexibles': {
-        'patterns': ['flexibles', 'flexible'],
-        'area': 'gmm'
-    },
-    'acceso': {
-        'patterns': ['acceso'],
-        'area': 'gmm'
-    },
-    'esencial': {
-        'patterns': ['esencial'],
-        'area': 'gmm'
-    },
-    'plenitud': {
-        'patterns': ['plenitud'],
-        'area': 'gmm'
-    },
-    'platino': {
-        'patterns': ['platino'],
-        'area': 'gmm'
-    },
-    'gnp indemniza': {
-        'patterns': ['gnp indemniza', 'indemniza'],
-        'area': 'gmm'
-    },
-}
-
-# Patrones para detectar áreas en nombres de archivo
-AREA_PATTERNS = {
-    'gmm': ['gmm', 'gastos medicos', 'gastos médicos', 'medico', 'médico', 'salud'],
-    'vida': ['vida', 'fallecimiento', 'sobrevivencia'],
-    'autos': ['autos', 'auto', 'vehiculo', 'vehículo', 'automovil', 'automóvil'],
-    'daños': ['daños', 'danos', 'hogar', 'empresarial', 'incendio', 'terremoto']
-}
-
-def normalize_text(text: str) -> str:
-    """Normaliza texto para comparación"""
-    text = text.lower()
-    # Remover acentos
-    text = text.replace('á', 'a').replace('é', 'e').replace('í', 'i')
-    text = text.replace('ó', 'o').replace('ú', 'u').replace('ñ', 'n')
-    # Remover caracteres especiales
-    text = re.sub(r'[^a-z0-9\s]', '', text)
-    return text.strip()
-
 def extract_product_from_text(text: str) -> Tuple[Optional[str], Optional[str]]:
     """Extrae el nombre del producto y área del texto usando patrones conocidos
     Returns: (product_name, area)
@@ -340,7 +254,7 @@ def main():
         
         print("\n💡 SIGUIENTE PASO:")
         print("   Ejecuta este script varias veces más hasta procesar todos los ~63K vectores")
-        print("   Luego: python scripts/clear_redis_cache.py")
+        print("   Luego: python scripts/clear_redis_cache.py --bump")
         
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
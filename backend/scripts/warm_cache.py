@@ -0,0 +1,102 @@
+"""
+Script para precalentar el caché de respuestas
+
+Después de un despliegue o de cambiar de namespace de caché, ejecuta por
+RAGService.query todas las FAQs activas y los mensajes de usuario más
+repetidos de la tabla messages, para que los primeros agentes no paguen
+la latencia completa del RAG + LLM.
+
+Las consultas corren con concurrencia acotada y espaciadas para respetar
+un máximo de requests por minuto; ante un 429 se pausa con backoff.
+
+Uso:
+    python backend/scripts/warm_cache.py
+    python backend/scripts/warm_cache.py --top-n 300 --days 14 --concurrency 3 --rpm 40
+    python backend/scripts/warm_cache.py --dry-run
+    python backend/scripts/warm_cache.py --profile thorough
+
+Sin --profile se calienta el perfil que usa el chat por defecto (según la
+intención); otros perfiles se guardan en llaves de caché separadas.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logger import get_logger
+from app.services.rag_service import rag_service
+from app.services.cache_warmer import CacheWarmer
+from app.services.retrieval_profiles import RETRIEVAL_PROFILES
+
+logger = get_logger()
+
+def main():
+    """Script principal"""
+    parser = argparse.ArgumentParser(description="Precalienta el caché de respuestas")
+    parser.add_argument('--top-n', type=int, default=settings.CACHE_WARM_TOP_N,
+                        help="Mensajes de usuario más frecuentes a incluir")
+    parser.add_argument('--days', type=int, default=30,
+                        help="Ventana de historial en días")
+    parser.add_argument('--concurrency', type=int, default=settings.CACHE_WARM_CONCURRENCY,
+                        help="Consultas simultáneas")
+    parser.add_argument('--rpm', type=int, default=settings.CACHE_WARM_REQUESTS_PER_MINUTE,
+                        help="Máximo de consultas por minuto")
+    parser.add_argument('--profile', choices=list(RETRIEVAL_PROFILES), default=None,
+                        help="Perfil de búsqueda (default: según la intención)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Solo mostrar la cobertura actual, sin generar respuestas")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PRECALENTAMIENTO DEL CACHÉ DE RESPUESTAS")
+    print("=" * 80)
+
+    warmer = CacheWarmer(
+        rag_service,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        profile=args.profile
+    )
+
+    db = SessionLocal()
+    try:
+        questions = warmer.collect_questions(db, top_n=args.top_n, days=args.days)
+    except Exception as e:
+        print(f"\n❌ Error leyendo preguntas: {str(e)}")
+        logger.error(f"Error en warm_cache: {str(e)}")
+        return 1
+    finally:
+        db.close()
+
+    faqs = sum(1 for _, origin in questions if origin == "faq")
+    print(f"\n📋 Preguntas: {len(questions)} ({faqs} FAQs, {len(questions) - faqs} del historial)")
+    print(f"   Namespace de caché: {rag_service.cache_namespace.prefix()}")
+    print(f"   Perfil: {args.profile or 'según la intención'}")
+
+    if args.dry_run:
+        cached = sum(1 for q, _ in questions if warmer.is_cached(q))
+        print(f"\n📊 Cobertura actual: {cached}/{len(questions)} ({cached / max(1, len(questions)):.0%})")
+        return 0
+
+    print(f"\n🔥 Calentando con {args.concurrency} workers, máximo {args.rpm} consultas/min...")
+    report = warmer.warm(questions)
+
+    print("\n" + "=" * 80)
+    print(f"✅ Ya en caché: {report['already_cached']}")
+    print(f"✅ Generadas: {report['warmed']} ({report['tokens_used']:,} tokens)")
+    print(f"❌ Errores: {len(report['failed'])}")
+    for question, error in report['failed'][:20]:
+        print(f"   • {question[0][:70]}: {error}")
+    print(f"\n📊 Cobertura: {report['coverage_before']:.0%} -> {report['coverage_after']:.0%}")
+    print(f"⏱️  Tiempo: {report['elapsed_s']:.1f}s (promedio por consulta: {report['avg_query_ms']:.0f}ms)")
+    print("=" * 80)
+
+    return 1 if report['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())